@@ -0,0 +1,274 @@
+"""
+Admission Control Module
+Per-lane concurrency limits, bounded queues and per-client fair shares, refusing with 429 when a lane is full
+"""
+
+import asyncio
+import math
+import os
+import time
+from collections import OrderedDict, deque
+from typing import Deque, Dict, Optional, Sequence, Tuple
+
+from starlette.responses import JSONResponse
+
+from .metrics import admission_active, admission_rejections, admission_wait, queue_depth
+
+ADMISSION_CONTROL = os.getenv("ANALYTICS_ADMISSION_CONTROL", "true").lower() in ("1", "true", "yes")
+
+LANE_ORDER = ('interactive', 'standard', 'heavy')
+
+# name -> (concurrency, queue size, max queue wait in seconds, initial service time estimate in seconds)
+DEFAULT_LANES = {
+    'interactive': (32, 256, 5.0, 0.05),
+    'standard': (4, 32, 30.0, 0.5),
+    'heavy': (2, 8, 60.0, 5.0),
+}
+
+# Longest matching prefix wins; anything unmatched is interactive
+DEFAULT_ROUTE_LANES = (
+    ('/api/advanced/analyze', 'heavy'),  # Prophet / RF / XGBoost ensemble
+    ('/api/analyze', 'heavy'),  # dispatches to the time series, anomaly and correlation engines
+    ('/api/advanced/forecast', 'heavy'),
+    ('/api/advanced/correlation', 'heavy'),  # Kendall, mutual information, Granger loops
+    ('/api/advanced/batch-analyze', 'heavy'),
+    ('/api/advanced/stream-statistics', 'heavy'),
+    ('/api/advanced/series/', 'interactive'),
+    ('/api/advanced/covariance/', 'interactive'),
+    ('/api/advanced/', 'standard'),
+    ('/api/predict', 'standard'),
+    ('/api/industry/', 'standard'),  # forest forecasts; analyze learns in the background
+    ('/api/detect-anomalies', 'standard'),
+    ('/api/anomaly-baselines/', 'standard'),
+    ('/api/regression/', 'standard'),
+)
+
+# Never queued or refused: probes and scrapes must answer while the lanes are saturated
+EXEMPT_PATHS = frozenset({'/api/health', '/metrics'})
+
+CLIENT_HEADER = b'x-client-id'
+MAX_RETRY_AFTER_S = 60
+SERVICE_TIME_SMOOTHING = 0.2  # weight of the newest request in the service time average
+
+
+class AdmissionRefused(Exception):
+    """Raised when a lane cannot take a request; `retry_after` is in whole seconds"""
+
+    def __init__(self, message: str, lane: str, reason: str, retry_after: int):
+        super().__init__(message)
+        self.lane = lane
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class Lane:
+    """Concurrency slots plus a bounded queue, served round-robin across clients
+
+    Each client may hold (run or wait for) at most `client_share` of the lane's slots
+    and queue places, so one client's burst cannot fill the lane for everyone else.
+    State is only touched from the event loop, so no lock is needed.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        concurrency: int,
+        queue_size: int,
+        max_wait: float,
+        service_time: float = 1.0,
+        client_share: float = 0.5
+    ):
+        if concurrency < 1 or queue_size < 0:
+            raise ValueError("A lane needs at least one slot and a non-negative queue size")
+        self.name = name
+        self.concurrency = concurrency
+        self.queue_size = queue_size
+        self.max_wait = max_wait
+        self.service_time = service_time
+        self.client_limit = max(1, int(client_share * (concurrency + queue_size)))
+        self.active = 0
+        self.queued = 0
+        self._held: Dict[str, int] = {}  # client -> running plus waiting requests
+        self._waiting: 'OrderedDict[str, Deque[asyncio.Future]]' = OrderedDict()
+
+    def retry_after(self) -> int:
+        """Seconds until the current queue has likely drained by one more request"""
+        seconds = self.service_time * (self.queued + 1) / self.concurrency
+        return int(min(MAX_RETRY_AFTER_S, max(1, math.ceil(seconds))))
+
+    def _refuse(self, reason: str, message: str) -> AdmissionRefused:
+        admission_rejections.inc(self.name, reason)
+        return AdmissionRefused(message, self.name, reason, self.retry_after())
+
+    def _hold(self, client: str, amount: int) -> None:
+        held = self._held.get(client, 0) + amount
+        if held > 0:
+            self._held[client] = held
+        else:
+            self._held.pop(client, None)
+
+    def _forget(self, client: str, future: asyncio.Future) -> None:
+        """Remove a waiter that gave up before it was granted a slot"""
+        waiters = self._waiting.get(client)
+        if waiters is not None and future in waiters:
+            waiters.remove(future)
+            if not waiters:
+                del self._waiting[client]
+            self.queued -= 1
+            self._hold(client, -1)
+
+    def _dispatch(self) -> None:
+        """Hand free slots to the oldest waiter of each client in turn
+
+        A waiter whose wait timed out or was cancelled has its future cancelled before
+        its coroutine resumes to call `_forget`; such waiters are dropped here instead,
+        so the slot goes to the next one and `_forget` finds nothing left to undo.
+        """
+        while self.active < self.concurrency and self._waiting:
+            client, waiters = next(iter(self._waiting.items()))
+            future = waiters.popleft()
+            if waiters:
+                self._waiting.move_to_end(client)
+            else:
+                del self._waiting[client]
+            self.queued -= 1
+            if future.done():
+                self._hold(client, -1)
+                continue
+            self.active += 1
+            future.set_result(None)
+
+    async def acquire(self, client: str) -> None:
+        """Wait for a slot; raises AdmissionRefused at once when the client or lane is full"""
+        if self._held.get(client, 0) >= self.client_limit:
+            raise self._refuse('client_quota', f"Too many concurrent {self.name} requests from this client; retry later")
+        if self.active < self.concurrency and not self.queued:
+            self.active += 1
+            self._hold(client, 1)
+            return
+        if self.queued >= self.queue_size:
+            raise self._refuse('queue_full', f"The {self.name} lane is full; retry later")
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiting.setdefault(client, deque()).append(future)
+        self.queued += 1
+        self._hold(client, 1)
+        try:
+            await asyncio.wait_for(future, self.max_wait)
+        except asyncio.TimeoutError:
+            if future.done() and not future.cancelled():
+                return  # granted just as the wait timed out
+            self._forget(client, future)
+            raise self._refuse('timeout', f"Waited over {self.max_wait:.0f}s for a {self.name} slot; retry later")
+        except asyncio.CancelledError:
+            # The client went away: give back the slot if it had already been granted
+            if future.done() and not future.cancelled():
+                self.release(client)
+            else:
+                self._forget(client, future)
+            raise
+
+    def release(self, client: str, elapsed: Optional[float] = None) -> None:
+        self.active -= 1
+        self._hold(client, -1)
+        if elapsed is not None:
+            self.service_time += SERVICE_TIME_SMOOTHING * (elapsed - self.service_time)
+        self._dispatch()
+
+
+class AdmissionController:
+    """Maps requests to lanes by route prefix and request size"""
+
+    def __init__(
+        self,
+        lanes: Dict[str, Lane],
+        route_lanes: Sequence[Tuple[str, str]] = DEFAULT_ROUTE_LANES,
+        default_lane: str = 'interactive',
+        large_body_bytes: int = 0
+    ):
+        self.lanes = lanes
+        self.route_lanes = sorted(route_lanes, key=lambda item: len(item[0]), reverse=True)
+        self.default_lane = default_lane
+        self.large_body_bytes = large_body_bytes
+        for name in lanes:
+            queue_depth.set_function(lambda lane=lanes[name]: lane.queued, f'admission_{name}')
+            admission_active.set_function(lambda lane=lanes[name]: lane.active, name)
+
+    def classify(self, path: str, body_bytes: int = 0) -> Lane:
+        """The route's lane, moved one lane heavier for bodies over `large_body_bytes`"""
+        name = next((lane for prefix, lane in self.route_lanes if path.startswith(prefix)), self.default_lane)
+        if self.large_body_bytes > 0 and body_bytes > self.large_body_bytes and name in LANE_ORDER:
+            heavier = LANE_ORDER[min(LANE_ORDER.index(name) + 1, len(LANE_ORDER) - 1)]
+            name = heavier if heavier in self.lanes else name
+        return self.lanes[name]
+
+
+def _header(scope, name: bytes) -> Optional[bytes]:
+    for key, value in scope.get('headers', ()):
+        if key == name:
+            return value
+    return None
+
+
+def client_key(scope) -> str:
+    """`X-Client-Id` when sent (set it at a trusted proxy), otherwise the client address"""
+    header = _header(scope, CLIENT_HEADER)
+    if header:
+        return header.decode('latin-1')
+    client = scope.get('client')
+    return client[0] if client else 'unknown'
+
+
+class AdmissionMiddleware:
+    """Pure ASGI middleware holding a lane slot for the whole request, or answering 429"""
+
+    def __init__(self, app, controller: AdmissionController):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or scope['path'] in EXEMPT_PATHS or scope.get('method') == 'OPTIONS':
+            await self.app(scope, receive, send)
+            return
+
+        length = _header(scope, b'content-length')
+        lane = self.controller.classify(scope['path'], int(length) if length and length.isdigit() else 0)
+        client = client_key(scope)
+        start = time.perf_counter()
+        try:
+            await lane.acquire(client)
+        except AdmissionRefused as e:
+            response = JSONResponse(
+                {'detail': str(e), 'lane': e.lane, 'reason': e.reason},
+                status_code=429,
+                headers={'Retry-After': str(e.retry_after)}
+            )
+            await response(scope, receive, send)
+            return
+
+        admitted = time.perf_counter()
+        admission_wait.observe(admitted - start, lane.name)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            lane.release(client, time.perf_counter() - admitted)
+
+
+def _lane_from_env(name: str, client_share: float) -> Lane:
+    concurrency, queue_size, max_wait, service_time = DEFAULT_LANES[name]
+    prefix = f"ANALYTICS_LANE_{name.upper()}"
+    return Lane(
+        name,
+        concurrency=int(os.getenv(f"{prefix}_CONCURRENCY", str(concurrency))),
+        queue_size=int(os.getenv(f"{prefix}_QUEUE", str(queue_size))),
+        max_wait=float(os.getenv(f"{prefix}_MAX_WAIT_S", str(max_wait))),
+        service_time=service_time,
+        client_share=client_share
+    )
+
+
+_client_share = float(os.getenv("ANALYTICS_CLIENT_SHARE", "0.5"))
+admission = AdmissionController(
+    {name: _lane_from_env(name, _client_share) for name in LANE_ORDER},
+    large_body_bytes=int(float(os.getenv("ANALYTICS_LARGE_BODY_KB", "1024")) * 1024)
+)
@@ -0,0 +1,351 @@
+"""
+Anomaly Baselines Module
+Anomaly models fitted once on a reference window, then used to score later windows
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import joblib
+import numpy as np
+from sklearn.ensemble import IsolationForest
+
+from .prefork import register_preloader
+from .sampling import stratified_indices
+
+logger = logging.getLogger(__name__)
+
+MIN_REFERENCE_POINTS = 50
+# Longer references are fitted on a stratified sample of this many points
+MAX_REFERENCE_POINTS = 100_000
+DRIFT_BINS = 10
+# Fewer recent points than this give too noisy a PSI over DRIFT_BINS bins
+MIN_DRIFT_POINTS = 20 * DRIFT_BINS
+# Smoothing for empty bins in the population stability index
+PSI_EPSILON = 1e-4
+DEFAULT_DRIFT_THRESHOLD = 0.25  # PSI above 0.25 is the customary "significant shift"
+
+
+class AnomalyBaseline:
+    """IsolationForest, moments and DBSCAN core points of a reference window
+
+    New points get z-scores against the reference mean / std, IsolationForest scores
+    from the reference model, and are DBSCAN noise when no reference core point lies
+    within eps. Scored values are kept (up to the reference size) so that drift can be
+    measured against the reference deciles and the baseline refitted on recent data.
+    """
+
+    def __init__(
+        self,
+        reference: Any,
+        contamination: float = 0.1,
+        refresh_interval: Optional[float] = None,
+        drift_threshold: Optional[float] = DEFAULT_DRIFT_THRESHOLD
+    ):
+        self.contamination = contamination
+        self.refresh_interval = refresh_interval
+        self.drift_threshold = drift_threshold
+
+        values = np.asarray(reference, dtype=np.float64).ravel()
+        if values.size < MIN_REFERENCE_POINTS:
+            raise ValueError(f"A baseline needs at least {MIN_REFERENCE_POINTS} reference points")
+        if not np.all(np.isfinite(values)):
+            raise ValueError("Reference contains invalid values (NaN or infinite)")
+        values = values[stratified_indices(values.size, MAX_REFERENCE_POINTS)]
+
+        self.n_reference = values.size
+        self.mean = float(values.mean())
+        self.std = float(values.std())
+        self.forest = IsolationForest(contamination=contamination, random_state=42).fit(values.reshape(-1, 1))
+        self.reference_scores = np.sort(self.forest.score_samples(values.reshape(-1, 1)))
+
+        # DBSCAN (eps = std / 2, min_samples = 3) core points of the reference
+        self.eps = self.std * 0.5
+        self.core = np.sort(values[self._core_mask(values)])
+
+        interior = np.linspace(0, 1, DRIFT_BINS + 1)[1:-1]
+        self.bin_edges = np.unique(np.quantile(values, interior))
+        self.reference_fractions = self._fractions(np.bincount(self._bins(values), minlength=self.bin_edges.size + 1))
+
+        # Ring buffer of the last n_reference scored values
+        self._ring = np.empty(self.n_reference)
+        self._write = 0
+        self.recent_size = 0
+        self.recent_counts = np.zeros(self.bin_edges.size + 1, dtype=np.int64)
+        self.fitted_at = time.time()
+        self.scored = 0
+
+    def _core_mask(self, values: np.ndarray) -> np.ndarray:
+        """Points with at least 3 reference values (themselves included) within eps"""
+        sorted_values = np.sort(values)
+        counts = (
+            np.searchsorted(sorted_values, values + self.eps, side='right')
+            - np.searchsorted(sorted_values, values - self.eps, side='left')
+        )
+        return counts >= 3
+
+    def _bins(self, values: np.ndarray) -> np.ndarray:
+        return np.searchsorted(self.bin_edges, values, side='right')
+
+    @staticmethod
+    def _fractions(counts: np.ndarray) -> np.ndarray:
+        return np.maximum(counts / max(counts.sum(), 1), PSI_EPSILON)
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """Baselines pickled before the ring buffer kept `recent` as a plain array"""
+        if 'recent' in state:
+            recent = state.pop('recent')
+            state['_ring'] = np.empty(state['n_reference'])
+            state['_ring'][:recent.size] = recent
+            state['_write'] = recent.size % state['n_reference']
+            state['recent_size'] = recent.size
+        self.__dict__.update(state)
+
+    @property
+    def recent(self) -> np.ndarray:
+        """The remembered values, oldest first (a copy)"""
+        oldest = self._write - self.recent_size
+        return self._ring.take(np.arange(oldest, oldest + self.recent_size), mode='wrap')
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.fitted_at
+
+    def drift(self) -> Optional[float]:
+        """Population stability index of the recent values against the reference deciles"""
+        if self.recent_size < MIN_DRIFT_POINTS:
+            return None
+        recent = self._fractions(self.recent_counts)
+        return float(np.sum((recent - self.reference_fractions) * np.log(recent / self.reference_fractions)))
+
+    def refresh_reason(self) -> Optional[str]:
+        """'schedule' or 'drift' when the baseline should be refitted on recent values, else None"""
+        if self.recent_size < MIN_REFERENCE_POINTS:
+            return None
+        if self.refresh_interval is not None and self.age >= self.refresh_interval:
+            return 'schedule'
+        drift = self.drift()
+        if self.drift_threshold is not None and drift is not None and drift > self.drift_threshold:
+            return 'drift'
+        return None
+
+    def score(self, values: Any) -> Dict[str, np.ndarray]:
+        """Scores of new points against the reference (no refitting, no state change)"""
+        values = np.asarray(values, dtype=np.float64).ravel()
+        scores = self.forest.score_samples(values.reshape(-1, 1))
+
+        if self.core.size:
+            position = np.searchsorted(self.core, values)
+            below = self.core[np.maximum(position - 1, 0)]
+            above = self.core[np.minimum(position, self.core.size - 1)]
+            dbscan_noise = np.minimum(np.abs(values - below), np.abs(above - values)) > self.eps
+        else:
+            dbscan_noise = np.ones(values.size, dtype=bool)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            z_scores = (values - self.mean) / self.std if self.std > 0 else np.zeros_like(values)
+
+        return {
+            'z_scores': z_scores,
+            'scores': scores,
+            'isolation_forest': scores < self.forest.offset_,
+            'dbscan': dbscan_noise
+        }
+
+    def remember(self, values: Any) -> None:
+        """Keep the last n_reference scored values and their drift-bin counts"""
+        values = np.asarray(values, dtype=np.float64).ravel()
+        self.scored += values.size
+        kept = values[-self.n_reference:]
+        if kept.size == 0:
+            return
+        # The oldest values are overwritten in place, so a call costs O(len(values))
+        n_evicted = max(self.recent_size + kept.size - self.n_reference, 0)
+        if n_evicted:
+            oldest = self._write - self.recent_size
+            evicted = self._ring.take(np.arange(oldest, oldest + n_evicted), mode='wrap')
+            self.recent_counts -= np.bincount(self._bins(evicted), minlength=self.recent_counts.size)
+        self.recent_counts += np.bincount(self._bins(kept), minlength=self.recent_counts.size)
+        self._ring.put(np.arange(self._write, self._write + kept.size), kept, mode='wrap')
+        self._write = (self._write + kept.size) % self.n_reference
+        self.recent_size = min(self.recent_size + kept.size, self.n_reference)
+
+    def score_threshold(self, quantile: float) -> float:
+        """Reference score at `quantile` (scores below it are rarer than `quantile` of the reference)"""
+        return float(np.quantile(self.reference_scores, quantile))
+
+    def refitted(self) -> 'AnomalyBaseline':
+        """A new baseline with the same settings, fitted on the recent values"""
+        return AnomalyBaseline(self.recent, self.contamination, self.refresh_interval, self.drift_threshold)
+
+    def summary(self) -> Dict[str, Any]:
+        drift = self.drift()
+        return {
+            'reference_points': self.n_reference,
+            'mean': self.mean,
+            'std': self.std,
+            'contamination': self.contamination,
+            'fitted_at': self.fitted_at,
+            'age_s': self.age,
+            'scored': self.scored,
+            'drift': drift,
+            'drift_threshold': self.drift_threshold,
+            'refresh_interval_s': self.refresh_interval,
+            'refresh_due': self.refresh_reason()
+        }
+
+
+class BaselineStore:
+    """Baselines by key, one joblib file each under `checkpoint_dir`
+
+    Files are re-read when they are newer than the loaded copy, so with pre-forked
+    workers a baseline fitted or refreshed in one worker is picked up by the others.
+    """
+
+    def __init__(self, checkpoint_dir: Optional[str] = None):
+        self.checkpoint_dir = checkpoint_dir
+        self.baselines: Dict[str, AnomalyBaseline] = {}
+        self._loaded_mtime: Dict[str, float] = {}
+        self._refreshing = set()
+        self.lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.baselines)
+
+    def _path(self, key: str) -> str:
+        """Readable prefix plus a digest of the raw key, so keys like 'a/b' and 'a.b' get distinct files"""
+        safe = "".join(c if c.isalnum() or c in '-_' else '_' for c in key[:64])
+        digest = hashlib.blake2b(key.encode(), digest_size=8).hexdigest()
+        return os.path.join(self.checkpoint_dir, f"{safe}-{digest}.joblib")
+
+    def _save(self, key: str, baseline: AnomalyBaseline) -> None:
+        if not self.checkpoint_dir:
+            return
+        os.makedirs(self.checkpoint_dir, exist_ok=True)
+        path = self._path(key)
+        # Per-writer tmp file, so workers saving the same key never interleave
+        tmp = f"{path}.{os.getpid()}.tmp"
+        joblib.dump({'key': key, 'baseline': baseline}, tmp)
+        os.replace(tmp, path)
+        self._loaded_mtime[key] = os.path.getmtime(path)
+
+    def _load(self, key: str) -> None:
+        """Pick up a newer file for `key` written by another process"""
+        path = self._path(key)
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            return
+        if mtime <= self._loaded_mtime.get(key, -1.0):
+            return
+        try:
+            saved = joblib.load(path)
+        except Exception as e:
+            logger.error(f"Could not load anomaly baseline {key}: {e}")
+            return
+        if saved.get('key') != key:
+            logger.error(f"Anomaly baseline file {path} holds key {saved.get('key')!r}, not {key!r}")
+            return
+        self.baselines[key] = saved['baseline']
+        self._loaded_mtime[key] = mtime
+
+    def fit(self, key: str, reference: Any, config: Optional[Dict[str, Any]] = None) -> AnomalyBaseline:
+        """Fit (or replace) the baseline stored under `key`"""
+        config = config or {}
+        baseline = AnomalyBaseline(
+            reference,
+            contamination=float(config.get('contamination', 0.1)),
+            refresh_interval=config.get('refresh_interval_s'),
+            drift_threshold=config.get('drift_threshold', DEFAULT_DRIFT_THRESHOLD)
+        )
+        with self.lock:
+            self.baselines[key] = baseline
+            self._save(key, baseline)
+        return baseline
+
+    def get(self, key: str) -> Optional[AnomalyBaseline]:
+        with self.lock:
+            if self.checkpoint_dir:
+                self._load(key)
+            return self.baselines.get(key)
+
+    def score(self, key: str, values: Any) -> Optional[Dict[str, np.ndarray]]:
+        """Score `values` against the baseline under `key` (None if there is none)"""
+        baseline = self.get(key)
+        if baseline is None:
+            return None
+        scored = baseline.score(values)
+        with self.lock:
+            baseline.remember(values)
+        return scored
+
+    def refresh_due(self, key: str) -> bool:
+        """Whether `key` needs refitting and no refit is already running"""
+        with self.lock:
+            baseline = self.baselines.get(key)
+            return baseline is not None and key not in self._refreshing and baseline.refresh_reason() is not None
+
+    def refresh(self, key: str) -> None:
+        """Refit `key` on its recent values (meant for a background task)"""
+        with self.lock:
+            baseline = self.baselines.get(key)
+            if baseline is None or key in self._refreshing:
+                return
+            reason = baseline.refresh_reason()
+            if reason is None:
+                return
+            self._refreshing.add(key)
+        try:
+            refitted = baseline.refitted()
+            with self.lock:
+                # Skip if the baseline was replaced or deleted while refitting
+                if self.baselines.get(key) is baseline:
+                    self.baselines[key] = refitted
+                    self._save(key, refitted)
+            logger.info(f"Refreshed anomaly baseline {key} ({reason})")
+        except Exception as e:
+            logger.error(f"Could not refresh anomaly baseline {key}: {e}")
+        finally:
+            with self.lock:
+                self._refreshing.discard(key)
+
+    def delete(self, key: str) -> bool:
+        with self.lock:
+            if self.checkpoint_dir:
+                self._load(key)
+                try:
+                    os.remove(self._path(key))
+                except OSError:
+                    pass
+            self._loaded_mtime.pop(key, None)
+            return self.baselines.pop(key, None) is not None
+
+    def load_all(self) -> None:
+        """Load every baseline in `checkpoint_dir`"""
+        if not self.checkpoint_dir or not os.path.isdir(self.checkpoint_dir):
+            return
+        for name in sorted(os.listdir(self.checkpoint_dir)):
+            if not name.endswith('.joblib'):
+                continue
+            path = os.path.join(self.checkpoint_dir, name)
+            try:
+                saved = joblib.load(path)
+            except Exception as e:
+                logger.error(f"Could not load anomaly baseline {name}: {e}")
+                continue
+            self.baselines[saved['key']] = saved['baseline']
+            self._loaded_mtime[saved['key']] = os.path.getmtime(path)
+        logger.info(f"Loaded {len(self.baselines)} anomaly baselines from {self.checkpoint_dir}")
+
+
+anomaly_baselines = BaselineStore(checkpoint_dir=os.getenv("ANALYTICS_BASELINE_DIR") or None)
+
+
+@register_preloader
+def preload_baselines() -> None:
+    """Load stored baselines before workers fork, so they share the fitted forests"""
+    anomaly_baselines.load_all()
@@ -0,0 +1,275 @@
+"""
+Covariance Streams Module
+Named multivariate streams kept as mergeable co-moments, shared across workers as partial accumulators
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+import joblib
+import numpy as np
+
+from .prefork import worker_id
+from .streaming_stats import CoMoments
+
+logger = logging.getLogger(__name__)
+
+
+def _json_matrix(columns: List[str], matrix: np.ndarray) -> Dict[str, Dict[str, Optional[float]]]:
+    """Column -> column -> value, like DataFrame.to_dict(), with NaN as None"""
+    return {
+        column: {row: None if np.isnan(value) else float(value) for row, value in zip(columns, matrix[:, j])}
+        for j, column in enumerate(columns)
+    }
+
+
+class CovarianceStream:
+    """Co-moments of a fixed set of named columns; rows with a missing value are skipped"""
+
+    def __init__(self, columns: Sequence[str]):
+        if not columns or len(set(columns)) != len(columns):
+            raise ValueError("A stream needs at least one column and unique column names")
+        self.columns = list(columns)
+        self.moments = CoMoments(len(self.columns))
+        self.dropped = 0
+        self.updated_at = time.time()
+
+    def _order(self, columns: Sequence[str]) -> np.ndarray:
+        """Positions of this stream's columns within `columns`"""
+        if sorted(columns) != sorted(self.columns):
+            raise ValueError(f"Columns {list(columns)} do not match the stream's columns {self.columns}")
+        position = {column: i for i, column in enumerate(columns)}
+        return np.array([position[column] for column in self.columns])
+
+    def update(self, columns: Sequence[str], rows: Any) -> int:
+        """Fold a batch of rows (one value per column, in `columns` order); returns rows used"""
+        matrix = np.asarray(rows, dtype=np.float64)
+        if matrix.ndim != 2 or matrix.shape[1] != len(columns):
+            raise ValueError(f"Expected rows of {len(columns)} values")
+        matrix = matrix[:, self._order(columns)]
+        complete = np.isfinite(matrix).all(axis=1)
+        self.dropped += int(matrix.shape[0] - complete.sum())
+        self.moments = self.moments.merge(CoMoments.from_values(matrix[complete]))
+        self.updated_at = time.time()
+        return int(complete.sum())
+
+    def merge(self, other: 'CovarianceStream') -> 'CovarianceStream':
+        """Combine with a partial over the same columns (in any order)"""
+        order = self._order(other.columns)
+        aligned = CoMoments(len(self.columns))
+        aligned.count = other.moments.count
+        aligned.mean = other.moments.mean[order]
+        aligned.comoment = other.moments.comoment[np.ix_(order, order)]
+        merged = CovarianceStream(self.columns)
+        merged.moments = self.moments.merge(aligned)
+        merged.dropped = self.dropped + other.dropped
+        merged.updated_at = max(self.updated_at, other.updated_at)
+        return merged
+
+    def export(self) -> Dict[str, Any]:
+        """Raw partial state, for merging into another worker or service"""
+        return {
+            'columns': self.columns,
+            'count': int(self.moments.count),
+            'mean': self.moments.mean.tolist(),
+            'comoment': self.moments.comoment.tolist(),
+            'dropped': self.dropped
+        }
+
+    @classmethod
+    def from_export(cls, state: Dict[str, Any]) -> 'CovarianceStream':
+        stream = cls(state['columns'])
+        k = len(stream.columns)
+        mean = np.asarray(state['mean'], dtype=np.float64)
+        comoment = np.asarray(state['comoment'], dtype=np.float64)
+        if mean.shape != (k,) or comoment.shape != (k, k) or int(state['count']) < 0:
+            raise ValueError("Partial state does not match its columns")
+        stream.moments.count = int(state['count'])
+        stream.moments.mean = mean
+        stream.moments.comoment = comoment
+        stream.dropped = int(state.get('dropped', 0))
+        return stream
+
+    def summary(self) -> Dict[str, Any]:
+        """Means, sample covariance and Pearson correlation in O(k^2)"""
+        return {
+            'columns': self.columns,
+            'count': int(self.moments.count),
+            'dropped': self.dropped,
+            'mean': dict(zip(self.columns, self.moments.mean.tolist())) if self.moments.count else None,
+            'covariance': _json_matrix(self.columns, self.moments.covariance()),
+            'pearson': _json_matrix(self.columns, self.moments.correlation())
+        }
+
+
+class CovarianceStreamStore:
+    """Streams by id; with `checkpoint_dir`, each worker saves its partial and reads merge all of them
+
+    A worker writes `<stream>-<digest>.w<slot>.joblib` for its own slot (see api.prefork) at
+    most every `checkpoint_interval` seconds and on shutdown, and reloads its slot's
+    files when it starts, so a restarted worker resumes its partial without counting
+    any rows twice. Reads merge the worker's live partial with the other slots' files.
+    """
+
+    def __init__(self, checkpoint_dir: Optional[str] = None, checkpoint_interval: float = 10.0):
+        self.checkpoint_dir = checkpoint_dir
+        self.checkpoint_interval = checkpoint_interval
+        self.streams: Dict[str, CovarianceStream] = {}
+        self.lock = threading.Lock()
+        self._dirty: Set[str] = set()
+        self._saved: Set[str] = set()
+        self._peers: Dict[str, Tuple[float, CovarianceStream]] = {}  # path -> (mtime, partial)
+        self._last_checkpoint = time.monotonic()
+        self._pid: Optional[int] = None
+
+    def __len__(self) -> int:
+        return len(self.streams)
+
+    def _safe(self, stream_id: str) -> str:
+        """Readable prefix plus a digest of the raw id, so 'a/b' and 'a.b' do not share files"""
+        safe = "".join(c if c.isalnum() or c in '-_' else '_' for c in stream_id[:64])
+        digest = hashlib.blake2b(stream_id.encode(), digest_size=8).hexdigest()
+        return f"{safe}-{digest}"
+
+    def _path(self, stream_id: str, slot: int) -> str:
+        return os.path.join(self.checkpoint_dir, f"{self._safe(stream_id)}.w{slot}.joblib")
+
+    def _ensure_process(self) -> None:
+        """On first use in a (forked) process, drop inherited state and resume this slot's partials"""
+        if self._pid == os.getpid():
+            return
+        self._pid = os.getpid()
+        self.streams, self._dirty, self._saved, self._peers = {}, set(), set(), {}
+        if not self.checkpoint_dir or not os.path.isdir(self.checkpoint_dir):
+            return
+        suffix = f".w{worker_id()}.joblib"
+        for name in sorted(os.listdir(self.checkpoint_dir)):
+            if not name.endswith(suffix):
+                continue
+            try:
+                saved = joblib.load(os.path.join(self.checkpoint_dir, name))
+            except Exception as e:
+                logger.error(f"Could not load covariance stream partial {name}: {e}")
+                continue
+            self.streams[saved['stream']] = saved['state']
+            self._saved.add(saved['stream'])
+        if self.streams:
+            logger.info(f"Resumed {len(self.streams)} covariance streams in worker {worker_id()}")
+
+    def _own(self, stream_id: str) -> Optional[CovarianceStream]:
+        """This worker's partial, dropped if another worker deleted the stream's files"""
+        if stream_id in self._saved and not os.path.exists(self._path(stream_id, worker_id())):
+            self.streams.pop(stream_id, None)
+            self._saved.discard(stream_id)
+            self._dirty.discard(stream_id)
+        return self.streams.get(stream_id)
+
+    def _peer_paths(self, stream_id: str) -> List[str]:
+        if not self.checkpoint_dir or not os.path.isdir(self.checkpoint_dir):
+            return []
+        prefix = f"{self._safe(stream_id)}.w"
+        own = os.path.basename(self._path(stream_id, worker_id()))
+        return [
+            os.path.join(self.checkpoint_dir, name)
+            for name in os.listdir(self.checkpoint_dir)
+            if name.startswith(prefix) and name.endswith('.joblib') and name != own
+        ]
+
+    def _peer(self, path: str, stream_id: str) -> Optional[CovarianceStream]:
+        """Another worker's partial, re-read only when its file changes"""
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            return None
+        cached = self._peers.get(path)
+        if cached is None or cached[0] != mtime:
+            try:
+                saved = joblib.load(path)
+            except Exception as e:
+                logger.error(f"Could not load covariance stream partial {path}: {e}")
+                return None
+            if saved['stream'] != stream_id:
+                return None
+            cached = self._peers[path] = (mtime, saved['state'])
+        return cached[1]
+
+    def update(self, stream_id: str, columns: Sequence[str], rows: Any) -> int:
+        """Fold a batch into this worker's partial (the first batch fixes the columns)"""
+        with self.lock:
+            self._ensure_process()
+            stream = self._own(stream_id) or CovarianceStream(columns)
+            used = stream.update(columns, rows)
+            self.streams[stream_id] = stream
+            self._dirty.add(stream_id)
+        if self.checkpoint_dir and time.monotonic() - self._last_checkpoint >= self.checkpoint_interval:
+            self.checkpoint()
+        return used
+
+    def merge_partial(self, stream_id: str, state: Dict[str, Any]) -> None:
+        """Fold an exported partial (e.g. from another service) into this worker's partial"""
+        partial = CovarianceStream.from_export(state)
+        with self.lock:
+            self._ensure_process()
+            stream = self._own(stream_id)
+            self.streams[stream_id] = stream.merge(partial) if stream is not None else partial
+            self._dirty.add(stream_id)
+
+    def partial(self, stream_id: str) -> Optional[CovarianceStream]:
+        with self.lock:
+            self._ensure_process()
+            return self._own(stream_id)
+
+    def view(self, stream_id: str) -> Optional[CovarianceStream]:
+        """This worker's partial merged with every other worker's last saved partial"""
+        with self.lock:
+            self._ensure_process()
+            merged = self._own(stream_id)
+            for path in self._peer_paths(stream_id):
+                peer = self._peer(path, stream_id)
+                if peer is not None:
+                    merged = peer if merged is None else merged.merge(peer)
+            return merged
+
+    def delete(self, stream_id: str) -> bool:
+        """Drop the stream here and every saved partial (other workers drop theirs on next use)"""
+        with self.lock:
+            self._ensure_process()
+            found = self.streams.pop(stream_id, None) is not None
+            self._dirty.discard(stream_id)
+            self._saved.discard(stream_id)
+            paths = self._peer_paths(stream_id)
+            if self.checkpoint_dir:
+                paths.append(self._path(stream_id, worker_id()))
+            for path in paths:
+                try:
+                    os.remove(path)
+                    found = True
+                except OSError:
+                    pass
+                self._peers.pop(path, None)
+            return found
+
+    def checkpoint(self) -> None:
+        """Write this worker's changed partials (atomically, via a temporary file)"""
+        if not self.checkpoint_dir:
+            return
+        os.makedirs(self.checkpoint_dir, exist_ok=True)
+        with self.lock:
+            self._ensure_process()
+            for stream_id in list(self._dirty):
+                path = self._path(stream_id, worker_id())
+                joblib.dump({'stream': stream_id, 'worker': worker_id(), 'state': self.streams[stream_id]}, path + '.tmp')
+                os.replace(path + '.tmp', path)
+                self._saved.add(stream_id)
+            self._dirty.clear()
+            self._last_checkpoint = time.monotonic()
+
+
+covariance_streams = CovarianceStreamStore(
+    checkpoint_dir=os.getenv("ANALYTICS_COVARIANCE_DIR") or None,
+    checkpoint_interval=float(os.getenv("ANALYTICS_COVARIANCE_CHECKPOINT_S", "10"))
+)
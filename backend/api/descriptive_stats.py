@@ -0,0 +1,167 @@
+"""
+Descriptive Statistics Kernel
+Shared one-pass moments, extremes and selection-based quantiles for every engine
+"""
+
+import numpy as np
+from typing import Any, Dict, Sequence
+from .precision import as_float_array
+
+# Elements per block; a block of float64 values stays resident in L2 cache while
+# its mean, central moments and extremes are taken, so main memory is read once.
+BLOCK_SIZE = 1 << 16
+
+
+def _as_output(value: Any) -> Any:
+    """Plain floats for 1-D input, arrays for row-wise input"""
+    return float(value) if np.ndim(value) == 0 else value
+
+
+class Moments:
+    """Mergeable count, mean, central moment sums (M2..M4) and extremes along the last axis"""
+
+    def __init__(self, count=0, mean=0.0, m2=0.0, m3=0.0, m4=0.0, minimum=np.inf, maximum=-np.inf):
+        self.count = count
+        self.mean = mean
+        self.m2 = m2
+        self.m3 = m3
+        self.m4 = m4
+        self.minimum = minimum
+        self.maximum = maximum
+
+    @classmethod
+    def from_block(cls, block: np.ndarray) -> 'Moments':
+        """Summarize one cache-sized block"""
+        count = block.shape[-1]
+        if count == 0:
+            return cls()
+        # float32 blocks are centered in their own precision but summed in float64
+        mean = block.mean(axis=-1, dtype=np.float64)
+        centered = block - mean[..., None].astype(block.dtype, copy=False)
+        squared = centered * centered
+        return cls(
+            count,
+            mean,
+            squared.sum(axis=-1, dtype=np.float64),
+            (squared * centered).sum(axis=-1, dtype=np.float64),
+            (squared * squared).sum(axis=-1, dtype=np.float64),
+            block.min(axis=-1),
+            block.max(axis=-1)
+        )
+
+    @classmethod
+    def from_values(cls, values: np.ndarray, block_size: int = BLOCK_SIZE) -> 'Moments':
+        """Accumulate moments block by block along the last axis"""
+        rows = int(np.prod(values.shape[:-1])) or 1
+        step = max(1, block_size // rows)
+        moments = cls()
+        for start in range(0, values.shape[-1], step):
+            moments = moments.merge(cls.from_block(values[..., start:start + step]))
+        return moments
+
+    def merge(self, other: 'Moments') -> 'Moments':
+        """Combine two partial summaries (Chan et al. / Pebay update formulas)"""
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            return other
+
+        n_a, n_b = self.count, other.count
+        n = n_a + n_b
+        delta = other.mean - self.mean
+        delta_n = delta / n
+        delta_n2 = delta_n * delta_n
+        term = delta * delta_n * n_a * n_b
+
+        mean = self.mean + delta_n * n_b
+        m2 = self.m2 + other.m2 + term
+        m3 = (
+            self.m3 + other.m3
+            + term * delta_n * (n_a - n_b)
+            + 3.0 * delta_n * (n_a * other.m2 - n_b * self.m2)
+        )
+        m4 = (
+            self.m4 + other.m4
+            + term * delta_n2 * (n_a * n_a - n_a * n_b + n_b * n_b)
+            + 6.0 * delta_n2 * (n_a * n_a * other.m2 + n_b * n_b * self.m2)
+            + 4.0 * delta_n * (n_a * other.m3 - n_b * self.m3)
+        )
+        return Moments(
+            n,
+            mean,
+            m2,
+            m3,
+            m4,
+            np.minimum(self.minimum, other.minimum),
+            np.maximum(self.maximum, other.maximum)
+        )
+
+    def to_statistics(self) -> Dict[str, Any]:
+        """Population std and biased skewness / Fisher kurtosis (scipy.stats defaults)"""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            variance = self.m2 / self.count
+            skewness = (self.m3 / self.count) / variance ** 1.5
+            kurtosis = (self.m4 / self.count) / (variance * variance) - 3.0
+        return {
+            'count': int(self.count),
+            'mean': _as_output(self.mean),
+            'std': _as_output(np.sqrt(variance)),
+            'min': _as_output(self.minimum),
+            'max': _as_output(self.maximum),
+            'skewness': _as_output(skewness),
+            'kurtosis': _as_output(kurtosis)
+        }
+
+
+def select_quantiles(values: np.ndarray, quantiles: Sequence[float]) -> Dict[float, Any]:
+    """Linear-interpolated quantiles from a single partial sort (O(n) selection)"""
+    if not quantiles:
+        return {}
+    n = values.shape[-1]
+    positions = np.asarray(quantiles, dtype=float) * (n - 1)
+    if np.any((positions < 0) | (positions > n - 1)):
+        raise ValueError("Quantiles must be between 0 and 1")
+    lower = np.floor(positions).astype(int)
+    upper = np.ceil(positions).astype(int)
+    kth = np.unique(np.concatenate([lower, upper]))
+    selected = np.partition(values, kth, axis=-1)
+
+    results = {}
+    for q, lo, hi, pos in zip(quantiles, lower, upper, positions):
+        low_value = selected[..., lo]
+        results[q] = _as_output(low_value + (selected[..., hi] - low_value) * (pos - lo))
+    return results
+
+
+def describe(values: Any, quantiles: Sequence[float] = (0.5,)) -> Dict[str, Any]:
+    """Count, mean, std, extremes, skewness, kurtosis and quantiles in one pass over memory
+
+    Works on a 1-D series or row-wise on a 2-D matrix. The median is reported
+    under 'median' whenever 0.5 is among the requested quantiles. float32 input
+    is kept in float32; only the accumulators are float64.
+    """
+    data = as_float_array(values)
+    if data.ndim not in (1, 2):
+        raise ValueError("Expected a 1-D series or a 2-D matrix of series")
+    if data.size == 0:
+        raise ValueError("Cannot describe an empty series")
+
+    if data.ndim == 1:
+        results = Moments.from_values(data).to_statistics()
+    else:
+        # Rows are independent, so slabs of whole rows avoid merging across blocks
+        rows_per_slab = max(1, BLOCK_SIZE // data.shape[1])
+        slabs = [
+            Moments.from_values(data[start:start + rows_per_slab]).to_statistics()
+            for start in range(0, data.shape[0], rows_per_slab)
+        ]
+        results = {'count': slabs[0]['count']}
+        for name in ('mean', 'std', 'min', 'max', 'skewness', 'kurtosis'):
+            results[name] = np.concatenate([np.atleast_1d(slab[name]) for slab in slabs])
+
+    if quantiles:
+        results['quantiles'] = select_quantiles(data, quantiles)
+        if 0.5 in results['quantiles']:
+            results['median'] = results['quantiles'][0.5]
+
+    return results
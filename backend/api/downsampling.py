@@ -0,0 +1,111 @@
+"""
+Downsampling Module
+Chart-bound reduction of long response arrays (LTTB and min/max per bucket)
+"""
+
+from typing import Any, Optional
+
+import numpy as np
+
+DOWNSAMPLING_METHODS = ('lttb', 'minmax')
+
+# MinMaxLTTB: long inputs are first reduced to min/max candidates in this many
+# buckets per output point, so the sequential LTTB pass only sees a few points each
+PRESELECTION_RATIO = 4
+
+
+def minmax_indices(values: np.ndarray, n_buckets: int) -> np.ndarray:
+    """Positions of the minimum and maximum of each of `n_buckets` equal buckets, plus both ends"""
+    n = values.size
+    n_buckets = max(1, min(n_buckets, n))
+    width = -(-n // n_buckets)
+    # Edge padding repeats the last value, so padded slots never win over a real point
+    padded = np.pad(values, (0, width * n_buckets - n), mode='edge').reshape(n_buckets, width)
+    offsets = np.arange(n_buckets) * width
+    candidates = np.concatenate([
+        offsets + padded.argmin(axis=1),
+        offsets + padded.argmax(axis=1),
+        [0, n - 1]
+    ])
+    return np.unique(np.minimum(candidates, n - 1))
+
+
+def lttb_indices(values: np.ndarray, max_points: int, x: Optional[np.ndarray] = None) -> np.ndarray:
+    """Largest-triangle-three-buckets selection of `max_points` positions (first and last always kept)"""
+    y = np.asarray(values, dtype=float)
+    n = y.size
+    if max_points >= n:
+        return np.arange(n)
+    if max_points < 3:
+        raise ValueError("LTTB needs max_points of at least 3")
+    x = np.arange(n, dtype=float) if x is None else np.asarray(x, dtype=float)
+
+    # n - 2 interior points split into max_points - 2 buckets
+    edges = np.linspace(1, n - 1, max_points - 1).astype(np.int64)
+    counts = np.diff(edges)
+    mean_x = np.add.reduceat(x[:n - 1], edges[:-1]) / counts
+    mean_y = np.add.reduceat(y[:n - 1], edges[:-1]) / counts
+    # The third vertex for bucket i is the centroid of bucket i + 1 (the last point for the final bucket)
+    next_x = np.append(mean_x[1:], x[-1])
+    next_y = np.append(mean_y[1:], y[-1])
+
+    selected = np.empty(max_points, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    anchor = 0
+    for i in range(max_points - 2):
+        lo, hi = edges[i], edges[i + 1]
+        ax, ay = x[anchor], y[anchor]
+        area = np.abs((ax - next_x[i]) * (y[lo:hi] - ay) - (ax - x[lo:hi]) * (next_y[i] - ay))
+        anchor = lo + int(np.argmax(area))
+        selected[i + 1] = anchor
+    return selected
+
+
+def outlier_indices(values: Any, threshold: float = 3.0) -> np.ndarray:
+    """Positions more than `threshold` standard deviations from the mean"""
+    values = np.asarray(values, dtype=float)
+    std = values.std()
+    if values.size == 0 or std == 0:
+        return np.empty(0, dtype=np.int64)
+    return np.flatnonzero(np.abs(values - values.mean()) > threshold * std)
+
+
+def downsample_indices(
+    values: Any,
+    max_points: int,
+    method: str = 'lttb',
+    keep: Optional[Any] = None
+) -> np.ndarray:
+    """Sorted positions to keep so that a chart of `values` needs about `max_points` points
+
+    The global minimum and maximum and every index in `keep` (e.g. anomalies)
+    are always retained, so the result can exceed `max_points` by those. LTTB needs
+    three points (both ends and one bucket), so smaller budgets use min-max.
+    """
+    if method not in DOWNSAMPLING_METHODS:
+        raise ValueError(f"Unsupported downsampling method '{method}'; use one of {', '.join(DOWNSAMPLING_METHODS)}")
+    values = np.asarray(values, dtype=float).ravel()
+    n = values.size
+    if max_points <= 0 or n <= max_points:
+        return np.arange(n)
+    if max_points < 3:
+        method = 'minmax'
+
+    if method == 'minmax':
+        indices = minmax_indices(values, max(1, (max_points - 2) // 2))
+    elif n > PRESELECTION_RATIO * max_points:
+        candidates = minmax_indices(values, PRESELECTION_RATIO * max_points // 2)
+        indices = candidates[lttb_indices(values[candidates], max_points, x=candidates)]
+    else:
+        indices = lttb_indices(values, max_points)
+
+    extra = [np.argmin(values), np.argmax(values)]
+    if keep is not None:
+        extra = np.concatenate([extra, np.asarray(keep, dtype=np.int64).ravel()])
+    return np.union1d(indices, np.clip(extra, 0, n - 1)).astype(np.int64)
+
+
+def take(values: Any, indices: np.ndarray) -> list:
+    """Values at `indices` as a JSON-ready list"""
+    return np.asarray(values)[indices].tolist()
@@ -0,0 +1,162 @@
+"""
+Forest Intervals Module
+Prediction intervals from one stacked pass over a random forest's trees, calibrated on cached out-of-bag residuals
+"""
+
+import hashlib
+import math
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor
+
+INTERVAL_METHODS = ('conformal', 'quantile')
+DEFAULT_INTERVAL_METHOD = 'conformal'
+DEFAULT_CONFIDENCE = 0.95
+
+MB = 1 << 20
+# A fitted tree node (64-byte node struct plus its value) and our flattened copy of the value
+NODE_BYTES = 80
+
+
+class ForestIntervals:
+    """A fitted forest with its node values flattened and its out-of-bag residuals sorted
+
+    Per-tree predictions come from one `apply()` pass (leaf index of every sample in
+    every tree) and a gather from the flattened values, so the whole ensemble costs a
+    single matrix instead of one `predict()` per tree. The residuals of the out-of-bag
+    predictions serve as the calibration set: each training point is scored only by
+    trees that never saw it, so no separate hold-out split or refit is needed.
+    """
+
+    def __init__(self, forest: RandomForestRegressor, y: np.ndarray):
+        trees = [estimator.tree_ for estimator in forest.estimators_]
+        self.forest = forest
+        self.offsets = np.cumsum([0] + [tree.node_count for tree in trees[:-1]])
+        self.node_values = np.concatenate([tree.value[:, 0, 0] for tree in trees])
+        residuals = np.asarray(y, dtype=np.float64) - np.ravel(getattr(forest, 'oob_prediction_', np.full(len(y), np.nan)))
+        self.abs_residuals = np.sort(np.abs(residuals[np.isfinite(residuals)]))
+
+    @classmethod
+    def fit(cls, X: np.ndarray, y: np.ndarray, n_estimators: int = 100, random_state: Optional[int] = None) -> 'ForestIntervals':
+        forest = RandomForestRegressor(n_estimators=n_estimators, oob_score=True, random_state=random_state)
+        forest.fit(X, y)
+        return cls(forest, y)
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.node_values.size) * NODE_BYTES
+
+    def tree_predictions(self, X: np.ndarray) -> np.ndarray:
+        """Predictions of every tree, shape (n_trees, n_samples); their mean is `forest.predict(X)`"""
+        leaves = self.forest.apply(X)  # (n_samples, n_trees) node ids, local to each tree
+        return self.node_values[leaves + self.offsets].T
+
+    def conformal_half_width(self, confidence: float) -> float:
+        """Split-conformal quantile of |residual|, capped at the largest one when the level exceeds the data"""
+        n = len(self.abs_residuals)
+        if not n:
+            return math.nan
+        rank = min(n, math.ceil((n + 1) * confidence))
+        return float(self.abs_residuals[rank - 1])
+
+    def predict(self, X: np.ndarray, confidence: float = DEFAULT_CONFIDENCE, method: str = DEFAULT_INTERVAL_METHOD) -> Dict[str, Any]:
+        """Point predictions with `confidence`-level bounds
+
+        'conformal' adds the calibrated residual quantile on both sides; 'quantile'
+        takes quantiles of the per-tree predictions, which covers the model's own
+        uncertainty but not the noise around it, so it runs narrower. Conformal falls
+        back to quantile when no out-of-bag residuals exist.
+        """
+        confidence, method = interval_config({'confidence': confidence, 'interval_method': method})
+        per_tree = self.tree_predictions(X)
+        predictions = per_tree.mean(axis=0)
+        half_width = self.conformal_half_width(confidence) if method == 'conformal' else math.nan
+        if math.isnan(half_width):
+            method = 'quantile'
+            lower, upper = np.quantile(per_tree, [(1 - confidence) / 2, (1 + confidence) / 2], axis=0)
+        else:
+            lower, upper = predictions - half_width, predictions + half_width
+        return {
+            'predictions': predictions,
+            'lower': lower,
+            'upper': upper,
+            'method': method,
+            'calibration_size': len(self.abs_residuals)
+        }
+
+
+def interval_config(config: Dict[str, Any]) -> Tuple[float, str]:
+    """Validated (confidence, interval method) from an analysis config"""
+    confidence = float(config.get('confidence', DEFAULT_CONFIDENCE))
+    method = config.get('interval_method', DEFAULT_INTERVAL_METHOD)
+    if method not in INTERVAL_METHODS:
+        raise ValueError(f"Unknown interval method '{method}'; expected one of {', '.join(INTERVAL_METHODS)}")
+    if not 0 < confidence < 1:
+        raise ValueError("Confidence must be between 0 and 1")
+    return confidence, method
+
+
+def _series_key(values: np.ndarray, n_estimators: int) -> str:
+    digest = hashlib.blake2b(values.tobytes(), digest_size=16)
+    digest.update(f"{values.dtype.str}:{n_estimators}".encode())
+    return digest.hexdigest()
+
+
+class ForestCache:
+    """Forests fitted on a series' positions, by content hash; least recently used evicted past `max_bytes`
+
+    Repeated forecasts of the same series (dashboards polling, or the analyze and
+    forecast endpoints on one dataset) reuse the fitted trees and residuals, so their
+    intervals cost only the stacked prediction pass.
+    """
+
+    def __init__(self, max_bytes: int = 256 * MB):
+        self.max_bytes = max_bytes
+        self.entries: 'OrderedDict[str, ForestIntervals]' = OrderedDict()
+        self.lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def fit(self, values: np.ndarray, n_estimators: int = 100) -> ForestIntervals:
+        """The forest of `values` against their positions 0..n-1, fitted on first use"""
+        values = np.ascontiguousarray(values)
+        key = _series_key(values, n_estimators)
+        with self.lock:
+            intervals = self.entries.get(key)
+            if intervals is not None:
+                self.entries.move_to_end(key)
+                return intervals
+
+        X = np.arange(len(values), dtype=values.dtype).reshape(-1, 1)
+        intervals = ForestIntervals.fit(X, values, n_estimators)
+        if intervals.nbytes <= self.max_bytes:
+            with self.lock:
+                self.entries[key] = intervals
+                total = sum(entry.nbytes for entry in self.entries.values())
+                while total > self.max_bytes:
+                    _, evicted = self.entries.popitem(last=False)
+                    total -= evicted.nbytes
+        return intervals
+
+
+def forecast_intervals(
+    values: np.ndarray,
+    horizon: int,
+    confidence: float = DEFAULT_CONFIDENCE,
+    method: str = DEFAULT_INTERVAL_METHOD,
+    n_estimators: int = 100
+) -> Dict[str, Any]:
+    """Forest forecast of the `horizon` positions after `values`, with its interval"""
+    values = np.asarray(values)
+    if not np.issubdtype(values.dtype, np.floating):
+        values = values.astype(np.float64)
+    future_X = np.arange(len(values), len(values) + horizon, dtype=values.dtype).reshape(-1, 1)
+    return forest_cache.fit(values, n_estimators).predict(future_X, confidence, method)
+
+
+forest_cache = ForestCache(max_bytes=int(float(os.getenv("ANALYTICS_FOREST_CACHE_MB", "256")) * MB))
@@ -0,0 +1,390 @@
+"""
+Hypothesis Testing Module
+Batched two-sample and k-sample tests across many groups and metrics, with multiple-testing correction
+"""
+
+import warnings
+from concurrent.futures import Executor
+from itertools import combinations
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from .metrics import stage_timer
+
+PARAMETRIC_TESTS = ('t_test', 'welch')
+RESAMPLING_TESTS = ('permutation', 'bootstrap')
+TWO_SAMPLE_TESTS = PARAMETRIC_TESTS + ('mann_whitney',) + RESAMPLING_TESTS
+HYPOTHESIS_TESTS = TWO_SAMPLE_TESTS + ('anova',)
+DEFAULT_TESTS = ('t_test', 'welch', 'mann_whitney', 'anova')
+CORRECTIONS = ('holm', 'bonferroni', 'fdr_bh', 'fdr_by', 'none')
+ALTERNATIVES = ('two-sided', 'less', 'greater')
+
+DEFAULT_RESAMPLES = 9999
+# Resamples per block; every block has its own seed, so results do not depend on the worker count
+RESAMPLE_BLOCK = 1024
+# Upper bound on one block's resampling matrix, for pairs with many rows
+RESAMPLE_BLOCK_BYTES = 32 << 20
+
+
+def group_matrix(labels: Sequence[Any], metrics: Mapping[str, Sequence[Optional[float]]]) -> Tuple[List[Any], List[str], np.ndarray, np.ndarray]:
+    """Group names, metric names, rows sorted by group (NaN where missing) and each group's first row"""
+    metric_names = list(metrics)
+    if not metric_names:
+        raise ValueError("At least one metric is required")
+    if any(len(metrics[name]) != len(labels) for name in metric_names):
+        raise ValueError("Every metric needs one value per group label")
+
+    if len({type(label) for label in labels}) > 1:
+        # Mixed str / int labels cannot be sorted against each other
+        labels = [str(label) for label in labels]
+    codes, names = pd.factorize(pd.Series(labels, dtype=object), sort=True)
+    if len(names) < 2:
+        raise ValueError("At least two groups are required")
+    values = np.column_stack([
+        np.array([np.nan if v is None else v for v in metrics[name]], dtype=np.float64) for name in metric_names
+    ])
+    values[~np.isfinite(values)] = np.nan
+    order = np.argsort(codes, kind='stable')
+    starts = np.searchsorted(codes[order], np.arange(len(names)))
+    return names.tolist(), metric_names, values[order], starts
+
+
+def group_moments(values: np.ndarray, starts: np.ndarray) -> Dict[str, np.ndarray]:
+    """Count, mean and sample variance of every (group, metric) in one segmented pass"""
+    present = ~np.isnan(values)
+    count = np.add.reduceat(present, starts, axis=0, dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = np.add.reduceat(np.where(present, values, 0.0), starts, axis=0) / count
+        sizes = np.diff(np.append(starts, values.shape[0]))
+        centered = np.where(present, values - np.repeat(mean, sizes, axis=0), 0.0)
+        variance = np.add.reduceat(centered * centered, starts, axis=0) / (count - 1)
+    variance[count < 2] = np.nan
+    return {'count': count, 'mean': mean, 'variance': variance}
+
+
+def adjust_p_values(p_values: np.ndarray, method: str) -> np.ndarray:
+    """Family-wise (Bonferroni, Holm) or false-discovery-rate (BH, BY) adjusted p-values; NaNs are left out"""
+    if method not in CORRECTIONS:
+        raise ValueError(f"Unknown correction '{method}'; expected one of {CORRECTIONS}")
+    adjusted = np.full(p_values.shape, np.nan)
+    valid = ~np.isnan(p_values)
+    p = p_values[valid]
+    if method == 'none' or p.size == 0:
+        adjusted[valid] = p
+    elif method == 'bonferroni':
+        adjusted[valid] = np.minimum(p * p.size, 1.0)
+    elif method == 'holm':
+        order = np.argsort(p)
+        stepped = np.minimum(np.maximum.accumulate((p.size - np.arange(p.size)) * p[order]), 1.0)
+        result = np.empty_like(p)
+        result[order] = stepped
+        adjusted[valid] = result
+    else:
+        adjusted[valid] = stats.false_discovery_control(p, method=method[len('fdr_'):])
+    return adjusted
+
+
+def parametric_tests(moments: Dict[str, np.ndarray], pairs: np.ndarray, equal_var: bool, alternative: str) -> Dict[str, np.ndarray]:
+    """Student or Welch t-tests for every (pair, metric) from the group moments, in one broadcast call"""
+    a, b = pairs[:, 0], pairs[:, 1]
+    n_a, n_b = moments['count'][a], moments['count'][b]
+    var_a, var_b = moments['variance'][a], moments['variance'][b]
+    statistic, p_value = stats.ttest_ind_from_stats(
+        moments['mean'][a], np.sqrt(var_a), n_a,
+        moments['mean'][b], np.sqrt(var_b), n_b,
+        equal_var=equal_var, alternative=alternative
+    )
+    pooled = ((n_a - 1) * var_a + (n_b - 1) * var_b) / (n_a + n_b - 2)
+    if equal_var:
+        df = n_a + n_b - 2
+    else:
+        # Welch-Satterthwaite degrees of freedom
+        se_a, se_b = var_a / n_a, var_b / n_b
+        df = (se_a + se_b) ** 2 / (se_a ** 2 / (n_a - 1) + se_b ** 2 / (n_b - 1))
+    return {
+        'statistic': statistic,
+        'p_value': p_value,
+        'df': df,
+        'effect_size': (moments['mean'][a] - moments['mean'][b]) / np.sqrt(pooled)  # Cohen's d
+    }
+
+
+def anova(moments: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """One-way ANOVA F-test of every metric across all groups with data for it"""
+    count, mean = moments['count'], moments['mean']
+    observed = count > 0
+    k = observed.sum(axis=0)
+    n = count.sum(axis=0)
+    grand = np.nansum(count * mean, axis=0) / n
+    between = np.nansum(np.where(observed, count * (mean - grand) ** 2, 0.0), axis=0)
+    within = np.nansum(np.where(count > 1, (count - 1) * moments['variance'], 0.0), axis=0)
+    df_between, df_within = k - 1, n - k
+    statistic = (between / df_between) / (within / df_within)
+    return {
+        'statistic': statistic,
+        'p_value': stats.f.sf(statistic, df_between, df_within),
+        'df_between': df_between,
+        'df_within': df_within,
+        'eta_squared': between / (between + within)
+    }
+
+
+def mann_whitney(a: np.ndarray, b: np.ndarray, alternative: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Mann-Whitney U of `a` against `b` for every metric (column) at once"""
+    nan_policy = 'omit' if np.isnan(a).any() or np.isnan(b).any() else 'propagate'
+    result = stats.mannwhitneyu(a, b, axis=0, alternative=alternative, nan_policy=nan_policy)
+    return np.asarray(result.statistic, dtype=np.float64), np.asarray(result.pvalue, dtype=np.float64)
+
+
+def _block_sizes(n_resamples: int, n_rows: int) -> List[int]:
+    size = max(1, min(RESAMPLE_BLOCK, RESAMPLE_BLOCK_BYTES // (16 * max(n_rows, 1))))
+    return [min(size, n_resamples - start) for start in range(0, n_resamples, size)]
+
+
+def _permuted_differences(filled: np.ndarray, present: np.ndarray, n_a: int, size: int, rng: np.random.Generator) -> np.ndarray:
+    """Mean differences under `size` random relabellings, as one indicator-matrix product"""
+    n = filled.shape[0]
+    chosen = np.argpartition(rng.random((size, n)), n_a - 1, axis=1)[:, :n_a]
+    indicator = np.zeros((size, n))
+    np.put_along_axis(indicator, chosen, 1.0, axis=1)
+    sums_a, counts_a = indicator @ filled, indicator @ present
+    return sums_a / counts_a - (filled.sum(axis=0) - sums_a) / (present.sum(axis=0) - counts_a)
+
+
+def _resampled_means(filled: np.ndarray, present: np.ndarray, size: int, rng: np.random.Generator) -> np.ndarray:
+    """Means of `size` bootstrap resamples, from a matrix of draw counts"""
+    n = filled.shape[0]
+    draws = rng.integers(0, n, (size, n)) + (np.arange(size) * n)[:, None]
+    weights = np.bincount(draws.ravel(), minlength=size * n).reshape(size, n).astype(np.float64)
+    return (weights @ filled) / (weights @ present)
+
+
+def _resampled_p_value(hits: np.ndarray, valid: np.ndarray, observed: np.ndarray) -> np.ndarray:
+    """(1 + hits) / (1 + valid), the estimate that never reports p = 0; NaN without an observed statistic"""
+    with np.errstate(invalid='ignore'):
+        p_value = (1 + hits) / (1 + valid)
+    return np.where(np.isfinite(observed) & (valid > 0), p_value, np.nan)
+
+
+def _exceedances(null: np.ndarray, observed: np.ndarray, alternative: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Resamples at least as extreme as `observed`, and resamples with a defined statistic"""
+    # Relative tolerance, so that ties with the observed statistic count despite rounding
+    tolerance = 1e-12 * np.abs(observed)
+    if alternative == 'two-sided':
+        extreme = np.abs(null) >= np.abs(observed) - tolerance
+    elif alternative == 'greater':
+        extreme = null >= observed - tolerance
+    else:
+        extreme = null <= observed + tolerance
+    valid = np.isfinite(null)
+    return (extreme & valid).sum(axis=0), valid.sum(axis=0)
+
+
+def _run_blocks(
+    block: Callable[[int, np.random.Generator], Any],
+    sizes: List[int],
+    seeds: List[np.random.SeedSequence],
+    executor: Optional[Executor]
+) -> List[Any]:
+    calls = [(size, np.random.default_rng(seed)) for size, seed in zip(sizes, seeds)]
+    if executor is None:
+        return [block(*call) for call in calls]
+    return list(executor.map(lambda call: block(*call), calls))
+
+
+def permutation_test(
+    a: np.ndarray,
+    b: np.ndarray,
+    observed: np.ndarray,
+    n_resamples: int,
+    seed: np.random.SeedSequence,
+    alternative: str,
+    executor: Optional[Executor] = None
+) -> np.ndarray:
+    """Permutation p-values of the mean difference for every metric; blocks run on `executor`
+
+    NumPy's generators, partitioning and BLAS release the GIL, so a thread pool
+    spreads the blocks across cores.
+    """
+    pooled = np.vstack([a, b])
+    present = ~np.isnan(pooled)
+    filled = np.where(present, pooled, 0.0)
+    present = present.astype(np.float64)
+    sizes = _block_sizes(n_resamples, pooled.shape[0])
+
+    def block(size: int, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+        return _exceedances(_permuted_differences(filled, present, a.shape[0], size, rng), observed, alternative)
+
+    counts = _run_blocks(block, sizes, seed.spawn(len(sizes)), executor)
+    hits = sum(count[0] for count in counts)
+    valid = sum(count[1] for count in counts)
+    return _resampled_p_value(hits, valid, observed)
+
+
+def bootstrap_test(
+    a: np.ndarray,
+    b: np.ndarray,
+    observed: np.ndarray,
+    n_resamples: int,
+    seed: np.random.SeedSequence,
+    alternative: str,
+    confidence: float,
+    executor: Optional[Executor] = None
+) -> Dict[str, np.ndarray]:
+    """Bootstrap p-values and percentile interval of the mean difference for every metric
+
+    Each group is resampled on its own. Under the null hypothesis both groups are
+    shifted to a common mean, so the null distribution is the resampled difference
+    minus the observed one.
+    """
+    parts = []
+    for sample in (a, b):
+        present = ~np.isnan(sample)
+        parts.append((np.where(present, sample, 0.0), present.astype(np.float64)))
+    sizes = _block_sizes(n_resamples, a.shape[0] + b.shape[0])
+
+    def block(size: int, rng: np.random.Generator) -> np.ndarray:
+        return _resampled_means(*parts[0], size, rng) - _resampled_means(*parts[1], size, rng)
+
+    differences = np.vstack(_run_blocks(block, sizes, seed.spawn(len(sizes)), executor))
+    hits, valid = _exceedances(differences - observed, observed, alternative)
+    tail = (1 - confidence) / 2
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        low, high = np.nanquantile(differences, [tail, 1 - tail], axis=0)
+    return {'p_value': _resampled_p_value(hits, valid, observed), 'ci_low': low, 'ci_high': high}
+
+
+def _json_values(values: np.ndarray) -> List[Any]:
+    """List with NaN and infinities replaced by None, since JSON has neither"""
+    values = np.asarray(values)
+    if values.dtype.kind == 'f' and not np.isfinite(values).all():
+        return [v if np.isfinite(v) else None for v in values.tolist()]
+    return values.tolist()
+
+
+def _as_rows(columns: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+    names = list(columns)
+    return [dict(zip(names, row)) for row in zip(*columns.values())]
+
+
+def hypothesis_tests(
+    labels: Sequence[Any],
+    metrics: Mapping[str, Sequence[Optional[float]]],
+    config: Optional[Dict[str, Any]] = None,
+    executor: Optional[Executor] = None
+) -> Dict[str, Any]:
+    """Run the configured tests for every metric over every pair of groups (or each group against `control`)
+
+    Rows are labelled by `labels`; each metric has one value per row (None / NaN
+    for missing). p-values of each test are adjusted together with `correction`.
+    """
+    config = config or {}
+    tests = list(config.get('tests', DEFAULT_TESTS))
+    alternative = config.get('alternative', 'two-sided')
+    correction = config.get('correction', 'holm')
+    alpha = float(config.get('alpha', 0.05))
+    n_resamples = int(config.get('n_resamples', DEFAULT_RESAMPLES))
+    output_format = config.get('format', 'rows')
+
+    unknown = [test for test in tests if test not in HYPOTHESIS_TESTS]
+    if unknown:
+        raise ValueError(f"Unknown tests {unknown}; expected any of {HYPOTHESIS_TESTS}")
+    if alternative not in ALTERNATIVES:
+        raise ValueError(f"alternative must be one of {ALTERNATIVES}")
+    if correction not in CORRECTIONS:
+        raise ValueError(f"correction must be one of {CORRECTIONS}")
+    if not 0 < alpha < 1:
+        raise ValueError("alpha must be between 0 and 1")
+    if n_resamples < 1:
+        raise ValueError("n_resamples must be at least 1")
+
+    with stage_timer('hypothesis', 'moments'):
+        groups, metric_names, values, starts = group_matrix(labels, metrics)
+        moments = group_moments(values, starts)
+    ends = np.append(starts[1:], values.shape[0])
+    samples = [values[start:end] for start, end in zip(starts, ends)]
+
+    control = config.get('control')
+    if control is not None:
+        if control not in groups and str(control) in groups:
+            control = str(control)
+        if control not in groups:
+            raise ValueError(f"Control group '{control}' has no rows")
+        c = groups.index(control)
+        pairs = np.array([(g, c) for g in range(len(groups)) if g != c])
+    else:
+        pairs = np.array(list(combinations(range(len(groups)), 2)))
+
+    m = len(metric_names)
+    a, b = pairs[:, 0], pairs[:, 1]
+    mean_difference = moments['mean'][a] - moments['mean'][b]
+    pair_columns = {
+        'metric': metric_names * len(pairs),
+        'group_a': [groups[i] for i in np.repeat(a, m)],
+        'group_b': [groups[i] for i in np.repeat(b, m)],
+        'n_a': moments['count'][a].astype(int).ravel().tolist(),
+        'n_b': moments['count'][b].astype(int).ravel().tolist(),
+        'mean_difference': _json_values(mean_difference.ravel())
+    }
+
+    results: Dict[str, Dict[str, np.ndarray]] = {}
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        for test in tests:
+            with stage_timer('hypothesis', test):
+                if test in PARAMETRIC_TESTS:
+                    results[test] = parametric_tests(moments, pairs, test == 't_test', alternative)
+                elif test == 'anova':
+                    results[test] = anova(moments)
+                elif test == 'mann_whitney':
+                    u = [mann_whitney(samples[i], samples[j], alternative) for i, j in pairs]
+                    results[test] = {'statistic': np.array([s for s, _ in u]), 'p_value': np.array([p for _, p in u])}
+                else:
+                    root = np.random.SeedSequence(int(config.get('seed', 0)), spawn_key=(HYPOTHESIS_TESTS.index(test),))
+                    resampled = []
+                    for (i, j), seed, observed in zip(pairs, root.spawn(len(pairs)), mean_difference):
+                        if test == 'permutation':
+                            p = permutation_test(samples[i], samples[j], observed, n_resamples, seed, alternative, executor)
+                            resampled.append({'p_value': p})
+                        else:
+                            resampled.append(bootstrap_test(
+                                samples[i], samples[j], observed, n_resamples, seed, alternative, 1 - alpha, executor
+                            ))
+                    results[test] = {key: np.array([r[key] for r in resampled]) for key in resampled[0]}
+                    results[test]['statistic'] = mean_difference
+
+    tests_output = {}
+    for test, result in results.items():
+        p_adjusted = adjust_p_values(result['p_value'].ravel(), correction)
+        columns = dict(pair_columns) if test != 'anova' else {'metric': metric_names}
+        for key, value in result.items():
+            columns[key] = _json_values(np.asarray(value, dtype=np.float64).ravel())
+        columns['p_adjusted'] = _json_values(p_adjusted)
+        columns['reject'] = (p_adjusted < alpha).tolist()
+        tests_output[test] = columns if output_format == 'columnar' else _as_rows(columns)
+
+    std = np.sqrt(moments['variance'])
+    return {
+        'groups': groups,
+        'metrics': metric_names,
+        'group_statistics': {
+            metric: {
+                str(group): {
+                    'count': int(moments['count'][g, k]),
+                    'mean': _json_values(moments['mean'][g, k:k + 1])[0],
+                    'std': _json_values(std[g, k:k + 1])[0]
+                }
+                for g, group in enumerate(groups)
+            }
+            for k, metric in enumerate(metric_names)
+        },
+        'alternative': alternative,
+        'correction': correction,
+        'alpha': alpha,
+        'n_resamples': n_resamples if any(test in RESAMPLING_TESTS for test in tests) else None,
+        'tests': tests_output
+    }
@@ -0,0 +1,358 @@
+"""
+Industry Router
+Time-stamped metric analysis per industry, with online per-metric models that forecast without refitting
+"""
+
+from fastapi import APIRouter, BackgroundTasks, HTTPException
+from pydantic import BaseModel
+from typing import List, Dict, Any, Optional
+import numpy as np
+from sklearn.ensemble import IsolationForest
+import pandas as pd
+from datetime import datetime
+from scipy import stats
+import logging
+from .descriptive_stats import describe
+from .vectorized import segment_statistics, segment_trend
+from .metrics import cache_entries
+from .downsampling import downsample_indices, take
+from .online_models import online_models, MIN_SAMPLES
+from .baselines import anomaly_baselines
+from .forest_intervals import DEFAULT_INTERVAL_METHOD, INTERVAL_METHODS, forecast_intervals
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/industry")
+
+# Data Models
+class DataPoint(BaseModel):
+    timestamp: datetime
+    value: float
+    metric: str
+    category: Optional[str] = None
+
+class AnalysisRequest(BaseModel):
+    data: List[DataPoint]
+    industry: str
+    analysis_type: str
+    parameters: Optional[Dict[str, Any]] = None
+
+class PredictionRequest(BaseModel):
+    data: List[float] = []
+    horizon: int
+    confidence: float
+    max_points: Optional[int] = None
+    downsample: str = 'lttb'
+    interval_method: str = DEFAULT_INTERVAL_METHOD  # 'conformal' or 'quantile'
+    # Forecast from the online model of this industry / metric (/ category) instead of refitting on `data`
+    industry: Optional[str] = None
+    metric: Optional[str] = None
+    category: Optional[str] = None
+
+class AnomalyDetectionRequest(BaseModel):
+    data: List[float]
+    threshold: float = 0.95
+    # Score against this stored reference baseline instead of fitting on `data`
+    baseline: Optional[str] = None
+
+def group_label(metric: str, category: Optional[str]) -> str:
+    return metric if category is None else f"{metric} ({category})"
+
+# Industry Engine
+class IndustryAnalytics:
+    def __init__(self):
+        # Online per-industry, per-(metric, category) learners, updated as data arrives at /analyze
+        self.models = online_models
+
+    def prepare_data(self, data: List[DataPoint]) -> Dict[str, Any]:
+        """Column arrays of the data points, sorted by (metric, category) group and then by time
+
+        `lengths`, `group_metrics` and `group_categories` describe the contiguous groups.
+        """
+        n = len(data)
+        values = np.fromiter((dp.value for dp in data), dtype=float, count=n)
+        timestamps = np.fromiter((dp.timestamp.timestamp() for dp in data), dtype=float, count=n)
+        metric_codes, metrics = pd.factorize(np.array([dp.metric for dp in data], dtype=object))
+        category_codes, categories = pd.factorize(
+            np.array([dp.category for dp in data], dtype=object),
+            use_na_sentinel=False
+        )
+
+        keys, first, groups = np.unique(
+            metric_codes.astype(np.int64) * len(categories) + category_codes,
+            return_index=True,
+            return_inverse=True
+        )
+        order = np.lexsort((timestamps, groups))
+        return {
+            'values': values[order],
+            'timestamps': timestamps[order],
+            'lengths': np.bincount(groups.ravel(), minlength=len(keys)),
+            'group_metrics': metrics[metric_codes[first]],
+            'group_categories': [None if pd.isna(c) else c for c in categories[category_codes[first]]]
+        }
+
+    def update_models(self, columns: Dict[str, Any], industry: str) -> None:
+        """partial_fit the online model of every (metric, category) group on `prepare_data` columns"""
+        try:
+            self.models.update(
+                industry,
+                np.repeat(np.asarray(columns['group_metrics'], dtype=object), columns['lengths']),
+                columns['timestamps'],
+                columns['values'],
+                categories=np.repeat(np.asarray(columns['group_categories'], dtype=object), columns['lengths'])
+            )
+        except Exception as e:
+            logger.error(f"Error updating online models: {str(e)}")
+
+    def calculate_statistics(self, data: List[float]) -> Dict[str, float]:
+        """Calculate basic statistics"""
+        summary = describe(data)
+        return {
+            name: summary[name]
+            for name in ('mean', 'median', 'std', 'min', 'max', 'skewness', 'kurtosis')
+        }
+
+    def detect_trends(self, data: List[float]) -> Dict[str, Any]:
+        """Detect trends in time series data"""
+        x = np.arange(len(data))
+        slope, intercept, r_value, p_value, std_err = stats.linregress(x, data)
+        
+        return {
+            'trend': 'upward' if slope > 0 else 'downward',
+            'strength': abs(r_value),
+            'slope': float(slope),
+            'p_value': float(p_value)
+        }
+
+    def predict_future_values(
+        self,
+        data: List[float],
+        horizon: int,
+        confidence: float,
+        interval_method: str = DEFAULT_INTERVAL_METHOD
+    ) -> Dict[str, Any]:
+        """Predict future values using ML model"""
+        try:
+            forecast = forecast_intervals(np.array(data, dtype=np.float64), horizon, confidence, interval_method)
+            return {
+                'predictions': forecast['predictions'].tolist(),
+                'confidence_intervals': {
+                    'lower': forecast['lower'].tolist(),
+                    'upper': forecast['upper'].tolist()
+                },
+                'confidence': confidence,
+                'interval_method': forecast['method'],
+                'calibration_size': forecast['calibration_size']
+            }
+        except Exception as e:
+            logger.error(f"Error in prediction: {str(e)}")
+            raise HTTPException(status_code=500, detail="Prediction failed")
+
+    def predict_online(
+        self,
+        industry: str,
+        metric: str,
+        horizon: int,
+        confidence: float,
+        category: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Forecast from the online model without refitting"""
+        with self.models.lock:
+            model = self.models.get(industry, metric, category)
+            if model is None or not model.ready:
+                raise ValueError(f"No trained online model for {industry}/{group_label(metric, category)}")
+            forecast = model.forecast(horizon)
+            summary = model.summary()
+        predictions = forecast['predictions']
+        # One-step error grows roughly with the square root of the steps rolled forward
+        margin = stats.norm.ppf((1 + confidence) / 2) * forecast['residual_rms'] * np.sqrt(np.arange(1, horizon + 1))
+        return {
+            'predictions': predictions.tolist(),
+            'confidence_intervals': {
+                'lower': (predictions - margin).tolist(),
+                'upper': (predictions + margin).tolist()
+            },
+            'confidence': confidence,
+            'timestamps': forecast['timestamps'],
+            'model': summary
+        }
+
+    def detect_anomalies(self, data: List[float], threshold: float = 0.95, baseline: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Detect anomalies in time series data
+
+        With `baseline`, points are scored by that key's stored reference model and
+        the cut-off is the reference score quantile, so no model is fitted here.
+        """
+        try:
+            # Prepare data
+            X = np.array(data).reshape(-1, 1)
+            
+            if baseline is not None:
+                scores = anomaly_baselines.score(baseline, X)['scores']
+                threshold_score = anomaly_baselines.get(baseline).score_threshold(1 - threshold)
+            else:
+                # Train anomaly detection model
+                model = IsolationForest(contamination=0.1)
+                model.fit(X)
+
+                # Calculate anomaly scores
+                scores = model.score_samples(X)
+                threshold_score = np.percentile(scores, (1 - threshold) * 100)
+            
+            anomalies = []
+            for i, score in enumerate(scores):
+                if score < threshold_score:
+                    anomalies.append({
+                        'index': i,
+                        'value': float(data[i]),
+                        'score': float(score),
+                        'severity': float((threshold_score - score) / threshold_score)
+                    })
+            
+            return anomalies
+        except Exception as e:
+            logger.error(f"Error in anomaly detection: {str(e)}")
+            raise HTTPException(status_code=500, detail="Anomaly detection failed")
+
+    def generate_insights(self, columns: Dict[str, Any], industry: str) -> List[Dict[str, Any]]:
+        """Generate insights per (metric, category) group from one grouped, vectorized pass over `prepare_data` columns"""
+        try:
+            insights = []
+
+            # Score new points against each (metric, category) group's history
+            bounds = np.cumsum(columns['lengths'])[:-1]
+            groups = zip(columns['group_metrics'], columns['group_categories'], np.split(columns['values'], bounds))
+            for metric, category, new_values in groups:
+                with self.models.lock:
+                    model = self.models.get(industry, metric, category)
+                    if model is None or model.n_samples < MIN_SAMPLES:
+                        continue
+                    z_scores = np.abs(model.zscores(new_values))
+                unusual = int((z_scores > 3).sum())
+                if unusual:
+                    label = group_label(metric, category)
+                    insights.append({
+                        'type': 'anomaly',
+                        'metric': metric,
+                        'category': category,
+                        'title': f"Unusual {label} values detected",
+                        'description': f"{unusual} of {len(new_values)} new {label} values are more than 3 standard deviations from the {industry} history",
+                        'confidence': float(min(z_scores.max() / 6, 1.0)),
+                        'impact': 'high'
+                    })
+
+            if not len(columns['values']):
+                return insights
+
+            # Statistics and trend for every group at once, each group in time order
+            statistics = segment_statistics(columns['values'], columns['lengths'])
+            trends = segment_trend(columns['values'], columns['lengths'])
+
+            def label(i: int) -> str:
+                return group_label(columns['group_metrics'][i], columns['group_categories'][i])
+
+            strength = np.abs(trends['r_value'])
+            # Two points always lie on a line, so a trend needs at least three
+            for i in np.flatnonzero((strength > 0.7) & (columns['lengths'] >= 3)):
+                direction = 'upward' if trends['slope'][i] > 0 else 'downward'
+                insights.append({
+                    'type': 'trend',
+                    'metric': columns['group_metrics'][i],
+                    'category': columns['group_categories'][i],
+                    'title': f"Strong {direction} trend detected in {label(i)}",
+                    'description': f"The data shows a strong {direction} trend with {strength[i]:.2%} confidence",
+                    'confidence': float(strength[i]),
+                    'impact': 'high' if abs(trends['slope'][i]) > 0.5 else 'medium'
+                })
+
+            for i in np.flatnonzero(statistics['kurtosis'] > 2):
+                insights.append({
+                    'type': 'distribution',
+                    'metric': columns['group_metrics'][i],
+                    'category': columns['group_categories'][i],
+                    'title': f"Unusual data distribution detected in {label(i)}",
+                    'description': "The data shows significant outliers and non-normal distribution",
+                    'confidence': 0.8,
+                    'impact': 'medium'
+                })
+
+            return insights
+        except Exception as e:
+            logger.error(f"Error generating insights: {str(e)}")
+            raise HTTPException(status_code=500, detail="Insight generation failed")
+
+# Initialize industry engine
+industry_analytics = IndustryAnalytics()
+cache_entries.set_function(lambda: len(industry_analytics.models), 'industry_models')
+
+# API Endpoints
+@router.post("/analyze")
+async def analyze_data(request: AnalysisRequest, background_tasks: BackgroundTasks):
+    """Analyze data and return insights"""
+    try:
+        columns = industry_analytics.prepare_data(request.data)
+        insights = industry_analytics.generate_insights(columns, request.industry)
+        models = {}
+        with industry_analytics.models.lock:
+            for metric, category in zip(columns['group_metrics'], columns['group_categories']):
+                model = industry_analytics.models.get(request.industry, metric, category)
+                if model is not None:
+                    models[group_label(metric, category)] = model.summary()
+        # Learning is the slow part for many metrics; it runs after the response is sent
+        background_tasks.add_task(industry_analytics.update_models, columns, request.industry)
+        return {"insights": insights, "models": models}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/predict")
+async def predict_values(request: PredictionRequest):
+    """Predict future values"""
+    model = None
+    if request.industry and request.metric:
+        model = industry_analytics.models.get(request.industry, request.metric, request.category)
+    if not request.data and (model is None or not model.ready):
+        raise HTTPException(status_code=422, detail="Provide data, or the industry and metric of a trained online model")
+    if request.interval_method not in INTERVAL_METHODS:
+        raise HTTPException(status_code=422, detail=f"interval_method must be one of {', '.join(INTERVAL_METHODS)}")
+    try:
+        if model is not None and model.ready:
+            predictions = industry_analytics.predict_online(
+                request.industry,
+                request.metric,
+                request.horizon,
+                request.confidence,
+                request.category
+            )
+        else:
+            predictions = industry_analytics.predict_future_values(
+                request.data,
+                request.horizon,
+                request.confidence,
+                request.interval_method
+            )
+        if request.max_points and request.horizon > request.max_points:
+            index = downsample_indices(predictions['predictions'], request.max_points, request.downsample)
+            predictions['predictions'] = take(predictions['predictions'], index)
+            for bound in ('lower', 'upper'):
+                intervals = predictions['confidence_intervals']
+                intervals[bound] = take(intervals[bound], index)
+            if 'timestamps' in predictions:
+                predictions['timestamps'] = take(predictions['timestamps'], index)
+            predictions['index'] = index.tolist()
+        return predictions
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/detect-anomalies")
+async def detect_anomalies(request: AnomalyDetectionRequest, background_tasks: BackgroundTasks):
+    """Detect anomalies in data"""
+    if request.baseline is not None and anomaly_baselines.get(request.baseline) is None:
+        raise HTTPException(status_code=404, detail=f"Unknown anomaly baseline '{request.baseline}'")
+    try:
+        anomalies = industry_analytics.detect_anomalies(request.data, request.threshold, request.baseline)
+        if request.baseline is not None and anomaly_baselines.refresh_due(request.baseline):
+            background_tasks.add_task(anomaly_baselines.refresh, request.baseline)
+        return {"anomalies": anomalies}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
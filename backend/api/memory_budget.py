@@ -0,0 +1,185 @@
+"""
+Memory Budget Module
+Input-shape memory estimates with per-request and per-process admission limits
+"""
+
+import os
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from .metrics import memory_estimate, memory_rejections, memory_reserved
+
+MB = 1 << 20
+
+# Rough per-element costs, calibrated against peak RSS on CPython 3.11 / NumPy / scikit-learn
+FLOAT_BYTES = 8
+DICT_ENTRY_BYTES = 160  # one pair of a DataFrame.to_dict() result
+LIST_FLOAT_BYTES = 32  # a Python float plus its list slot
+# Measured: 100 trees with out-of-bag scores peak at ~9.2 KB per training point
+FOREST_NODE_BYTES = 72  # sklearn tree node, value slot, capacity slack and builder stacks
+FOREST_TREES = 100
+# Measured: fit plus predict peaks at ~33 KB per point, mostly the 1000 uncertainty samples per row
+PROPHET_BYTES_PER_POINT = 32 * 1024
+
+# Pairwise-test overheads per column pair (Kendall, Granger) and per sample
+KENDALL_PAIR_BYTES_PER_ROW = 6 * FLOAT_BYTES
+GRANGER_PAIR_BYTES_PER_ROW = 40 * FLOAT_BYTES
+GRANGER_RESULT_BYTES = 400
+
+
+def forest_bytes(n_points: int, trees: int = FOREST_TREES) -> int:
+    """Fully grown regression trees hold ~1.3 nodes per bootstrap sample each"""
+    return int(trees * 1.3 * n_points * FOREST_NODE_BYTES)
+
+
+def estimate_time_series(n_points: int) -> int:
+    """Statistics, trend and the RF / XGBoost / Prophet one-step ensemble"""
+    return PROPHET_BYTES_PER_POINT * n_points + forest_bytes(n_points)
+
+
+def estimate_forecast(n_points: int, horizon: int) -> int:
+    """Prophet plus RF and XGBoost multi-step forecasts"""
+    return estimate_time_series(n_points) + PROPHET_BYTES_PER_POINT * max(horizon, 0)
+
+
+def estimate_anomaly_detection(n_points: int, approximate: bool = False) -> int:
+    """z-scores, IsolationForest scores and the 1-D DBSCAN sort order, plus one dict per flagged point
+
+    The approximate mode scores every point in one pass instead of fitting on all of them.
+    """
+    arrays = 40 * FLOAT_BYTES * n_points
+    if approximate:
+        return arrays + 8 * FLOAT_BYTES * n_points + 2 * DICT_ENTRY_BYTES * n_points
+    return arrays + 16 * FLOAT_BYTES * n_points + 2 * DICT_ENTRY_BYTES * n_points
+
+
+def estimate_seasonality(n_points: int) -> int:
+    """Periodogram, padded autocorrelation and per-period profiles"""
+    return 12 * FLOAT_BYTES * n_points
+
+
+def estimate_rolling(n_points: int, n_quantiles: int, step: int = 1) -> int:
+    """Prefix sums and per-window arrays, pandas skiplist windows and the JSON-bound output lists"""
+    reported = n_points // max(step, 1) + 1
+    arrays = (14 + 2 * n_quantiles) * FLOAT_BYTES * n_points
+    return arrays + (7 + n_quantiles) * LIST_FLOAT_BYTES * reported
+
+
+def estimate_batch(n_series: int, width: int, forecast: bool = False) -> int:
+    """Padded matrix, masks and moment arrays; optional per-series forests (default 50 trees)
+
+    Forecasting also copies the matrix into shared memory for the worker pool.
+    """
+    cells = n_series * width
+    estimate = 10 * FLOAT_BYTES * cells
+    if forecast:
+        estimate += FLOAT_BYTES * cells + n_series * forest_bytes(width, trees=50)
+    return estimate
+
+
+def estimate_correlation(n_rows: int, n_cols: int, reduced: bool = False, sample_rows: Optional[int] = None) -> int:
+    """Pearson / Spearman (and unless `reduced`, Kendall, mutual information and Granger)
+
+    `sample_rows` sizes the pairwise stages for the approximate mode, which runs them on a sample.
+    """
+    cells = n_rows * n_cols
+    pairs = n_cols * n_cols
+    # Frame copy, rank matrix and standardized block, plus two dict-of-dicts results
+    estimate = 3 * FLOAT_BYTES * cells + 2 * pairs * (FLOAT_BYTES + DICT_ENTRY_BYTES)
+    if reduced:
+        return estimate
+    rows = n_rows if sample_rows is None else min(sample_rows, n_rows)
+    estimate += pairs * (FLOAT_BYTES + DICT_ENTRY_BYTES)  # Kendall result
+    estimate += KENDALL_PAIR_BYTES_PER_ROW * rows
+    estimate += 8 * FLOAT_BYTES * rows * n_cols  # mutual information KD-trees
+    if rows > 30:
+        estimate += GRANGER_PAIR_BYTES_PER_ROW * rows + pairs * GRANGER_RESULT_BYTES
+    return estimate
+
+
+def estimate_hypothesis_tests(n_rows: int, n_metrics: int, n_groups: int, resampling: bool = False, workers: int = 1) -> int:
+    """Sorted value matrix and masks, per-pair rank arrays, result columns and resampling blocks
+
+    Each resampling block holds a random-key, index and indicator matrix of at most
+    RESAMPLE_BLOCK_BYTES (see api.hypothesis_testing); one is live per worker.
+    """
+    cells = n_rows * n_metrics
+    comparisons = n_groups * (n_groups - 1) // 2 * n_metrics
+    estimate = LIST_FLOAT_BYTES * cells + 8 * FLOAT_BYTES * cells + 16 * DICT_ENTRY_BYTES * comparisons
+    if resampling:
+        estimate += 3 * (32 * MB) * max(workers, 1)
+    return estimate
+
+
+def estimate_covariance_batch(n_rows: int, n_cols: int) -> int:
+    """Parsed rows, the float matrix, its centered copy and the k x k co-moment products"""
+    cells = n_rows * n_cols
+    return LIST_FLOAT_BYTES * cells + 3 * FLOAT_BYTES * cells + 3 * FLOAT_BYTES * n_cols * n_cols
+
+
+class MemoryBudgetExceeded(Exception):
+    """Raised when a request is refused for memory reasons
+
+    `status_code` is 413 when the request alone is over the per-request limit
+    and 503 when it only fails because of other in-flight work.
+    """
+
+    def __init__(self, message: str, status_code: int):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class MemoryBudget:
+    """Admits work by estimated footprint against a per-request and a per-process limit
+
+    A limit of 0 disables that check. Estimates are reserved for the duration
+    of the work so concurrent requests cannot jointly exceed the process limit.
+    """
+
+    def __init__(self, request_limit: int, process_limit: int):
+        self.request_limit = request_limit
+        self.process_limit = process_limit
+        self._reserved = 0
+        self._lock = threading.Lock()
+
+    @property
+    def reserved(self) -> int:
+        return self._reserved
+
+    def fits(self, estimate: int) -> bool:
+        """Whether a request of this size can ever be admitted"""
+        return self.request_limit <= 0 or estimate <= self.request_limit
+
+    @contextmanager
+    def reserve(self, component: str, estimate: int) -> Iterator[None]:
+        memory_estimate.observe(estimate, component)
+        if not self.fits(estimate):
+            memory_rejections.inc(component, 'request_limit')
+            raise MemoryBudgetExceeded(
+                f"Estimated memory {estimate / MB:.0f} MB exceeds the per-request limit of "
+                f"{self.request_limit / MB:.0f} MB; reduce the input size",
+                413
+            )
+        with self._lock:
+            if self.process_limit > 0 and self._reserved + estimate > self.process_limit:
+                memory_rejections.inc(component, 'process_limit')
+                raise MemoryBudgetExceeded(
+                    f"Server memory budget is committed to other requests "
+                    f"({self._reserved / MB:.0f} of {self.process_limit / MB:.0f} MB); retry later",
+                    503
+                )
+            self._reserved += estimate
+        memory_reserved.set(self._reserved)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._reserved -= estimate
+            memory_reserved.set(self._reserved)
+
+
+memory_budget = MemoryBudget(
+    request_limit=int(float(os.getenv("ANALYTICS_REQUEST_MEMORY_LIMIT_MB", "0")) * MB),
+    process_limit=int(float(os.getenv("ANALYTICS_PROCESS_MEMORY_LIMIT_MB", "0")) * MB)
+)
@@ -0,0 +1,370 @@
+"""
+Metrics Module
+Low-overhead counters, gauges and histograms served in Prometheus text exposition format
+"""
+
+import os
+import threading
+import time
+import tracemalloc
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216, 67108864)
+MEMORY_BUCKETS = tuple(float(1 << shift) for shift in range(20, 37, 2))  # 1 MiB .. 64 GiB
+
+# Per-stage peak memory uses tracemalloc, which slows allocation-heavy Python code; opt in
+TRACE_MEMORY = os.getenv("ANALYTICS_TRACE_MEMORY", "false").lower() in ("1", "true", "yes")
+if TRACE_MEMORY and not tracemalloc.is_tracing():
+    tracemalloc.start()
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Metric:
+    """Base class holding name, help text, label names and a lock"""
+
+    kind = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Sequence[str]) -> Tuple[str, ...]:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}")
+        return tuple(str(label) for label in labels)
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self.samples())
+        return '\n'.join(lines)
+
+
+class Counter(Metric):
+    """Monotonically increasing count per label set"""
+
+    kind = 'counter'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(v)}" for key, v in items]
+
+
+class Gauge(Metric):
+    """Current value per label set, either set directly or read from a callback at scrape time"""
+
+    kind = 'gauge'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._callbacks: Dict[Tuple[str, ...], Callable[[], float]] = {}
+
+    def set(self, value: float, *labels: str):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def inc(self, *labels: str, amount: float = 1.0):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, *labels: str, amount: float = 1.0):
+        self.inc(*labels, amount=-amount)
+
+    def set_function(self, function: Callable[[], float], *labels: str):
+        """Sample `function` on every scrape instead of storing a value"""
+        key = self._key(labels)
+        with self._lock:
+            self._callbacks[key] = function
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = dict(self._values)
+            callbacks = list(self._callbacks.items())
+        for key, function in callbacks:
+            try:
+                values[key] = float(function())
+            except Exception:
+                continue
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(v)}" for key, v in values.items()]
+
+
+class Histogram(Metric):
+    """Cumulative bucket counts, sum and count per label set"""
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+        # Per label set: [bucket counts..., sum]
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, *labels: str):
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0] * len(self.buckets) + [0.0]
+            state[index] += 1
+            state[-1] += value
+
+    @contextmanager
+    def time(self, *labels: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labels)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = [(key, list(state)) for key, state in self._values.items()]
+        lines = []
+        for key, state in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, state[:-1]):
+                cumulative += count
+                labels = _format_labels(self.labelnames, key, ('le', _format_value(bound)))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(state[-1])}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Collection of named metrics rendered together at /metrics"""
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: Metric) -> Metric:
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return '\n'.join(metric.render() for metric in metrics) + '\n'
+
+
+registry = MetricsRegistry()
+
+http_requests = registry.counter(
+    'analytics_http_requests_total', 'HTTP requests by method, route and status', ('method', 'route', 'status')
+)
+http_latency = registry.histogram(
+    'analytics_http_request_duration_seconds', 'HTTP request latency by method and route', ('method', 'route')
+)
+http_request_size = registry.histogram(
+    'analytics_http_request_size_bytes', 'HTTP request body size by route', ('route',), SIZE_BUCKETS
+)
+http_response_size = registry.histogram(
+    'analytics_http_response_size_bytes', 'HTTP response body size by route', ('route',), SIZE_BUCKETS
+)
+stage_latency = registry.histogram(
+    'analytics_stage_duration_seconds', 'Latency of internal analytics stages', ('component', 'stage')
+)
+queue_depth = registry.gauge(
+    'analytics_queue_depth', 'Work items waiting in internal queues', ('queue',)
+)
+cache_entries = registry.gauge(
+    'analytics_cache_entries', 'Entries held in internal caches', ('cache',)
+)
+stage_peak_memory = registry.histogram(
+    'analytics_stage_peak_memory_bytes', 'Traced peak allocation of internal analytics stages',
+    ('component', 'stage'), MEMORY_BUCKETS
+)
+memory_estimate = registry.histogram(
+    'analytics_memory_estimate_bytes', 'Estimated memory footprint of admitted and rejected requests',
+    ('component',), MEMORY_BUCKETS
+)
+memory_rejections = registry.counter(
+    'analytics_memory_rejections_total', 'Requests refused by the memory budget', ('component', 'reason')
+)
+memory_reserved = registry.gauge(
+    'analytics_memory_reserved_bytes', 'Estimated memory reserved by in-flight requests'
+)
+admission_rejections = registry.counter(
+    'analytics_admission_rejections_total', 'Requests refused with 429 by admission control', ('lane', 'reason')
+)
+admission_wait = registry.histogram(
+    'analytics_admission_wait_seconds', 'Time admitted requests spent queued for a lane slot', ('lane',)
+)
+admission_active = registry.gauge(
+    'analytics_admission_active', 'Requests holding a lane slot', ('lane',)
+)
+process_memory = registry.gauge(
+    'analytics_process_memory_bytes', 'Resident memory of this process', ('kind',)
+)
+
+
+def _resident_bytes() -> float:
+    with open('/proc/self/statm') as statm:
+        return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+
+
+def _peak_resident_bytes() -> float:
+    import resource
+    import sys
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+process_memory.set_function(_resident_bytes, 'resident')
+process_memory.set_function(_peak_resident_bytes, 'peak_resident')
+
+# Open stages of the current task as [traced bytes at entry, peak seen so far]
+_memory_frames: ContextVar[Tuple[List[int], ...]] = ContextVar('memory_frames', default=())
+
+
+@contextmanager
+def _traced_stage(component: str, stage: str) -> Iterator[None]:
+    """Wall time plus traced peak allocation; nested stages fold their peaks outwards
+
+    tracemalloc keeps one process-wide peak, so stages running concurrently in
+    other threads or tasks can inflate each other's readings.
+    """
+    current, peak = tracemalloc.get_traced_memory()
+    frames = _memory_frames.get()
+    for outer in frames:
+        outer[1] = max(outer[1], peak)
+    tracemalloc.reset_peak()
+    frame = [current, current]
+    token = _memory_frames.set(frames + (frame,))
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stage_latency.observe(time.perf_counter() - start, component, stage)
+        _memory_frames.reset(token)
+        peak = max(frame[1], tracemalloc.get_traced_memory()[1])
+        stage_peak_memory.observe(peak - frame[0], component, stage)
+        for outer in frames:
+            outer[1] = max(outer[1], peak)
+
+
+def stage_timer(component: str, stage: str):
+    """Context manager recording one stage's wall time (and peak memory when tracing)"""
+    if tracemalloc.is_tracing():
+        return _traced_stage(component, stage)
+    return stage_latency.time(component, stage)
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording per-route latency, status and payload sizes"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = {'code': 500}
+        sizes = {'request': 0, 'response': 0}
+
+        async def counting_receive():
+            message = await receive()
+            if message['type'] == 'http.request':
+                sizes['request'] += len(message.get('body', b''))
+            return message
+
+        async def counting_send(message):
+            if message['type'] == 'http.response.start':
+                status['code'] = message['status']
+            elif message['type'] == 'http.response.body':
+                sizes['response'] += len(message.get('body', b''))
+            await send(message)
+
+        try:
+            await self.app(scope, counting_receive, counting_send)
+        finally:
+            # Use the route template, not the raw path, to keep label cardinality bounded
+            route = getattr(scope.get('route'), 'path', None) or 'unmatched'
+            method = scope.get('method', '')
+            http_latency.observe(time.perf_counter() - start, method, route)
+            http_requests.inc(method, route, str(status['code']))
+            http_request_size.observe(sizes['request'], route)
+            http_response_size.observe(sizes['response'], route)
+
+
+def timed_json_response():
+    """JSONResponse subclass that records encoding time under the `http` / `serialize` stage"""
+    from fastapi.responses import JSONResponse
+
+    class TimedJSONResponse(JSONResponse):
+        def render(self, content) -> bytes:
+            with stage_timer('http', 'serialize'):
+                return super().render(content)
+
+    return TimedJSONResponse
+
+
+def install_metrics(app):
+    """Add the metrics middleware and a /metrics endpoint to a FastAPI app
+
+    Routes registered after this call also get their JSON encoding timed.
+    """
+    from fastapi import Response
+
+    app.add_middleware(MetricsMiddleware)
+    app.router.default_response_class = timed_json_response()
+
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics_endpoint():
+        return Response(content=registry.render(), media_type=CONTENT_TYPE)
+
+    return app
@@ -0,0 +1,82 @@
+"""
+Micro-Batching Module
+Coalesces small concurrent requests into one vectorized engine call
+"""
+
+import asyncio
+import logging
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatcher:
+    """Gathers equal-length series for a few milliseconds and runs one batch function over them"""
+
+    def __init__(
+        self,
+        batch_fn: Callable[[np.ndarray], Sequence[Any]],
+        max_wait_ms: float = 2.0,
+        max_batch_size: int = 256
+    ):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.batch_fn = batch_fn
+        self.max_wait = max(max_wait_ms, 0.0) / 1000.0
+        self.max_batch_size = max_batch_size
+        # Pending requests are grouped by series length so every batch stacks into a 2-D array
+        self._pending: Dict[int, List[Tuple[np.ndarray, asyncio.Future]]] = {}
+        self._timers: Dict[int, asyncio.TimerHandle] = {}
+
+    async def submit(self, series: Sequence[float]) -> Any:
+        """Queue one series and wait for its slice of the batched result"""
+        values = np.asarray(series, dtype=float)
+        if values.ndim != 1:
+            raise ValueError("Micro-batching expects a 1-D series")
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        key = values.shape[0]
+
+        bucket = self._pending.setdefault(key, [])
+        bucket.append((values, future))
+
+        if len(bucket) >= self.max_batch_size:
+            self._flush(key)
+        elif len(bucket) == 1:
+            self._timers[key] = loop.call_later(self.max_wait, self._flush, key)
+
+        return await future
+
+    def _flush(self, key: int):
+        """Run the batch function over every pending series of one length"""
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+
+        bucket = self._pending.pop(key, [])
+        if not bucket:
+            return
+
+        try:
+            matrix = np.vstack([values for values, _ in bucket])
+            results = self.batch_fn(matrix)
+            if len(results) != len(bucket):
+                raise RuntimeError("Batch function returned a result count that does not match the batch")
+        except Exception as e:
+            logger.error(f"Micro-batch of {len(bucket)} series failed: {e}")
+            for _, future in bucket:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(bucket, results):
+            if not future.done():
+                future.set_result(result)
+
+    @property
+    def pending(self) -> int:
+        """Number of series waiting for the next flush"""
+        return sum(len(bucket) for bucket in self._pending.values())
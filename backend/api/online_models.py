@@ -0,0 +1,274 @@
+"""
+Online Models Module
+Per-industry, per-metric learners updated incrementally with partial_fit and checkpointed to disk
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import SGDRegressor
+from sklearn.preprocessing import StandardScaler
+
+from .descriptive_stats import Moments
+from .prefork import worker_id
+
+logger = logging.getLogger(__name__)
+
+# Autoregressive lags used as features next to elapsed time
+N_LAGS = 3
+# Observations before a model's forecasts and z-scores are trusted
+MIN_SAMPLES = 10
+SECONDS_PER_DAY = 86400.0
+
+
+class OnlineMetricModel:
+    """SGD regressor on [elapsed days, last N_LAGS values] with incrementally fitted scalers
+
+    Running target mean / variance come from the target scaler; residual spread is
+    tracked prequentially (each batch is scored before the model learns from it).
+    """
+
+    def __init__(self):
+        self.feature_scaler = StandardScaler()
+        self.target_scaler = StandardScaler()
+        self.regressor = SGDRegressor(learning_rate='invscaling', eta0=0.01, random_state=0)
+        self.residuals = Moments()
+        self.origin: Optional[float] = None
+        self.last_timestamp: Optional[float] = None
+        self.step = 0.0  # mean spacing between observations, in days
+        self.history: List[float] = []  # last N_LAGS values, oldest first
+        self.n_samples = 0
+        self.n_fitted = 0
+        self.updated_at: Optional[float] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.n_fitted >= MIN_SAMPLES
+
+    @property
+    def residual_rms(self) -> float:
+        """Root mean squared one-step error (bias included) over everything scored so far"""
+        if not self.residuals.count:
+            return 0.0
+        return float(np.sqrt(self.residuals.m2 / self.residuals.count + self.residuals.mean ** 2))
+
+    def _features(self, days: np.ndarray, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Feature rows for every new value that has N_LAGS predecessors (stored history included)"""
+        series = np.concatenate([self.history, values])
+        first = max(N_LAGS - len(self.history), 0)  # first new value with a full lag window
+        if first >= values.size:
+            return np.empty((0, N_LAGS + 1)), values[:0]
+        # Row k holds series[k:k + N_LAGS], the values preceding series[k + N_LAGS]
+        windows = np.lib.stride_tricks.sliding_window_view(series[:-1], N_LAGS)
+        start = len(self.history) + first - N_LAGS
+        lags = windows[start:, ::-1]  # most recent lag first
+        return np.column_stack([days[first:], lags]), values[first:]
+
+    def _predict_scaled(self, X: np.ndarray) -> np.ndarray:
+        scaled = (X - self.feature_scaler.mean_) / self.feature_scaler.scale_
+        y = scaled @ self.regressor.coef_ + self.regressor.intercept_[0]
+        return y * self.target_scaler.scale_[0] + self.target_scaler.mean_[0]
+
+    def zscores(self, values: Any) -> np.ndarray:
+        """Distance of `values` from the running mean in running standard deviations"""
+        values = np.asarray(values, dtype=float)
+        if self.n_samples < MIN_SAMPLES or self.target_scaler.scale_[0] == 0:
+            return np.zeros_like(values)
+        return (values - self.target_scaler.mean_[0]) / self.target_scaler.scale_[0]
+
+    def partial_fit(self, timestamps: Sequence[float], values: Sequence[float]) -> int:
+        """Learn from observations (epoch seconds, values); returns how many were used
+
+        Points older than the last one seen are skipped, since the lag features
+        assume arrival in time order.
+        """
+        timestamps = np.asarray(timestamps, dtype=float)
+        values = np.asarray(values, dtype=float)
+        order = np.argsort(timestamps, kind='stable')
+        timestamps, values = timestamps[order], values[order]
+        if self.last_timestamp is not None:
+            fresh = timestamps >= self.last_timestamp
+            timestamps, values = timestamps[fresh], values[fresh]
+        if values.size == 0:
+            return 0
+
+        if self.origin is None:
+            self.origin = float(timestamps[0])
+        days = (timestamps - self.origin) / SECONDS_PER_DAY
+        X, y = self._features(days, values)
+
+        self.target_scaler.partial_fit(values.reshape(-1, 1))
+        if len(y):
+            if self.n_fitted:
+                # Prequential residuals: score the batch before learning from it
+                self.residuals = self.residuals.merge(Moments.from_values(y - self._predict_scaled(X)))
+            self.feature_scaler.partial_fit(X)
+            self.regressor.partial_fit(
+                self.feature_scaler.transform(X),
+                self.target_scaler.transform(y.reshape(-1, 1)).ravel()
+            )
+            self.n_fitted += len(y)
+
+        self.n_samples += values.size
+        self.last_timestamp = float(timestamps[-1])
+        if self.n_samples > 1:
+            self.step = (self.last_timestamp - self.origin) / SECONDS_PER_DAY / (self.n_samples - 1)
+        self.history = np.concatenate([self.history, values])[-N_LAGS:].tolist()
+        self.updated_at = time.time()
+        return int(values.size)
+
+    def forecast(self, horizon: int) -> Dict[str, Any]:
+        """Roll the model forward `horizon` steps at the mean observation spacing"""
+        if not self.ready:
+            raise ValueError(f"Model has {self.n_fitted} fitted samples; at least {MIN_SAMPLES} are needed")
+        last_day = (self.last_timestamp - self.origin) / SECONDS_PER_DAY
+        lags = list(reversed(self.history))
+        predictions = np.empty(horizon)
+        for step in range(horizon):
+            x = np.array([[last_day + self.step * (step + 1), *lags]])
+            predictions[step] = self._predict_scaled(x)[0]
+            lags = [predictions[step], *lags[:-1]]
+        return {
+            'predictions': predictions,
+            'residual_rms': self.residual_rms,
+            'timestamps': (self.last_timestamp + SECONDS_PER_DAY * self.step * np.arange(1, horizon + 1)).tolist()
+        }
+
+    def summary(self) -> Dict[str, Any]:
+        """Running statistics, one-step error and the time coefficient (value units per day, lags held fixed)"""
+        summary = {'samples': self.n_samples, 'fitted': self.n_fitted, 'ready': self.ready, 'updated_at': self.updated_at}
+        if self.n_samples:
+            summary['mean'] = float(self.target_scaler.mean_[0])
+            summary['std'] = float(self.target_scaler.scale_[0])
+        if self.n_fitted:
+            summary['trend_per_day'] = float(
+                self.regressor.coef_[0] * self.target_scaler.scale_[0] / self.feature_scaler.scale_[0]
+            )
+            if self.residuals.count:
+                summary['residual_rms'] = self.residual_rms
+        return summary
+
+
+class OnlineModelRegistry:
+    """Online models keyed by (industry, metric, category), checkpointed per industry and worker slot with joblib
+
+    Each category of a metric (e.g. region) is its own series with its own model, so
+    lag features never mix values of different categories. Uncategorized data uses None.
+
+    A checkpoint is written after `checkpoint_every` new observations or `checkpoint_interval`
+    seconds, whichever comes first. With no `checkpoint_dir` models live in memory only.
+    Updates may run on a background thread; readers take `lock` while using a model.
+
+    Pre-forked workers each learn from the observations they receive, so each writes its
+    own slot's files. SGD models cannot be merged, so loading keeps the most recently
+    updated copy of every (industry, metric) across the slots.
+    """
+
+    def __init__(self, checkpoint_dir: Optional[str] = None, checkpoint_every: int = 100, checkpoint_interval: float = 300.0):
+        self.checkpoint_dir = checkpoint_dir
+        self.checkpoint_every = checkpoint_every
+        self.checkpoint_interval = checkpoint_interval
+        self.models: Dict[Tuple[str, str, Optional[str]], OnlineMetricModel] = {}
+        self._dirty: Dict[str, int] = defaultdict(int)
+        self._last_checkpoint = time.monotonic()
+        # Held per model update, so readers wait for at most one partial_fit
+        self.lock = threading.Lock()
+        if checkpoint_dir:
+            self.load()
+
+    def __len__(self) -> int:
+        return len(self.models)
+
+    def get(self, industry: str, metric: str, category: Optional[str] = None) -> Optional[OnlineMetricModel]:
+        return self.models.get((industry, metric, category))
+
+    def update(
+        self,
+        industry: str,
+        metrics: Sequence[str],
+        timestamps: Any,
+        values: Any,
+        categories: Optional[Sequence[Optional[str]]] = None
+    ) -> Dict[Tuple[str, Optional[str]], int]:
+        """partial_fit each (metric, category) model on its (epoch seconds, value) observations
+
+        `metrics`, `timestamps`, `values` and `categories` (None: uncategorized) are
+        aligned, one entry per observation. Returns the points used per (metric, category).
+        """
+        if categories is None:
+            categories = [None] * len(metrics)
+        codes, names = pd.factorize(pd.Series(list(zip(metrics, categories)), dtype=object))
+        order = np.argsort(codes, kind='stable')
+        timestamps = np.asarray(timestamps, dtype=float)[order]
+        values = np.asarray(values, dtype=float)[order]
+        bounds = np.cumsum(np.bincount(codes, minlength=len(names)))[:-1]
+
+        used = {}
+        for group, group_timestamps, group_values in zip(names, np.split(timestamps, bounds), np.split(values, bounds)):
+            with self.lock:
+                model = self.models.setdefault((industry, *group), OnlineMetricModel())
+                used[group] = model.partial_fit(group_timestamps, group_values)
+                self._dirty[industry] += used[group]
+
+        if self.checkpoint_dir and (
+            sum(self._dirty.values()) >= self.checkpoint_every
+            or time.monotonic() - self._last_checkpoint >= self.checkpoint_interval
+        ):
+            self.checkpoint()
+        return used
+
+    def _path(self, industry: str, slot: int) -> str:
+        """Readable prefix plus a digest of the raw name, so 'a/b' and 'a.b' do not share a file"""
+        safe = "".join(c if c.isalnum() or c in '-_' else '_' for c in industry[:64])
+        digest = hashlib.blake2b(industry.encode(), digest_size=8).hexdigest()
+        return os.path.join(self.checkpoint_dir, f"{safe}-{digest}.w{slot}.joblib")
+
+    def checkpoint(self) -> None:
+        """Write every industry with unsaved updates to this worker's slot (atomically, via its own temporary file)"""
+        if not self.checkpoint_dir:
+            return
+        os.makedirs(self.checkpoint_dir, exist_ok=True)
+        with self.lock:
+            for industry in [i for i, count in self._dirty.items() if count]:
+                models = {(metric, category): model for (ind, metric, category), model in self.models.items() if ind == industry}
+                path = self._path(industry, worker_id())
+                temporary = f"{path}.{os.getpid()}.tmp"
+                joblib.dump({'industry': industry, 'worker': worker_id(), 'models': models}, temporary)
+                os.replace(temporary, path)
+                self._dirty[industry] = 0
+            self._last_checkpoint = time.monotonic()
+
+    def load(self) -> None:
+        """Restore every checkpoint in `checkpoint_dir`, keeping the newest copy of each model across slots"""
+        if not os.path.isdir(self.checkpoint_dir):
+            return
+        for name in sorted(os.listdir(self.checkpoint_dir)):
+            if not name.endswith('.joblib'):
+                continue
+            try:
+                saved = joblib.load(os.path.join(self.checkpoint_dir, name))
+            except Exception as e:
+                logger.error(f"Could not load online model checkpoint {name}: {e}")
+                continue
+            for group, model in saved['models'].items():
+                # Checkpoints from before per-category models are keyed by metric alone
+                key = (saved['industry'], *(group if isinstance(group, tuple) else (group, None)))
+                current = self.models.get(key)
+                if current is None or (model.updated_at or 0.0) > (current.updated_at or 0.0):
+                    self.models[key] = model
+        logger.info(f"Loaded {len(self.models)} online models from {self.checkpoint_dir}")
+
+
+online_models = OnlineModelRegistry(
+    checkpoint_dir=os.getenv("ANALYTICS_MODEL_DIR") or None,
+    checkpoint_every=int(os.getenv("ANALYTICS_CHECKPOINT_EVERY", "100")),
+    checkpoint_interval=float(os.getenv("ANALYTICS_CHECKPOINT_INTERVAL_S", "300"))
+)
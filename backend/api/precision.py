@@ -0,0 +1,36 @@
+"""
+Precision Module
+Compute dtype selection (float64 / float32) for array-heavy analytics stages
+"""
+
+import os
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+PRECISIONS = {
+    'float64': np.float64,
+    'float32': np.float32
+}
+
+# Server-wide default; requests can override it with config['precision']
+DEFAULT_PRECISION = os.getenv("ANALYTICS_PRECISION", "float64").lower()
+if DEFAULT_PRECISION not in PRECISIONS:
+    raise ValueError(f"ANALYTICS_PRECISION must be one of {', '.join(PRECISIONS)}")
+
+
+def compute_dtype(config: Optional[Dict[str, Any]] = None) -> type:
+    """Dtype requested by `config['precision']`, falling back to the server default"""
+    precision = str((config or {}).get('precision') or DEFAULT_PRECISION).lower()
+    if precision not in PRECISIONS:
+        raise ValueError(f"Unsupported precision '{precision}'; use one of {', '.join(PRECISIONS)}")
+    return PRECISIONS[precision]
+
+
+def as_float_array(data: Any, dtype: Optional[type] = None) -> np.ndarray:
+    """`data` as a float array in `dtype`; without one, float32 input stays float32 and anything else is float64"""
+    if dtype is None:
+        array = np.asarray(data)
+        dtype = array.dtype if array.dtype in (np.float32, np.float64) else np.float64
+        return array.astype(dtype, copy=False)
+    return np.asarray(data, dtype=dtype)
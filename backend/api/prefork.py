@@ -0,0 +1,114 @@
+"""
+Pre-fork Module
+Serve one app from forked workers that share preloaded read-only state copy-on-write
+"""
+
+import gc
+import logging
+import os
+import signal
+import socket
+from typing import Any, Callable, List
+
+import uvicorn
+
+logger = logging.getLogger(__name__)
+
+# Loaders for models, lexicons and reference data; run once in the parent before forking
+_preloaders: List[Callable[[], Any]] = []
+
+# Set in each worker to its slot (0 .. workers - 1); a replacement worker takes over the slot
+WORKER_ID_ENV = "ANALYTICS_WORKER_ID"
+
+
+def worker_id() -> int:
+    """This worker's slot; 0 when serving from a single process"""
+    return int(os.getenv(WORKER_ID_ENV, "0"))
+
+
+def register_preloader(loader: Callable[[], Any]) -> Callable[[], Any]:
+    """Register `loader` to run in the parent before workers fork (usable as a decorator)"""
+    _preloaders.append(loader)
+    return loader
+
+
+def preload() -> None:
+    """Run every registered loader, then freeze the heap
+
+    Frozen objects are skipped by the cyclic garbage collector, so workers never
+    write to their headers and the pages stay shared with the parent.
+    """
+    for loader in _preloaders:
+        loader()
+    gc.collect()
+    gc.freeze()
+
+
+def _bind(host: str, port: int) -> socket.socket:
+    sock = socket.socket(socket.AF_INET6 if ':' in host else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _spawn_worker(app: Any, sock: socket.socket, slot: int, **uvicorn_options: Any) -> int:
+    pid = os.fork()
+    if pid == 0:
+        # Worker: serve on the inherited socket; never return into the parent's loop
+        os.environ[WORKER_ID_ENV] = str(slot)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        status = 0
+        try:
+            uvicorn.Server(uvicorn.Config(app, **uvicorn_options)).run(sockets=[sock])
+        except BaseException:
+            logger.exception("Worker crashed")
+            status = 1
+        finally:
+            os._exit(status)
+    return pid
+
+
+def serve_prefork(app: Any, host: str, port: int, workers: int, **uvicorn_options: Any) -> None:
+    """Preload in this process, bind once, then fork `workers` uvicorn workers
+
+    Falls back to a single in-process server for one worker or where fork is
+    unavailable. Workers that exit unexpectedly are replaced until shutdown.
+    """
+    if workers <= 1 or not hasattr(os, 'fork'):
+        uvicorn.run(app, host=host, port=port, **uvicorn_options)
+        return
+
+    preload()
+    sock = _bind(host, port)
+    children = {_spawn_worker(app, sock, slot, **uvicorn_options): slot for slot in range(workers)}
+    logger.info(f"Serving on {host}:{port} with {workers} pre-forked workers")
+
+    stopping = False
+
+    def shutdown(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+        slot = children.pop(pid, None)
+        if not stopping and slot is not None:
+            logger.warning(f"Worker {pid} exited with status {status}; starting a replacement")
+            children[_spawn_worker(app, sock, slot, **uvicorn_options)] = slot
+    sock.close()
@@ -2,7 +2,10 @@ from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from typing import List, Optional
 import numpy as np
-from ..regression_analyzer import RegressionAnalysis
+from .regression_analyzer import RegressionAnalysis, REGRESSION_MODELS
+from .regularization_path import fit_regularization_path, PATH_MODELS
+from .metrics import stage_timer
+from .downsampling import downsample_indices, outlier_indices, take
 
 router = APIRouter()
 
@@ -10,8 +13,18 @@ class RegressionRequest(BaseModel):
     X: List[List[float]]
     y: List[float]
     model_type: str
+    alpha: float = 1.0  # penalty of ridge / lasso / elastic net outside path mode
     test_size: Optional[float] = 0.2
     random_state: Optional[int] = 42
+    # Path mode: fit the whole alpha (and l1_ratio) grid in one request
+    path: bool = False
+    alphas: Optional[List[float]] = None
+    l1_ratios: Optional[List[float]] = None
+    n_alphas: int = 50
+    cv_folds: int = 5
+    # Chart-bound responses: reduce prediction arrays to about this many points
+    max_points: Optional[int] = None
+    downsample: str = 'lttb'
 
 @router.post("/analyze")
 async def analyze_regression(request: RegressionRequest):
@@ -20,50 +33,71 @@ async def analyze_regression(request: RegressionRequest):
         X = np.array(request.X).T  # Transpose to get features as columns
         y = np.array(request.y)
 
-        # Create regression analyzer
-        analyzer = RegressionAnalysis(X, y, test_size=request.test_size, random_state=request.random_state)
-        
-        # Preprocess data
-        analyzer.preprocess_data()
+        if request.path:
+            if request.model_type not in PATH_MODELS:
+                raise HTTPException(status_code=400, detail=f"Path mode is not available for model type: {request.model_type}")
+            with stage_timer('regression', 'path_fit'):
+                results = fit_regularization_path(
+                    X,
+                    y,
+                    request.model_type,
+                    alphas=request.alphas,
+                    l1_ratios=request.l1_ratios,
+                    cv=request.cv_folds,
+                    n_alphas=request.n_alphas,
+                    random_state=request.random_state
+                )
+            if request.max_points:
+                predicted = np.asarray(results['predictions'])
+                index = downsample_indices(y, request.max_points, request.downsample, keep=outlier_indices(y - predicted))
+                results['predictions'] = take(predicted, index)
+                results['prediction_index'] = index.tolist()
+            return results
 
-        # Perform analysis based on model type
-        if request.model_type == 'linear':
-            results = analyzer.fit_linear_regression()
-        elif request.model_type == 'ridge':
-            results = analyzer.fit_ridge_regression()
-        elif request.model_type == 'lasso':
-            results = analyzer.fit_lasso_regression()
-        elif request.model_type == 'elastic_net':
-            results = analyzer.fit_elastic_net()
-        else:
+        if request.model_type not in REGRESSION_MODELS:
             raise HTTPException(status_code=400, detail=f"Unsupported model type: {request.model_type}")
+        analyzer = RegressionAnalysis(X, y, test_size=request.test_size, random_state=request.random_state)
+
+        with stage_timer('regression', 'fit'):
+            analyzer.preprocess_data()
+            metrics = analyzer.fit(request.model_type, request.alpha)
+
+        with stage_timer('regression', 'diagnostics'):
+            diagnostics = analyzer.diagnostics(request.model_type)
+            importance = analyzer.feature_importance(request.model_type)
 
-        # Get diagnostics
-        diagnostics = analyzer.plot_diagnostics(request.model_type)
+        with stage_timer('regression', 'predict'):
+            predicted = analyzer.models[request.model_type].predict(X)
 
-        # Get feature importance
-        importance, importance_plot = analyzer.plot_feature_importance(request.model_type)
+        # Downsample along the actual series, always keeping the largest residuals
+        index = None
+        actual = y
+        if request.max_points:
+            index = downsample_indices(y, request.max_points, request.downsample, keep=outlier_indices(y - predicted))
+            actual, predicted = y[index], predicted[index]
+            diagnostics['residuals'] = [diagnostics['residuals'][i] for i in index]
 
         # Prepare response
-        response = {
-            'metrics': {
-                'r2': float(results.loc['Train_R2', 'Value']),
-                'rmse': float(results.loc['Train_RMSE', 'Value']),
-                'mae': float(results.loc['Train_MAE', 'Value']),
-                'adjusted_r2': float(results.loc['CV_R2', 'Value'])
-            },
-            'diagnostics': {
-                'residuals': diagnostics['residuals'],
-                'qq_plot': diagnostics['qq_plot']
-            },
-            'predictions': {
-                'actual': y.tolist(),
-                'predicted': analyzer.models[request.model_type].predict(X).tolist()
-            },
-            'feature_importance': importance.to_dict('records')
-        }
+        with stage_timer('regression', 'serialize'):
+            response = {
+                'model_type': request.model_type,
+                **analyzer.coefficients(request.model_type),
+                'metrics': metrics,
+                'diagnostics': diagnostics,
+                'predictions': {
+                    'actual': actual.tolist(),
+                    'predicted': predicted.tolist()
+                },
+                'feature_importance': importance
+            }
+            if index is not None:
+                response['predictions']['index'] = index.tolist()
 
         return response
 
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e)) 
\ No newline at end of file
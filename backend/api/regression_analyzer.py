@@ -6,8 +6,119 @@ Provides a high-level interface for regression analysis operations.
 from typing import Dict, List, Any, Optional
 import numpy as np
 from scipy import stats
-from sklearn.metrics import mean_squared_error, r2_score
-from .regression import RegressionAnalyzer
+from sklearn.linear_model import ElasticNet, Lasso, LinearRegression, Ridge
+from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+from sklearn.model_selection import cross_val_score, train_test_split
+from sklearn.pipeline import Pipeline, make_pipeline
+from sklearn.preprocessing import StandardScaler
+from .regression_engine import (
+    RegressionAnalyzer,
+    polynomial_path,
+    feature_correlations,
+    residual_diagnostics,
+    prediction_margins
+)
+from .seasonality import seasonal_profile, seasonality_analysis
+from .metrics import stage_timer
+
+REGRESSION_MODELS = {
+    'linear': lambda alpha: LinearRegression(),
+    'ridge': lambda alpha: Ridge(alpha=alpha),
+    'lasso': lambda alpha: Lasso(alpha=alpha),
+    'elastic_net': lambda alpha: ElasticNet(alpha=alpha),
+}
+
+# Polynomial degree selection: highest in-sample R^2 (the default) or lowest BIC
+POLYNOMIAL_CRITERIA = ('r2', 'bic')
+
+
+def _finite(value: float) -> Optional[float]:
+    return float(value) if np.isfinite(value) else None
+
+
+class RegressionAnalysis:
+    """One scikit-learn linear model on standardized features, scored in-sample, held out and by CV"""
+
+    def __init__(self, X: Any, y: Any, test_size: Optional[float] = 0.2, random_state: Optional[int] = 42):
+        self.X = np.asarray(X, dtype=float)
+        self.y = np.asarray(y, dtype=float).ravel()
+        if self.X.ndim != 2 or self.X.shape[0] != self.y.size:
+            raise ValueError("X must hold one value per target value for every feature")
+        if self.y.size < 3:
+            raise ValueError("At least three observations are needed for a regression")
+        self.test_size = test_size or 0.0
+        self.random_state = random_state
+        self.models: Dict[str, Pipeline] = {}
+        self.train = self.test = np.arange(self.y.size)
+
+    def preprocess_data(self):
+        """Hold out `test_size` of the rows when that leaves at least two on each side"""
+        n = self.y.size
+        held_out = int(np.ceil(n * self.test_size))
+        if 2 <= held_out <= n - 2:
+            self.train, self.test = train_test_split(
+                np.arange(n), test_size=held_out, random_state=self.random_state
+            )
+        else:
+            self.train, self.test = np.arange(n), np.arange(0)
+
+    def fit(self, model_type: str, alpha: float = 1.0) -> Dict[str, Optional[float]]:
+        if model_type not in REGRESSION_MODELS:
+            raise ValueError(f"Unsupported model type: {model_type}")
+        X_train, y_train = self.X[self.train], self.y[self.train]
+        model = make_pipeline(StandardScaler(), REGRESSION_MODELS[model_type](alpha))
+        folds = min(5, y_train.size // 2)
+        cv_r2 = cross_val_score(model, X_train, y_train, cv=folds, scoring='r2').mean() if folds >= 2 else np.nan
+        model.fit(X_train, y_train)
+        self.models[model_type] = model
+
+        predicted = model.predict(X_train)
+        r2 = r2_score(y_train, predicted)
+        dof = y_train.size - self.X.shape[1] - 1
+        metrics = {
+            'r2': r2,
+            'rmse': np.sqrt(mean_squared_error(y_train, predicted)),
+            'mae': mean_absolute_error(y_train, predicted),
+            'adjusted_r2': 1 - (1 - r2) * (y_train.size - 1) / dof if dof > 0 else np.nan,
+            'cv_r2': cv_r2,
+            'test_r2': r2_score(self.y[self.test], model.predict(self.X[self.test])) if self.test.size else np.nan
+        }
+        return {name: _finite(value) for name, value in metrics.items()}
+
+    def coefficients(self, model_type: str) -> Dict[str, Any]:
+        """Coefficients and intercept in the original feature units"""
+        scaler, estimator = self.models[model_type].steps[0][1], self.models[model_type].steps[-1][1]
+        coefficients = estimator.coef_ / scaler.scale_
+        return {
+            'coefficients': coefficients.tolist(),
+            'intercept': float(estimator.intercept_ - scaler.mean_ @ coefficients)
+        }
+
+    def diagnostics(self, model_type: str) -> Dict[str, List[Dict[str, float]]]:
+        """Residuals against fitted values, and standardized residuals against normal quantiles"""
+        predicted = self.models[model_type].predict(self.X)
+        residuals = self.y - predicted
+        spread = residuals.std() or 1.0
+        n = residuals.size
+        theoretical = stats.norm.ppf((np.arange(1, n + 1) - 0.5) / n)
+        sample = np.sort((residuals - residuals.mean()) / spread)
+        return {
+            'residuals': [
+                {'predicted': p, 'residuals': r} for p, r in zip(predicted.tolist(), residuals.tolist())
+            ],
+            'qq_plot': [
+                {'theoretical': t, 'sample': q} for t, q in zip(theoretical.tolist(), sample.tolist())
+            ]
+        }
+
+    def feature_importance(self, model_type: str) -> List[Dict[str, Any]]:
+        """Share of the absolute standardized coefficients, largest first"""
+        weights = np.abs(self.models[model_type].steps[-1][1].coef_)
+        total = weights.sum()
+        shares = weights / total if total > 0 else weights
+        order = np.argsort(-shares, kind='stable')
+        return [{'feature': f'X{i + 1}', 'importance': float(shares[i])} for i in order]
+
 
 class RegressionAnalysisService:
     def __init__(self):
@@ -16,31 +127,19 @@ class RegressionAnalysisService:
     def analyze_simple_regression(self, X: List[float], y: List[float], model_type: str = 'linear') -> Dict[str, Any]:
         """Perform simple regression analysis"""
         try:
-            results = self.analyzer.fit_model(X, y, model_type)
-            
-            # Add additional analysis
-            X_array = np.array(X).reshape(-1, 1)
-            y_array = np.array(y)
-            
-            # Calculate confidence intervals
-            n = len(X)
-            x_mean = np.mean(X_array)
-            x_std = np.std(X_array)
-            
-            # Calculate standard error of regression
-            y_pred = np.array(results['predictions'])
-            mse = mean_squared_error(y_array, y_pred)
-            std_error = np.sqrt(mse)
+            with stage_timer('regression', 'fit'):
+                results = self.analyzer.fit_model(X, y, model_type)
             
             # Calculate confidence intervals for predictions
-            confidence_intervals = []
-            for x in X_array:
-                x_centered = (x - x_mean) / x_std
-                margin = 1.96 * std_error * np.sqrt(1/n + x_centered**2)
-                confidence_intervals.append({
-                    'lower': float(y_pred[np.where(X_array == x)[0][0]] - margin),
-                    'upper': float(y_pred[np.where(X_array == x)[0][0]] + margin)
-                })
+            with stage_timer('regression', 'predict'):
+                y_pred = np.array(results['predictions'], dtype=float)
+                margins = prediction_margins(X, y, y_pred)
+            lower = y_pred - margins
+            upper = y_pred + margins
+            confidence_intervals = [
+                {'lower': lo, 'upper': hi}
+                for lo, hi in zip(lower.tolist(), upper.tolist())
+            ]
             
             results['confidence_intervals'] = confidence_intervals
             
@@ -51,32 +150,20 @@ class RegressionAnalysisService:
     def analyze_multiple_regression(self, X: List[List[float]], y: List[float]) -> Dict[str, Any]:
         """Perform multiple regression analysis with additional insights"""
         try:
-            results = self.analyzer.analyze_multiple_regression(X, y)
+            with stage_timer('regression', 'fit'):
+                results = self.analyzer.analyze_multiple_regression(X, y)
             
             # Add feature correlation analysis
-            X_array = np.array(X)
-            y_array = np.array(y)
-            
-            correlations = []
-            for i in range(X_array.shape[1]):
-                correlation = np.corrcoef(X_array[:, i], y_array)[0, 1]
-                correlations.append({
-                    'feature': f'X{i+1}',
-                    'correlation': float(correlation)
-                })
-            
-            results['feature_correlations'] = correlations
+            with stage_timer('regression', 'diagnostics'):
+                correlations = feature_correlations(X, y)
+            results['feature_correlations'] = [
+                {'feature': f'X{i+1}', 'correlation': float(correlation)}
+                for i, correlation in enumerate(correlations)
+            ]
             
             # Add model diagnostics
-            y_pred = np.array(results['predictions'])
-            residuals = y_array - y_pred
-            
-            diagnostics = {
-                'residuals_mean': float(np.mean(residuals)),
-                'residuals_std': float(np.std(residuals)),
-                'residuals_skew': float(stats.skew(residuals)),
-                'residuals_kurtosis': float(stats.kurtosis(residuals))
-            }
+            with stage_timer('regression', 'diagnostics'):
+                diagnostics = residual_diagnostics(y, results['predictions'])
             
             results['diagnostics'] = diagnostics
             
@@ -84,33 +171,43 @@ class RegressionAnalysisService:
         except Exception as e:
             raise Exception(f"Error in multiple regression analysis: {str(e)}")
 
-    def analyze_polynomial_regression(self, X: List[float], y: List[float], degree: int = 2) -> Dict[str, Any]:
-        """Perform polynomial regression analysis with model selection"""
+    def analyze_polynomial_regression(
+        self,
+        X: List[float],
+        y: List[float],
+        degree: int = 2,
+        criterion: str = 'r2'
+    ) -> Dict[str, Any]:
+        """Perform polynomial regression analysis with model selection
+
+        `criterion` 'r2' keeps the highest in-sample R^2 (lowest degree on ties), as
+        before; 'bic' picks the lowest BIC, which does not reward terms that only fit
+        noise. The degree each criterion picks is reported under `degree_by_criterion`.
+        """
+        if criterion not in POLYNOMIAL_CRITERIA:
+            raise ValueError(f"Unknown criterion '{criterion}'; use one of {', '.join(POLYNOMIAL_CRITERIA)}")
         try:
-            # Try different polynomial degrees
-            best_degree = degree
-            best_r2 = -float('inf')
-            best_results = None
-            
-            for d in range(1, degree + 1):
-                results = self.analyzer.analyze_polynomial_regression(X, y, d)
-                if results['r2_score'] > best_r2:
-                    best_r2 = results['r2_score']
-                    best_degree = d
-                    best_results = results
+            # Fit every degree from one incrementally extended factorization
+            with stage_timer('regression', 'degree_search'):
+                path = polynomial_path(X, y, degree)
+            degree_by_criterion = {
+                'r2': max(path, key=lambda fit: fit['r2_score'])['degree'],
+                'bic': min(path, key=lambda fit: fit['bic'])['degree']
+            }
+            best_degree = degree_by_criterion[criterion]
             
+            # Only the selected degree goes through the full analyzer
+            with stage_timer('regression', 'fit'):
+                best_results = self.analyzer.analyze_polynomial_regression(X, y, best_degree)
             best_results['best_degree'] = best_degree
+            best_results['criterion'] = criterion
+            best_results['degree_by_criterion'] = degree_by_criterion
             
             # Add model comparison
-            model_comparison = []
-            for d in range(1, degree + 1):
-                results = self.analyzer.analyze_polynomial_regression(X, y, d)
-                model_comparison.append({
-                    'degree': d,
-                    'r2_score': results['r2_score']
-                })
-            
-            best_results['model_comparison'] = model_comparison
+            best_results['model_comparison'] = [
+                {'degree': fit['degree'], 'r2_score': fit['r2_score'], 'bic': fit['bic']}
+                for fit in path
+            ]
             
             return best_results
         except Exception as e:
@@ -119,37 +216,27 @@ class RegressionAnalysisService:
     def analyze_time_series_regression(self, X: List[float], y: List[float]) -> Dict[str, Any]:
         """Perform time series regression analysis with seasonality detection"""
         try:
-            results = self.analyzer.analyze_time_series_regression(X, y)
+            with stage_timer('regression', 'fit'):
+                results = self.analyzer.analyze_time_series_regression(X, y)
             
             # Add seasonality analysis
             X_array = np.array(X)
             y_array = np.array(y)
             
-            # Detect daily seasonality
-            daily_pattern = []
-            for hour in range(24):
-                mask = (X_array % 24 == hour)
-                if np.any(mask):
-                    daily_pattern.append({
-                        'hour': hour,
-                        'mean': float(np.mean(y_array[mask])),
-                        'std': float(np.std(y_array[mask]))
-                    })
-            
-            # Detect weekly seasonality
-            weekly_pattern = []
-            for day in range(7):
-                mask = ((X_array // 24) % 7 == day)
-                if np.any(mask):
-                    weekly_pattern.append({
-                        'day': day,
-                        'mean': float(np.mean(y_array[mask])),
-                        'std': float(np.std(y_array[mask]))
-                    })
+            # Daily and weekly profiles (X in hours), one grouped reduction each
+            daily_pattern = [
+                {'hour': p['phase'], 'mean': p['mean'], 'std': p['std']}
+                for p in seasonal_profile(y_array, 24, phase=X_array % 24)
+            ]
+            weekly_pattern = [
+                {'day': p['phase'], 'mean': p['mean'], 'std': p['std']}
+                for p in seasonal_profile(y_array, 7, phase=(X_array // 24) % 7)
+            ]
             
             results['seasonality'] = {
                 'daily': daily_pattern,
-                'weekly': weekly_pattern
+                'weekly': weekly_pattern,
+                **seasonality_analysis(y_array)
             }
             
             # Add trend analysis
@@ -0,0 +1,251 @@
+"""
+Regression Engine
+Least squares on an incrementally grown QR factorization, with vectorized diagnostics
+"""
+
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+from scipy.linalg import solve_triangular
+
+from .descriptive_stats import describe
+
+
+class LeastSquaresEngine:
+    """Thin QR factorization of a design matrix that can be extended one column at a time
+
+    Adding a column costs O(n * k) (Gram-Schmidt with one re-orthogonalization
+    pass), so nested models such as polynomial degrees 1..N share one
+    factorization instead of being refit from scratch.
+    """
+
+    def __init__(self, y: Any, capacity: int = 8):
+        self.y = np.asarray(y, dtype=float).ravel()
+        self.n = self.y.size
+        self.k = 0
+        self._q = np.empty((self.n, capacity))
+        self._r = np.zeros((capacity, capacity))
+        self._qty = np.empty(capacity)
+        self.tss = float(np.sum((self.y - self.y.mean()) ** 2)) if self.n else 0.0
+
+    @property
+    def Q(self) -> np.ndarray:
+        return self._q[:, :self.k]
+
+    @property
+    def R(self) -> np.ndarray:
+        return self._r[:self.k, :self.k]
+
+    def _grow(self):
+        """Double the preallocated column capacity"""
+        capacity = 2 * self._q.shape[1]
+        q = np.empty((self.n, capacity))
+        q[:, :self.k] = self.Q
+        r = np.zeros((capacity, capacity))
+        r[:self.k, :self.k] = self.R
+        qty = np.empty(capacity)
+        qty[:self.k] = self._qty[:self.k]
+        self._q, self._r, self._qty = q, r, qty
+
+    def add_column(self, column: Any) -> bool:
+        """Append one design column; returns False (and skips it) if it is collinear"""
+        v = np.asarray(column, dtype=float).ravel().copy()
+        if v.size != self.n:
+            raise ValueError("Design column length does not match the response")
+        norm = np.linalg.norm(v)
+        if norm == 0:
+            return False
+
+        Q = self.Q
+        coefficients = Q.T @ v
+        v -= Q @ coefficients
+        correction = Q.T @ v
+        v -= Q @ correction
+        coefficients += correction
+
+        residual_norm = np.linalg.norm(v)
+        if residual_norm <= 1e-10 * norm:
+            return False
+
+        if self.k == self._q.shape[1]:
+            self._grow()
+        k = self.k
+        self._q[:, k] = v / residual_norm
+        self._r[:k, k] = coefficients
+        self._r[k, k] = residual_norm
+        self._qty[k] = self._q[:, k] @ self.y
+        self.k += 1
+        return True
+
+    @property
+    def coefficients(self) -> np.ndarray:
+        return solve_triangular(self.R, self._qty[:self.k])
+
+    @property
+    def fitted(self) -> np.ndarray:
+        return self.Q @ self._qty[:self.k]
+
+    @property
+    def residuals(self) -> np.ndarray:
+        return self.y - self.fitted
+
+    @property
+    def rss(self) -> float:
+        residuals = self.residuals
+        return float(residuals @ residuals)
+
+    @property
+    def r2_score(self) -> float:
+        return 1.0 - self.rss / self.tss if self.tss > 0 else 0.0
+
+    @property
+    def leverage(self) -> np.ndarray:
+        """Diagonal of the hat matrix, read straight off Q"""
+        Q = self.Q
+        return np.einsum('ij,ij->i', Q, Q)
+
+
+def bic(rss: float, n: int, parameters: int) -> float:
+    """Bayesian information criterion of a Gaussian least-squares fit (up to a constant)"""
+    return n * float(np.log(max(rss / n, np.finfo(float).tiny))) + parameters * float(np.log(n))
+
+
+def polynomial_path(X: Any, y: Any, max_degree: int) -> List[Dict[str, Any]]:
+    """In-sample fit of every polynomial degree 1..max_degree from one growing factorization
+
+    In-sample R^2 never decreases with the degree, so each fit also carries its BIC
+    (from `rss` and `parameters`) for choosing between the nested models.
+    """
+    x = np.asarray(X, dtype=float).ravel()
+    if max_degree < 1:
+        raise ValueError("Polynomial degree must be at least 1")
+
+    # Powers of standardized x span the same space as powers of x but stay well conditioned
+    scale = x.std() or 1.0
+    z = (x - x.mean()) / scale
+    engine = LeastSquaresEngine(y, capacity=max_degree + 1)
+    engine.add_column(np.ones_like(z))
+
+    path = []
+    power = np.ones_like(z)
+    for degree in range(1, max_degree + 1):
+        power = power * z
+        engine.add_column(power)
+        rss = engine.rss
+        path.append({
+            'degree': degree,
+            'r2_score': engine.r2_score,
+            'rss': rss,
+            'parameters': engine.k,
+            'bic': bic(rss, engine.n, engine.k)
+        })
+    return path
+
+
+def feature_correlations(X: Any, y: Any) -> np.ndarray:
+    """Pearson correlation of every feature column with y in one matrix product"""
+    X = np.asarray(X, dtype=float)
+    y = np.asarray(y, dtype=float).ravel()
+    if X.ndim == 1:
+        X = X.reshape(-1, 1)
+    X_centered = X - X.mean(axis=0)
+    y_centered = y - y.mean()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (X_centered.T @ y_centered) / (
+            np.sqrt(np.einsum('ij,ij->j', X_centered, X_centered)) * np.sqrt(y_centered @ y_centered)
+        )
+
+
+def residual_diagnostics(y: Any, y_pred: Any) -> Dict[str, float]:
+    """Residual mean, std, skewness and kurtosis in one pass"""
+    residuals = np.asarray(y, dtype=float).ravel() - np.asarray(y_pred, dtype=float).ravel()
+    summary = describe(residuals, quantiles=())
+    return {
+        'residuals_mean': summary['mean'],
+        'residuals_std': summary['std'],
+        'residuals_skew': summary['skewness'],
+        'residuals_kurtosis': summary['kurtosis']
+    }
+
+
+def prediction_margins(X: Any, y: Any, y_pred: Any, z: float = 1.96) -> np.ndarray:
+    """Per-point confidence margins for a simple regression, vectorized over all points"""
+    x = np.asarray(X, dtype=float).ravel()
+    residuals = np.asarray(y, dtype=float).ravel() - np.asarray(y_pred, dtype=float).ravel()
+    std_error = np.sqrt(np.mean(residuals * residuals))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        x_centered = (x - x.mean()) / x.std()
+    return z * std_error * np.sqrt(1 / x.size + x_centered ** 2)
+
+
+def least_squares_fit(columns: Sequence[Any], y: Any) -> Dict[str, Any]:
+    """Ordinary least squares with an intercept; collinear columns get a zero coefficient"""
+    y = np.asarray(y, dtype=float).ravel()
+    if y.size < 2:
+        raise ValueError("At least two observations are needed for a regression")
+    engine = LeastSquaresEngine(y, capacity=len(columns) + 1)
+    engine.add_column(np.ones(y.size))
+    kept = np.array([engine.add_column(column) for column in columns], dtype=bool)
+    solved = engine.coefficients
+    coefficients = np.zeros(len(columns))
+    coefficients[kept] = solved[1:]
+    mse = engine.rss / y.size
+    return {
+        'coefficients': coefficients.tolist(),
+        'intercept': float(solved[0]),
+        'predictions': engine.fitted.tolist(),
+        'r2_score': engine.r2_score,
+        'mse': mse,
+        'rmse': float(np.sqrt(mse))
+    }
+
+
+class RegressionAnalyzer:
+    """Least-squares fits behind RegressionAnalysisService, each on one QR factorization"""
+
+    def fit_model(self, X: Any, y: Any, model_type: str = 'linear') -> Dict[str, Any]:
+        """Simple regression of y on a single feature"""
+        if model_type != 'linear':
+            raise ValueError(f"Unsupported model type for simple regression: {model_type}")
+        results = least_squares_fit([np.asarray(X, dtype=float).ravel()], y)
+        results['model_type'] = model_type
+        return results
+
+    def analyze_multiple_regression(self, X: Any, y: Any) -> Dict[str, Any]:
+        """X is (n_samples, n_features)"""
+        X = np.asarray(X, dtype=float)
+        if X.ndim == 1:
+            X = X.reshape(-1, 1)
+        results = least_squares_fit(list(X.T), y)
+        results['model_type'] = 'multiple_linear'
+        return results
+
+    def analyze_polynomial_regression(self, X: Any, y: Any, degree: int) -> Dict[str, Any]:
+        """Polynomial fit on standardized x (for conditioning), reported in powers of the raw x"""
+        x = np.asarray(X, dtype=float).ravel()
+        center, scale = float(x.mean()), float(x.std()) or 1.0
+        z = (x - center) / scale
+        results = least_squares_fit([z ** power for power in range(1, degree + 1)], y)
+        polynomial = np.polynomial.Polynomial(
+            [results['intercept']] + results['coefficients'],
+            domain=[center - scale, center + scale],
+            window=[-1, 1]
+        ).convert()
+        raw = np.zeros(degree + 1)
+        raw[:polynomial.coef.size] = polynomial.coef
+        results.update({
+            'model_type': 'polynomial',
+            'degree': degree,
+            'intercept': float(raw[0]),
+            'coefficients': raw[1:].tolist()
+        })
+        return results
+
+    def analyze_time_series_regression(self, X: Any, y: Any) -> Dict[str, Any]:
+        """Linear trend in time, with the Durbin-Watson statistic of its residuals"""
+        results = least_squares_fit([np.asarray(X, dtype=float).ravel()], y)
+        residuals = np.asarray(y, dtype=float).ravel() - np.asarray(results['predictions'])
+        denominator = float(residuals @ residuals)
+        results['model_type'] = 'time_series'
+        results['durbin_watson'] = float(np.sum(np.diff(residuals) ** 2) / denominator) if denominator > 0 else None
+        return results
@@ -0,0 +1,162 @@
+"""
+Rolling Window Analytics
+Trailing-window moments, extremes, quantiles and trend slope in linear time
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .metrics import stage_timer
+from .precision import as_float_array
+
+DEFAULT_ROLLING_QUANTILES = (0.25, 0.5, 0.75)
+
+
+# Prefix sums restart every ROLLING_BLOCK points (or every window, if longer), so their
+# magnitude, and the rounding error of their differences, stays local
+ROLLING_BLOCK = 4096
+
+
+def _block_prefix(terms: np.ndarray, block: int) -> np.ndarray:
+    """Inclusive cumulative sums that restart at every block boundary"""
+    n = terms.size
+    padded = np.zeros(-(-n // block) * block)
+    padded[:n] = terms
+    return np.cumsum(padded.reshape(-1, block), axis=1).ravel()[:n]
+
+
+def _window_parts(prefix: np.ndarray, starts: np.ndarray, lasts: np.ndarray, block: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Sums over the part of each window in its first block (head) and in the next block (tail)"""
+    before = np.where(starts % block == 0, 0.0, prefix[np.maximum(starts - 1, 0)])
+    spans = starts // block != lasts // block
+    head_end = np.where(spans, np.minimum((starts // block + 1) * block - 1, prefix.size - 1), lasts)
+    head = prefix[head_end] - before
+    tail = np.where(spans, prefix[lasts], 0.0)
+    return head, tail
+
+
+def rolling_moments(values: np.ndarray, window: int) -> Dict[str, np.ndarray]:
+    """Count, mean, population std and least-squares slope of every trailing window in O(n)
+
+    Built from block-restarted prefix sums of y, y*y and j*y, with y shifted by its
+    block's mean and j the position inside the block. A window covers at most two
+    blocks; the part in the second block is re-shifted onto the first block's mean,
+    and x = k - start is recovered as j + block_start - start. Windows of fewer than
+    two points have no slope (NaN).
+    """
+    n = values.size
+    block = max(window, ROLLING_BLOCK)
+    n_blocks = -(-n // block)
+    lasts = np.arange(n)
+    starts = np.maximum(lasts - window + 1, 0)
+    count = (lasts - starts + 1).astype(float)
+
+    # Shifting by a constant changes neither the variance nor the slope of a window
+    values = values.astype(np.float64)
+    block_of = lasts // block
+    shifts = np.add.reduceat(values, np.arange(n_blocks) * block) / np.bincount(block_of)
+    centered = values - shifts[block_of]
+    local = lasts % block
+
+    head_y, tail_y = _window_parts(_block_prefix(centered, block), starts, lasts, block)
+    head_yy, tail_yy = _window_parts(_block_prefix(centered * centered, block), starts, lasts, block)
+    head_jy, tail_jy = _window_parts(_block_prefix(local * centered, block), starts, lasts, block)
+
+    # Tail sums (second block, n_tail points at j = 0..n_tail-1) onto the head's shift
+    head_block = starts // block
+    n_tail = np.where(head_block != block_of, local + 1, 0).astype(float)
+    delta = shifts[np.minimum(head_block + 1, n_blocks - 1)] - shifts[head_block]
+    tail_yy = tail_yy + 2 * delta * tail_y + n_tail * delta * delta
+    tail_jy = tail_jy + delta * n_tail * (n_tail - 1) / 2
+    tail_y = tail_y + n_tail * delta
+
+    head_offset = head_block * block - starts  # block start minus window start (<= 0)
+    sum_y = head_y + tail_y
+    sum_yy = head_yy + tail_yy
+    sum_xy = head_jy + head_offset * head_y + tail_jy + (head_offset + block) * tail_y
+
+    mean = sum_y / count
+    ssx = count * (count * count - 1) / 12
+    with np.errstate(divide='ignore', invalid='ignore'):
+        slope = (sum_xy - (count - 1) / 2 * sum_y) / ssx
+    slope[count < 2] = np.nan
+    std = np.sqrt(np.maximum(sum_yy / count - mean * mean, 0.0))
+    std[count < 2] = 0.0
+    return {
+        'count': count,
+        'mean': mean + shifts[head_block],
+        'std': std,
+        'slope': slope
+    }
+
+
+def rolling_extremes(values: np.ndarray, window: int) -> Dict[str, np.ndarray]:
+    """Minimum and maximum of every trailing window (pandas' monotonic-deque kernels, O(n))"""
+    roll = pd.Series(values, copy=False).rolling(window, min_periods=1)
+    return {'min': roll.min().to_numpy(), 'max': roll.max().to_numpy()}
+
+
+def rolling_quantiles(values: np.ndarray, window: int, quantiles: Sequence[float]) -> Dict[float, np.ndarray]:
+    """Linear-interpolated quantiles of every trailing window
+
+    pandas keeps each window in an indexable skiplist, so every step is one
+    O(log window) insert and delete instead of a sort.
+    """
+    roll = pd.Series(values, copy=False).rolling(window, min_periods=1)
+    return {q: roll.quantile(q).to_numpy() for q in quantiles}
+
+
+def _json_list(values: np.ndarray) -> List[Optional[float]]:
+    """List with NaN replaced by None, since JSON has no NaN"""
+    if np.isnan(values).any():
+        return [None if np.isnan(v) else v for v in values.tolist()]
+    return values.tolist()
+
+
+def rolling_analysis(data: Any, config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Rolling statistics over trailing windows of `config['window']` points
+
+    Windows are reported every `step` points, starting with the first that holds
+    `min_periods` values (default: a full window); `index` is the position of each
+    window's last point.
+    """
+    config = config or {}
+    values = as_float_array(data).ravel()
+    window = int(config.get('window', 20))
+    step = int(config.get('step', 1))
+    min_periods = int(config.get('min_periods', window))
+    quantiles = [float(q) for q in config.get('quantiles', DEFAULT_ROLLING_QUANTILES)]
+
+    if window < 1 or step < 1:
+        raise ValueError("window and step must be at least 1")
+    if not 1 <= min_periods <= window:
+        raise ValueError("min_periods must be between 1 and window")
+    if any(q < 0 or q > 1 for q in quantiles):
+        raise ValueError("Quantiles must be between 0 and 1")
+    if values.size < min_periods:
+        raise ValueError(f"Need at least {min_periods} data points for a window")
+
+    positions = np.arange(min_periods - 1, values.size, step)
+
+    with stage_timer('rolling', 'moments'):
+        moments = rolling_moments(values, window)
+    with stage_timer('rolling', 'extremes'):
+        extremes = rolling_extremes(values, window)
+    with stage_timer('rolling', 'quantiles'):
+        quantile_values = rolling_quantiles(values, window, quantiles)
+
+    return {
+        'window': window,
+        'step': step,
+        'min_periods': min_periods,
+        'index': positions.tolist(),
+        'count': moments['count'][positions].astype(int).tolist(),
+        'mean': moments['mean'][positions].tolist(),
+        'std': moments['std'][positions].tolist(),
+        'min': extremes['min'][positions].tolist(),
+        'max': extremes['max'][positions].tolist(),
+        'slope': _json_list(moments['slope'][positions]),
+        'quantiles': {str(q): quantile_values[q][positions].tolist() for q in quantiles}
+    }
@@ -0,0 +1,133 @@
+"""
+Sampling Module
+Stratified samples, latency-driven sample sizes and error bounds for the approximate analytics mode
+"""
+
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+from scipy import stats
+
+# Smallest sample worth fitting on, whatever the latency target
+MIN_SAMPLE_SIZE = 1000
+DEFAULT_TARGET_LATENCY_S = 1.0
+
+# Rough single-core costs, measured on CPython 3.11 / scikit-learn 1.x
+ISOLATION_FOREST_FIT_S = 0.2  # 100 trees on 256-point subsamples, excluding the scoring below
+ISOLATION_FOREST_ROW_S = 8e-6  # score_samples per row (also paid on the fit sample for the offset)
+KENDALL_PAIR_ROW_S = 3e-7  # per column pair and sampled row (O(n log n) per pair)
+MUTUAL_INFORMATION_ROW_S = 8e-6  # per column and sampled row (k-NN estimator)
+GRANGER_PAIR_ROW_S = 2e-6  # per ordered column pair and row (maxlag 2)
+DBSCAN_1D_ROW_S = 1.5e-6  # sort and binary searches of dbscan_noise_1d
+RANK_CELL_S = 3e-7  # full-data Spearman ranks and cross-products, per cell
+
+
+def stratified_indices(n: int, size: int, seed: int = 0) -> np.ndarray:
+    """One random position from each of `size` equal-width strata of 0..n-1 (all positions if size >= n)
+
+    Stratifying by position keeps every stretch of a time-ordered input represented,
+    which a uniform sample of the same size only does on average.
+    """
+    if size >= n:
+        return np.arange(n)
+    edges = np.linspace(0, n, size + 1).astype(np.int64)
+    return np.random.default_rng(seed).integers(edges[:-1], edges[1:])
+
+
+def sample_size_for_latency(
+    target_seconds: float,
+    row_seconds: float,
+    n: int,
+    fixed_seconds: float = 0.0,
+    minimum: int = MIN_SAMPLE_SIZE
+) -> int:
+    """Largest sample whose sample-dependent cost fits in what the fixed cost leaves of the target"""
+    size = int((target_seconds - fixed_seconds) / row_seconds) if row_seconds > 0 else n
+    return int(min(n, max(size, minimum)))
+
+
+def target_seconds(config: Optional[Dict[str, Any]]) -> float:
+    return float((config or {}).get('target_latency_ms', DEFAULT_TARGET_LATENCY_S * 1000)) / 1000
+
+
+def sample_seed(config: Optional[Dict[str, Any]]) -> int:
+    return int((config or {}).get('seed', 0))
+
+
+def anomaly_sample_size(n: int, config: Optional[Dict[str, Any]] = None) -> Tuple[int, float]:
+    """IsolationForest fit sample and predicted latency; scoring every row is a fixed cost"""
+    fixed = ISOLATION_FOREST_FIT_S + (ISOLATION_FOREST_ROW_S + DBSCAN_1D_ROW_S) * n
+    size = (config or {}).get('sample_size') or sample_size_for_latency(target_seconds(config), ISOLATION_FOREST_ROW_S, n, fixed)
+    size = int(min(size, n))
+    return size, fixed + ISOLATION_FOREST_ROW_S * size
+
+
+def correlation_sample_size(n_rows: int, n_cols: int, config: Optional[Dict[str, Any]] = None) -> Tuple[int, float]:
+    """Rows for Kendall, mutual information (full sample and two halves) and Granger, and predicted latency
+
+    Pearson and Spearman stay exact, so their cost is fixed.
+    """
+    fixed = RANK_CELL_S * n_rows * n_cols
+    pairs = n_cols * (n_cols - 1) / 2
+    row_seconds = (
+        KENDALL_PAIR_ROW_S * pairs
+        + 2 * MUTUAL_INFORMATION_ROW_S * n_cols
+        + 2 * GRANGER_PAIR_ROW_S * pairs
+    )
+    size = (config or {}).get('sample_size') or sample_size_for_latency(target_seconds(config), row_seconds, n_rows, fixed)
+    size = int(min(size, n_rows))
+    return size, fixed + row_seconds * size
+
+
+def proportion_margin(p: float, size: int, confidence: float = 0.95) -> float:
+    """Normal-approximation half-width of a confidence interval for a proportion estimated from `size` draws"""
+    if size <= 0:
+        return float('nan')
+    z = stats.norm.ppf(0.5 + confidence / 2)
+    return float(z * np.sqrt(p * (1 - p) / size))
+
+
+def kendall_margin(tau: np.ndarray, size: int, confidence: float = 0.95) -> np.ndarray:
+    """Half-width from the Daniels-Kendall bound var(tau_hat) <= 2 (1 - tau^2) / n"""
+    z = stats.norm.ppf(0.5 + confidence / 2)
+    return z * np.sqrt(2 * np.clip(1 - np.square(tau), 0, 1) / max(size, 1))
+
+
+def dbscan_noise_1d(values: np.ndarray, eps: float, min_samples: int) -> np.ndarray:
+    """Exact DBSCAN noise mask for 1-D data in O(n log n)
+
+    On a line, a point's eps-neighbourhood is a contiguous run of the sorted values,
+    so neighbour counts are two binary searches. A point is noise when it is not core
+    and neither the nearest core point below nor the nearest above is within eps.
+    """
+    order = np.argsort(values, kind='stable')
+    sorted_values = values[order]
+    n = sorted_values.size
+    lo = np.searchsorted(sorted_values, sorted_values - eps, side='left')
+    hi = np.searchsorted(sorted_values, sorted_values + eps, side='right')
+    core = hi - lo >= min_samples
+
+    positions = np.arange(n)
+    # Nearest core position at or below / at or above each sorted position (-1 / n if none)
+    below = np.maximum.accumulate(np.where(core, positions, -1))
+    above = np.minimum.accumulate(np.where(core, positions, n)[::-1])[::-1]
+    with np.errstate(invalid='ignore'):
+        near_below = (below >= 0) & (sorted_values - sorted_values[np.maximum(below, 0)] <= eps)
+        near_above = (above < n) & (sorted_values[np.minimum(above, n - 1)] - sorted_values <= eps)
+
+    noise = np.empty(n, dtype=bool)
+    noise[order] = ~(core | near_below | near_above)
+    return noise
+
+
+def approximation_report(n: int, sample_size: int, predicted_seconds: float, config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Sample description shared by every approximate result"""
+    return {
+        'rows': int(n),
+        'sample_size': int(sample_size),
+        'sample_fraction': float(sample_size / n) if n else 0.0,
+        'sampling': 'stratified',
+        'seed': sample_seed(config),
+        'target_latency_ms': round(target_seconds(config) * 1000, 1),
+        'predicted_latency_ms': round(predicted_seconds * 1000, 1)
+    }
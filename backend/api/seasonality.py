@@ -0,0 +1,129 @@
+"""
+Seasonality Module
+FFT period detection and grouped seasonal profiles for evenly spaced series
+"""
+
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from .precision import as_float_array
+
+
+def detrend(values: np.ndarray) -> np.ndarray:
+    """Remove the least-squares line so the trend does not dominate low frequencies"""
+    n = values.size
+    x = np.arange(n) - (n - 1) / 2
+    slope = (x @ values) / (x @ x) if n > 1 else 0.0
+    return values - values.mean() - slope * x
+
+
+def autocorrelation(values: np.ndarray) -> np.ndarray:
+    """Normalized autocorrelation for every lag via the Wiener-Khinchin theorem, O(n log n)"""
+    n = values.size
+    size = 1 << int(np.ceil(np.log2(2 * n)))
+    spectrum = np.fft.rfft(values, size)
+    acf = np.fft.irfft(spectrum * np.conj(spectrum), size)[:n]
+    return acf / acf[0] if acf[0] > 0 else np.zeros(n)
+
+
+def detect_periods(
+    data: Any,
+    max_periods: int = 3,
+    min_period: int = 2,
+    max_period: Optional[int] = None,
+    min_acf: float = 0.1,
+    min_share: float = 0.01
+) -> List[Dict[str, Any]]:
+    """Dominant periods from periodogram peaks, refined to the nearest autocorrelation peak"""
+    values = detrend(as_float_array(data).ravel())
+    n = values.size
+    if n < 2 * min_period:
+        return []
+    max_period = min(max_period or n // 2, n // 2)
+
+    power = np.abs(np.fft.rfft(values)) ** 2
+    power[0] = 0.0
+    total_power = power.sum(dtype=np.float64)
+    if total_power <= 0:
+        return []
+    acf = autocorrelation(values)
+
+    # Only the strongest bins are worth refining; noise would otherwise scan the whole spectrum
+    candidates = np.argsort(power)[::-1][:10 * max_periods]
+    periods = []
+    for k in candidates:
+        if k == 0 or power[k] < min_share * total_power or len(periods) >= max_periods:
+            break
+        # Frequency bin k covers periods between n/(k+1) and n/(k-1)
+        low = max(min_period, int(np.floor(n / (k + 1))))
+        high = min(max_period, int(np.ceil(n / (k - 1))) if k > 1 else max_period)
+        if low > high:
+            continue
+        period = low + int(np.argmax(acf[low:high + 1]))
+        if acf[period] < min_acf:
+            continue
+        # A real period is a local peak of the ACF, not a point on a decaying slope
+        if acf[period] < acf[period - 1] or (period + 1 < n and acf[period] < acf[period + 1]):
+            continue
+        if any(p['period'] == period for p in periods):
+            continue
+        periods.append({
+            'period': period,
+            'frequency_bin': int(k),
+            'spectral_share': float(power[k] / total_power),
+            'autocorrelation': float(acf[period])
+        })
+    return periods
+
+
+def seasonal_profile(data: Any, period: int, phase: Optional[Any] = None) -> List[Dict[str, Any]]:
+    """Mean and std per phase of one period with a single grouped (bincount) reduction
+
+    `phase` defaults to the sample index modulo `period`; non-integer phases are ignored.
+    """
+    values = as_float_array(data).ravel()
+    if phase is None:
+        phase = np.arange(values.size) % period
+    else:
+        phase = np.asarray(phase, dtype=float).ravel()
+        integral = phase == np.floor(phase)
+        values = values[integral]
+        phase = phase[integral]
+    phase = phase.astype(np.int64)
+
+    counts = np.bincount(phase, minlength=period)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        group_means = np.bincount(phase, weights=values, minlength=period) / counts
+        deviations = values - group_means[phase]
+        group_vars = np.bincount(phase, weights=deviations * deviations, minlength=period) / counts
+
+    present = np.flatnonzero(counts)
+    means = group_means[present]
+    stds = np.sqrt(group_vars[present])
+    return [
+        {'phase': int(p), 'mean': float(m), 'std': float(s), 'count': int(c)}
+        for p, m, s, c in zip(present, means, stds, counts[present])
+    ]
+
+
+def seasonality_analysis(data: Any, config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Detect dominant periods and build a profile for each (plus any requested periods)"""
+    config = config or {}
+    values = as_float_array(data).ravel()
+    detected = detect_periods(
+        values,
+        max_periods=int(config.get('max_periods', 3)),
+        min_period=int(config.get('min_period', 2)),
+        max_period=config.get('max_period'),
+        min_acf=float(config.get('min_acf', 0.1)),
+        min_share=float(config.get('min_share', 0.01))
+    )
+
+    periods = [p['period'] for p in detected]
+    periods += [int(p) for p in config.get('periods', []) if int(p) not in periods]
+
+    return {
+        'detected_periods': detected,
+        'profiles': {str(period): seasonal_profile(values, period) for period in periods}
+    }
@@ -0,0 +1,232 @@
+"""
+Series Sessions Module
+Append-only series kept as mergeable sufficient statistics, so each update costs O(new points)
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Sequence
+
+import joblib
+import numpy as np
+
+from .descriptive_stats import Moments
+from .prefork import worker_id
+from .vectorized import trend_from_sums
+
+logger = logging.getLogger(__name__)
+
+# One checkpoint per worker slot, so pre-forked workers never overwrite each other's sessions
+CHECKPOINT_FILE = "series_sessions.w{slot}.joblib"
+LEGACY_CHECKPOINT_FILE = "series_sessions.joblib"  # single-file checkpoints, resumed by slot 0
+
+
+class SeriesSession:
+    """Moments of y plus the centered x / xy co-moments of one append-only series
+
+    Batches are merged with the pairwise (Chan et al.) updates rather than kept as
+    raw sums of x, x*x, x*y and y*y, which cancel catastrophically on long or offset series.
+    """
+
+    def __init__(self):
+        self.y = Moments()
+        self.x_mean = 0.0
+        self.sxx = 0.0
+        self.sxy = 0.0
+        self.last_x = -1.0
+        self.created_at = time.time()
+        self.updated_at = self.created_at
+
+    @property
+    def count(self) -> int:
+        return int(self.y.count)
+
+    def append(self, values: Sequence[float], x: Optional[Sequence[float]] = None) -> int:
+        """Merge new points; `x` defaults to the positions following the last point"""
+        values = np.asarray(values, dtype=np.float64).ravel()
+        if x is None:
+            x = self.last_x + 1 + np.arange(values.size, dtype=np.float64)
+        else:
+            x = np.asarray(x, dtype=np.float64).ravel()
+            if x.size != values.size:
+                raise ValueError("x must have one entry per value")
+        if values.size == 0:
+            return 0
+        if not (np.all(np.isfinite(values)) and np.all(np.isfinite(x))):
+            raise ValueError("Values and x must be finite")
+
+        batch = Moments.from_values(values)
+        x_mean = x.mean()
+        x_centered = x - x_mean
+        sxx = float(x_centered @ x_centered)
+        sxy = float(x_centered @ (values - batch.mean))
+
+        n_a, n_b = self.y.count, values.size
+        n = n_a + n_b
+        dx = x_mean - self.x_mean
+        dy = batch.mean - self.y.mean
+        self.sxx += sxx + dx * dx * n_a * n_b / n
+        self.sxy += sxy + dx * dy * n_a * n_b / n
+        self.x_mean += dx * n_b / n
+        self.y = self.y.merge(batch)
+
+        self.last_x = max(self.last_x, float(x.max()))
+        self.updated_at = time.time()
+        return int(values.size)
+
+    def summary(self) -> Dict[str, Any]:
+        """Statistics and trend blocks shaped like /api/advanced/analyze"""
+        if not self.count:
+            return {'count': 0, 'statistics': None, 'trend': None}
+        statistics = self.y.to_statistics()
+        result = {
+            'count': self.count,
+            'statistics': {
+                name: None if np.isnan(statistics[name]) else statistics[name]
+                for name in ('mean', 'std', 'min', 'max', 'skewness', 'kurtosis')
+            },
+            'trend': None
+        }
+        if self.count >= 2 and self.sxx > 0:
+            trend = trend_from_sums(
+                *(np.array([value], dtype=np.float64) for value in (
+                    self.count, self.x_mean, self.sxx, self.sxy, self.y.m2, self.y.mean
+                ))
+            )
+            slope = float(trend['slope'][0])
+            r_value = float(trend['r_value'][0])
+            result['trend'] = {
+                'slope': slope,
+                'intercept': float(trend['intercept'][0]),
+                'r_squared': r_value ** 2,
+                'p_value': float(trend['p_value'][0]),
+                'direction': 'upward' if slope > 0 else 'downward',
+                'strength': abs(r_value)
+            }
+        return result
+
+
+class SeriesSessionStore:
+    """Sessions keyed by series id, evicted when idle and checkpointed with joblib
+
+    Sessions are kept in least-recently-used order, so eviction only looks at the
+    expired ones. Sessions live in the process that created them; with pre-forked
+    workers each worker has its own, so clients should be routed by series id. Each
+    worker checkpoints to, and on first use resumes from, the file of its own slot.
+    """
+
+    def __init__(
+        self,
+        idle_timeout: float = 3600.0,
+        max_sessions: int = 100_000,
+        checkpoint_dir: Optional[str] = None,
+        checkpoint_interval: float = 300.0
+    ):
+        self.idle_timeout = idle_timeout
+        self.max_sessions = max_sessions
+        self.checkpoint_dir = checkpoint_dir
+        self.checkpoint_interval = checkpoint_interval
+        self.sessions: 'OrderedDict[str, SeriesSession]' = OrderedDict()
+        self.lock = threading.Lock()
+        self._dirty = False
+        self._last_checkpoint = time.monotonic()
+        self._pid: Optional[int] = None
+
+    def __len__(self) -> int:
+        return len(self.sessions)
+
+    def _path(self, slot: int) -> str:
+        return os.path.join(self.checkpoint_dir, CHECKPOINT_FILE.format(slot=slot))
+
+    def _ensure_process(self) -> None:
+        """On first use in a (forked) process, drop inherited sessions and resume this slot's checkpoint"""
+        if self._pid == os.getpid():
+            return
+        self._pid = os.getpid()
+        self.sessions = OrderedDict()
+        self._dirty = False
+        if self.checkpoint_dir:
+            self.load()
+
+    def _evict(self) -> None:
+        """Drop sessions idle past the timeout, then the least recently used above the cap"""
+        cutoff = time.time() - self.idle_timeout
+        while self.sessions:
+            series_id, session = next(iter(self.sessions.items()))
+            if session.updated_at >= cutoff and len(self.sessions) <= self.max_sessions:
+                break
+            del self.sessions[series_id]
+            self._dirty = True
+
+    def get(self, series_id: str) -> Optional[SeriesSession]:
+        with self.lock:
+            self._ensure_process()
+            self._evict()
+            return self.sessions.get(series_id)
+
+    def append(self, series_id: str, values: Sequence[float], x: Optional[Sequence[float]] = None) -> Dict[str, Any]:
+        """Add points to a series (creating it on first use); returns its updated summary"""
+        with self.lock:
+            self._ensure_process()
+            session = self.sessions.pop(series_id, None) or SeriesSession()
+            try:
+                session.append(values, x)
+            finally:
+                if session.count:
+                    self.sessions[series_id] = session
+            self._dirty = True
+            self._evict()
+            summary = session.summary()
+
+        if self.checkpoint_dir and time.monotonic() - self._last_checkpoint >= self.checkpoint_interval:
+            self.checkpoint()
+        return summary
+
+    def delete(self, series_id: str) -> bool:
+        with self.lock:
+            self._ensure_process()
+            self._dirty = True
+            return self.sessions.pop(series_id, None) is not None
+
+    def checkpoint(self) -> None:
+        """Write this worker's live sessions to its slot (atomically, via a temporary file of its own)"""
+        if not self.checkpoint_dir:
+            return
+        os.makedirs(self.checkpoint_dir, exist_ok=True)
+        with self.lock:
+            self._ensure_process()
+            if self._dirty:
+                path = self._path(worker_id())
+                temporary = f"{path}.{os.getpid()}.tmp"
+                joblib.dump(dict(self.sessions), temporary)
+                os.replace(temporary, path)
+                self._dirty = False
+            self._last_checkpoint = time.monotonic()
+
+    def load(self) -> None:
+        """Restore this worker slot's last checkpoint, dropping sessions that went idle meanwhile"""
+        path = self._path(worker_id())
+        if not os.path.exists(path) and worker_id() == 0:
+            path = os.path.join(self.checkpoint_dir, LEGACY_CHECKPOINT_FILE)
+        if not os.path.exists(path):
+            return
+        try:
+            saved = joblib.load(path)
+        except Exception as e:
+            logger.error(f"Could not load series session checkpoint: {e}")
+            return
+        for series_id, session in sorted(saved.items(), key=lambda item: item[1].updated_at):
+            self.sessions[series_id] = session
+        self._evict()
+        logger.info(f"Loaded {len(self.sessions)} series sessions from {path}")
+
+
+series_sessions = SeriesSessionStore(
+    idle_timeout=float(os.getenv("ANALYTICS_SESSION_IDLE_S", "3600")),
+    max_sessions=int(os.getenv("ANALYTICS_MAX_SESSIONS", "100000")),
+    checkpoint_dir=os.getenv("ANALYTICS_SESSION_DIR") or None,
+    checkpoint_interval=float(os.getenv("ANALYTICS_CHECKPOINT_INTERVAL_S", "300"))
+)
@@ -0,0 +1,203 @@
+"""
+Shared Arrays Module
+Shared-memory transport for arrays and frame columns handed to process-pool workers
+"""
+
+import atexit
+import logging
+import threading
+from contextlib import contextmanager
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, Iterator, List, NamedTuple, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Offsets of arrays packed into one segment are rounded up to this, for aligned SIMD loads
+ALIGNMENT = 64
+
+
+class SharedArray(NamedTuple):
+    """Picklable handle to an array stored in a shared-memory segment"""
+    segment: str
+    offset: int
+    shape: Tuple[int, ...]
+    dtype: str
+
+
+class SharedFrame(NamedTuple):
+    """Handle to a numeric DataFrame stored column-major (one row per column) in one segment"""
+    values: SharedArray
+    columns: Tuple[str, ...]
+
+
+# Segments created by this process and not yet released, for the metrics gauge and exit cleanup
+_live: Dict[str, SharedMemory] = {}
+# Mappings that could not be closed yet because NumPy views still point into them
+_lingering: List[SharedMemory] = []
+_lock = threading.Lock()
+
+
+def live_segments() -> int:
+    return len(_live)
+
+
+def live_bytes() -> int:
+    with _lock:
+        return sum(segment.size for segment in _live.values())
+
+
+def ensure_tracker() -> None:
+    """Start the resource tracker before a pool forks, so workers share it
+
+    Workers then register the segments they attach with the parent's tracker instead
+    of starting their own, which would unlink those segments when a worker exits.
+    The shared tracker also unlinks whatever a crashed parent leaves behind.
+    """
+    resource_tracker.ensure_running()
+
+
+def _close(segment: SharedMemory) -> None:
+    """Close this process's handle; the memory is unmapped once no array views it
+
+    NumPy 2 arrays over `segment.buf` reference the mmap itself rather than holding a
+    buffer export, so closing the mmap would unmap memory still in use. Dropping our
+    reference leaves the unmap to whichever of us and the views goes last.
+    """
+    try:
+        if segment._buf is not None:
+            segment._buf.release()
+            segment._buf = None
+    except BufferError:
+        # Older NumPy holds an export on the memoryview; retry once it is freed
+        _lingering.append(segment)
+        return
+    segment._mmap = None
+    segment.close()
+
+
+def _close_lingering() -> None:
+    with _lock:
+        pending = _lingering[:]
+        _lingering.clear()
+    for segment in pending:
+        _close(segment)
+
+
+def _view(segment: SharedMemory, handle: SharedArray) -> np.ndarray:
+    return np.ndarray(handle.shape, dtype=np.dtype(handle.dtype), buffer=segment.buf, offset=handle.offset)
+
+
+def _aligned(nbytes: int) -> int:
+    return -(-nbytes // ALIGNMENT) * ALIGNMENT
+
+
+class SharedArena:
+    """Segments owned by one unit of work, closed and unlinked together when it ends
+
+    Only the arena's owner unlinks. Workers attach with `attached()` and write results
+    into outputs preallocated with `empty()`, so every segment has exactly one owner.
+    """
+
+    def __init__(self):
+        self.segments: List[SharedMemory] = []
+
+    def __enter__(self) -> 'SharedArena':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.release()
+
+    def _allocate(self, nbytes: int) -> SharedMemory:
+        segment = SharedMemory(create=True, size=max(nbytes, 1))
+        with _lock:
+            _live[segment.name] = segment
+        self.segments.append(segment)
+        return segment
+
+    def empty(self, shape: Sequence[int], dtype: np.dtype = np.float64) -> Tuple[SharedArray, np.ndarray]:
+        """An uninitialized shared array for workers to write into, and this process's view of it"""
+        shape = tuple(int(dim) for dim in shape)
+        dtype = np.dtype(dtype)
+        segment = self._allocate(int(np.prod(shape)) * dtype.itemsize)
+        handle = SharedArray(segment.name, 0, shape, dtype.str)
+        return handle, _view(segment, handle)
+
+    def put(self, array: np.ndarray) -> SharedArray:
+        """Copy `array` into a new segment (one memcpy) and return its handle"""
+        return self.put_many([array])[0]
+
+    def put_many(self, arrays: Sequence[np.ndarray]) -> List[SharedArray]:
+        """Pack several arrays into a single segment, each at an aligned offset"""
+        arrays = [np.asarray(array) for array in arrays]
+        offsets, total = [], 0
+        for array in arrays:
+            offsets.append(total)
+            total = _aligned(total + array.nbytes)
+        segment = self._allocate(total)
+        handles = []
+        for array, offset in zip(arrays, offsets):
+            handle = SharedArray(segment.name, offset, array.shape, array.dtype.str)
+            _view(segment, handle)[...] = array
+            handles.append(handle)
+        return handles
+
+    def put_frame(self, frame: pd.DataFrame, dtype: np.dtype = np.float64) -> SharedFrame:
+        """Share the columns of a numeric frame; the index is not shared (workers get a RangeIndex)"""
+        handle, values = self.empty((frame.shape[1], frame.shape[0]), dtype)
+        for i, column in enumerate(frame.columns):
+            values[i] = frame[column].to_numpy(dtype=dtype)
+        return SharedFrame(handle, tuple(str(column) for column in frame.columns))
+
+    def release(self) -> None:
+        """Unlink every segment of the arena; mappings still viewed here close once freed"""
+        with _lock:
+            for segment in self.segments:
+                _live.pop(segment.name, None)
+        for segment in self.segments:
+            try:
+                segment.unlink()
+            except FileNotFoundError:
+                pass
+            _close(segment)
+        self.segments = []
+        _close_lingering()
+
+
+@contextmanager
+def attached(*handles: SharedArray) -> Iterator[List[np.ndarray]]:
+    """Zero-copy views of shared arrays, valid inside the block; each segment is mapped once"""
+    segments: Dict[str, SharedMemory] = {}
+    try:
+        for handle in handles:
+            if handle.segment not in segments:
+                segments[handle.segment] = SharedMemory(name=handle.segment)
+        yield [_view(segments[handle.segment], handle) for handle in handles]
+    finally:
+        for segment in segments.values():
+            _close(segment)
+        _close_lingering()
+
+
+def frame_view(frame: SharedFrame, values: np.ndarray) -> pd.DataFrame:
+    """DataFrame over the attached `values` of a SharedFrame, without copying the columns"""
+    return pd.DataFrame(values.T, columns=list(frame.columns), copy=False)
+
+
+@atexit.register
+def _release_all() -> None:
+    """Unlink segments whose arenas were never released (e.g. on an abrupt shutdown)"""
+    with _lock:
+        leftovers = list(_live.values())
+        _live.clear()
+    for segment in leftovers:
+        try:
+            segment.unlink()
+        except FileNotFoundError:
+            pass
+        _close(segment)
+    if leftovers:
+        logger.warning(f"Released {len(leftovers)} shared-memory segments at exit")
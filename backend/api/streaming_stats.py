@@ -0,0 +1,314 @@
+"""
+Streaming Statistics Module
+Out-of-core descriptive statistics from mergeable summaries (moments, co-moments, t-digest, HyperLogLog)
+"""
+
+from collections import deque
+from concurrent.futures import Executor
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .descriptive_stats import BLOCK_SIZE, Moments
+
+DEFAULT_QUANTILES = (0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99)
+
+
+class TDigest:
+    """Merging t-digest: a mergeable quantile sketch that stays accurate in the tails"""
+
+    def __init__(self, compression: float = 200.0):
+        self.compression = compression
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.minimum = np.inf
+        self.maximum = -np.inf
+
+    def update(self, values: np.ndarray):
+        """Add a chunk of finite values"""
+        values = np.asarray(values, dtype=float).ravel()
+        if values.size == 0:
+            return
+        self.minimum = min(self.minimum, float(values.min()))
+        self.maximum = max(self.maximum, float(values.max()))
+        self._compress(
+            np.concatenate([self.means, values]),
+            np.concatenate([self.weights, np.ones(values.size)])
+        )
+
+    def merge(self, other: 'TDigest') -> 'TDigest':
+        """Combine two digests into a new one"""
+        merged = TDigest(max(self.compression, other.compression))
+        merged.minimum = min(self.minimum, other.minimum)
+        merged.maximum = max(self.maximum, other.maximum)
+        merged._compress(
+            np.concatenate([self.means, other.means]),
+            np.concatenate([self.weights, other.weights])
+        )
+        return merged
+
+    def _compress(self, means: np.ndarray, weights: np.ndarray):
+        """Group sorted centroids so each spans at most one unit of the arcsine scale function"""
+        if means.size == 0:
+            return
+        order = np.argsort(means, kind='stable')
+        means = means[order]
+        weights = weights[order]
+
+        total = weights.sum()
+        midpoints = (np.cumsum(weights) - weights / 2) / total
+        scale = self.compression / (2 * np.pi) * np.arcsin(np.clip(2 * midpoints - 1, -1.0, 1.0))
+        groups = np.floor(scale).astype(np.int64)
+        groups -= groups[0]
+
+        grouped_weights = np.bincount(groups, weights=weights)
+        keep = grouped_weights > 0
+        self.weights = grouped_weights[keep]
+        self.means = np.bincount(groups, weights=weights * means)[keep] / self.weights
+
+    def quantiles(self, quantiles: Sequence[float]) -> Dict[float, float]:
+        """Interpolate quantiles between centroid midpoints, anchored at the exact extremes"""
+        if self.weights.size == 0:
+            return {q: float('nan') for q in quantiles}
+        total = self.weights.sum()
+        positions = (np.cumsum(self.weights) - self.weights / 2) / total
+        xp = np.concatenate([[0.0], positions, [1.0]])
+        fp = np.concatenate([[self.minimum], self.means, [self.maximum]])
+        values = np.interp(np.asarray(quantiles, dtype=float), xp, fp)
+        return {q: float(v) for q, v in zip(quantiles, values)}
+
+
+class HyperLogLog:
+    """HyperLogLog distinct-count sketch over float values (mergeable by register max)"""
+
+    def __init__(self, precision: int = 14):
+        if not 4 <= precision <= 18:
+            raise ValueError("HyperLogLog precision must be between 4 and 18")
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    @staticmethod
+    def _hash(values: np.ndarray) -> np.ndarray:
+        """SplitMix64 finalizer over the float bit patterns"""
+        # Normalize -0.0 so it hashes like 0.0
+        z = (np.asarray(values, dtype=np.float64) + 0.0).view(np.uint64)
+        z = z + np.uint64(0x9E3779B97F4A7C15)
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return z ^ (z >> np.uint64(31))
+
+    @staticmethod
+    def _bit_length(values: np.ndarray) -> np.ndarray:
+        """Exact bit length of uint64 values via two float-exact 32-bit halves"""
+        high = (values >> np.uint64(32)).astype(np.float64)
+        low = (values & np.uint64(0xFFFFFFFF)).astype(np.float64)
+        return np.where(high > 0, 32 + np.frexp(high)[1], np.frexp(low)[1])
+
+    def update(self, values: np.ndarray):
+        """Add a chunk of values"""
+        values = np.asarray(values, dtype=float).ravel()
+        if values.size == 0:
+            return
+        hashed = self._hash(values)
+        suffix_bits = 64 - self.precision
+        index = (hashed >> np.uint64(suffix_bits)).astype(np.int64)
+        suffix = hashed & np.uint64((1 << suffix_bits) - 1)
+        rank = (suffix_bits - self._bit_length(suffix) + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def merge(self, other: 'HyperLogLog') -> 'HyperLogLog':
+        """Combine two sketches of the same precision"""
+        if self.precision != other.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches with different precision")
+        merged = HyperLogLog(self.precision)
+        merged.registers = np.maximum(self.registers, other.registers)
+        return merged
+
+    def count(self) -> int:
+        """Estimated number of distinct values"""
+        m = self.registers.size
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.exp2(-self.registers.astype(np.float64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros > 0:
+            # Linear counting is more accurate for small cardinalities
+            estimate = m * np.log(m / zeros)
+        return int(round(estimate))
+
+
+class CoMoments:
+    """Mergeable count, column means and co-moment matrix (sum of outer products of deviations)
+
+    Covariance and Pearson correlation come out in O(k^2) at any time; batches and
+    partial accumulators merge with the pairwise (Chan et al.) update, so order and
+    grouping do not matter.
+    """
+
+    def __init__(self, n_columns: int):
+        self.count = 0
+        self.mean = np.zeros(n_columns)
+        self.comoment = np.zeros((n_columns, n_columns))
+
+    @classmethod
+    def from_block(cls, block: np.ndarray) -> 'CoMoments':
+        """Summarize one (rows, columns) block"""
+        summary = cls(block.shape[1])
+        if block.shape[0] == 0:
+            return summary
+        summary.count = block.shape[0]
+        summary.mean = block.mean(axis=0, dtype=np.float64)
+        centered = block - summary.mean
+        summary.comoment = centered.T @ centered
+        return summary
+
+    @classmethod
+    def from_values(cls, values: np.ndarray, block_size: int = BLOCK_SIZE) -> 'CoMoments':
+        """Accumulate a (rows, columns) matrix in row blocks of about `block_size` cells"""
+        step = max(1, block_size // max(values.shape[1], 1))
+        summary = cls(values.shape[1])
+        for start in range(0, values.shape[0], step):
+            summary = summary.merge(cls.from_block(values[start:start + step]))
+        return summary
+
+    def merge(self, other: 'CoMoments') -> 'CoMoments':
+        """Combine accumulators over disjoint rows of the same columns"""
+        if self.mean.shape != other.mean.shape:
+            raise ValueError("Cannot merge co-moments over different numbers of columns")
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            return other
+        n = self.count + other.count
+        delta = other.mean - self.mean
+        merged = CoMoments(self.mean.size)
+        merged.count = n
+        merged.mean = self.mean + delta * (other.count / n)
+        merged.comoment = self.comoment + other.comoment + np.outer(delta, delta) * (self.count * other.count / n)
+        return merged
+
+    def covariance(self, ddof: int = 1) -> np.ndarray:
+        """Covariance matrix (NaN until more than `ddof` rows are in)"""
+        if self.count <= ddof:
+            return np.full_like(self.comoment, np.nan)
+        return self.comoment / (self.count - ddof)
+
+    def correlation(self) -> np.ndarray:
+        """Pearson correlation matrix (NaN for constant columns)"""
+        scale = np.sqrt(np.diag(self.comoment))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            correlation = self.comoment / np.outer(scale, scale)
+        correlation = np.clip(correlation, -1.0, 1.0)
+        np.fill_diagonal(correlation, np.where(scale > 0, 1.0, np.nan))
+        return correlation
+
+
+class StreamingStatistics:
+    """Exact moments and extremes plus quantile and distinct-count sketches for one column"""
+
+    def __init__(self, compression: float = 200.0, precision: int = 14):
+        self.moments = Moments()
+        self.digest = TDigest(compression)
+        self.distinct = HyperLogLog(precision)
+        self.missing = 0
+
+    def update(self, values: Any):
+        """Fold one chunk into the summary; NaN and infinite values are counted as missing and skipped"""
+        values = np.asarray(values, dtype=float).ravel()
+        finite = values[np.isfinite(values)]
+        self.missing += values.size - finite.size
+        if finite.size == 0:
+            return
+        self.moments = self.moments.merge(Moments.from_values(finite))
+        self.digest.update(finite)
+        self.distinct.update(finite)
+
+    def merge(self, other: 'StreamingStatistics') -> 'StreamingStatistics':
+        """Combine summaries built from disjoint chunks"""
+        merged = StreamingStatistics()
+        merged.moments = self.moments.merge(other.moments)
+        merged.digest = self.digest.merge(other.digest)
+        merged.distinct = self.distinct.merge(other.distinct)
+        merged.missing = self.missing + other.missing
+        return merged
+
+    def to_statistics(self, quantiles: Sequence[float] = DEFAULT_QUANTILES) -> Dict[str, Any]:
+        """Same keys as the UniversalAnalytics 'statistics' block, plus sketch-based extras"""
+        if self.moments.count == 0:
+            raise ValueError("No numeric values were streamed")
+        results = self.moments.to_statistics()
+        estimated = self.digest.quantiles(sorted(set(quantiles) | {0.5}))
+        results['median'] = estimated[0.5]
+        results['quantiles'] = {q: estimated[q] for q in quantiles}
+        results['distinct_count'] = self.distinct.count()
+        results['missing'] = self.missing
+        return results
+
+
+def summarize_chunk(frame: pd.DataFrame) -> Dict[str, StreamingStatistics]:
+    """Summarize every column of one chunk (safe to run in a worker)"""
+    summaries = {}
+    for column in frame.columns:
+        summary = StreamingStatistics()
+        summary.update(pd.to_numeric(frame[column], errors='coerce').to_numpy(dtype=float))
+        summaries[column] = summary
+    return summaries
+
+
+def merge_into(merged: Dict[str, StreamingStatistics], part: Dict[str, StreamingStatistics]) -> None:
+    """Fold one chunk's column summaries into a running set, in place"""
+    for column, summary in part.items():
+        merged[column] = merged[column].merge(summary) if column in merged else summary
+
+
+def merge_summaries(parts: Iterable[Dict[str, StreamingStatistics]]) -> Dict[str, StreamingStatistics]:
+    """Merge per-chunk column summaries in any order"""
+    merged: Dict[str, StreamingStatistics] = {}
+    for part in parts:
+        merge_into(merged, part)
+    return merged
+
+
+def stream_csv_statistics(
+    source: Any,
+    columns: Optional[List[str]] = None,
+    chunksize: int = 100_000,
+    quantiles: Sequence[float] = DEFAULT_QUANTILES,
+    executor: Optional[Executor] = None,
+    max_in_flight: int = 8
+) -> Dict[str, Dict[str, Any]]:
+    """Compute per-column statistics from a CSV that need not fit in memory
+
+    Chunks are summarized inline, or on `executor` with at most `max_in_flight`
+    chunks held at once. Each finished chunk is merged into a running summary per
+    column straight away, so memory does not grow with the number of chunks.
+
+    Without `columns`, the numeric columns of the first chunk are used throughout;
+    a stray string in a later chunk counts as missing rather than dropping that
+    chunk of the column.
+    """
+    reader = pd.read_csv(source, usecols=columns, chunksize=chunksize)
+    running: Dict[str, StreamingStatistics] = {}
+    pending: deque = deque()
+
+    for chunk in reader:
+        if columns is None:
+            columns = list(chunk.select_dtypes(include='number').columns)
+        chunk = chunk[columns]
+        if executor is None:
+            merge_into(running, summarize_chunk(chunk))
+            continue
+        pending.append(executor.submit(summarize_chunk, chunk))
+        if len(pending) >= max_in_flight:
+            merge_into(running, pending.popleft().result())
+
+    while pending:
+        merge_into(running, pending.popleft().result())
+    merged = {
+        column: summary
+        for column, summary in running.items()
+        if summary.moments.count > 0
+    }
+    if not merged:
+        raise ValueError("No numeric columns found in the CSV data")
+    return {column: summary.to_statistics(quantiles) for column, summary in merged.items()}
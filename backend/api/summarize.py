@@ -0,0 +1,56 @@
+"""
+Summarization Module
+Extractive text summarization router
+"""
+
+import logging
+from typing import List
+
+from fastapi import APIRouter
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+class TextRequest(BaseModel):
+    texts: List[str]
+
+@router.post("/analyze/summarize")
+async def analyze_summarize(req: TextRequest):
+    if not req.texts or not any(t.strip() for t in req.texts):
+        return {"error": "No valid text provided for summarization."}
+    
+    try:
+        # Simple extractive summarization for now
+        text = req.texts[0]  # Take first text for now
+        sentences = text.split('.')
+        sentences = [s.strip() for s in sentences if s.strip()]
+        
+        # Calculate sentence scores based on word frequency
+        word_freq = {}
+        for sentence in sentences:
+            for word in sentence.lower().split():
+                word_freq[word] = word_freq.get(word, 0) + 1
+        
+        # Score sentences
+        sentence_scores = []
+        for sentence in sentences:
+            score = sum(word_freq.get(word.lower(), 0) for word in sentence.split())
+            sentence_scores.append((sentence, score))
+        
+        # Get top 3 sentences
+        top_sentences = sorted(sentence_scores, key=lambda x: x[1], reverse=True)[:3]
+        summary = '. '.join(s[0] for s in sorted(top_sentences, key=lambda x: sentences.index(x[0])))
+        
+        return {
+            "results": [summary],
+            "stats": {
+                "original_length": len(text.split()),
+                "summary_length": len(summary.split()),
+                "compression_ratio": len(summary.split()) / len(text.split())
+            }
+        }
+    except Exception as e:
+        logger.error(f"Summarization error: {str(e)}")
+        return {"error": f"Summarization failed: {str(e)}"}
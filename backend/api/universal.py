@@ -19,23 +19,109 @@ from prophet import Prophet
 import joblib
 import json
 import os
+import asyncio
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from .vectorized import pad_series, split_series_summary, column_correlations
+from .descriptive_stats import describe
+from .streaming_stats import DEFAULT_QUANTILES, stream_csv_statistics
+from .seasonality import seasonality_analysis
+from .rolling import rolling_analysis
+from .hypothesis_testing import hypothesis_tests
+from .metrics import stage_timer
+from .precision import compute_dtype, as_float_array
+from .downsampling import downsample_indices, take
+from .prefork import register_preloader
+from .shared_arrays import SharedArena, SharedArray, attached, ensure_tracker
+from .baselines import anomaly_baselines
+from .forest_intervals import forest_cache, interval_config
+from .sampling import (
+    stratified_indices,
+    anomaly_sample_size,
+    correlation_sample_size,
+    approximation_report,
+    sample_seed,
+    proportion_margin,
+    kendall_margin,
+    dbscan_noise_1d
+)
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Anomaly results: one dict per point ('rows') or parallel arrays ('columnar')
+RESULT_FORMATS = ('rows', 'columnar')
+# Bit per detector in the columnar 'methods' array
+ANOMALY_METHOD_BITS = {'statistical': 1, 'isolation_forest': 2, 'dbscan': 4}
+
+# Processes of the shared batch-forecast pool (0: one per CPU), fixed for the server's lifetime
+FORECAST_WORKERS = int(os.getenv("ANALYTICS_FORECAST_WORKERS", "0")) or os.cpu_count() or 1
+
+@register_preloader
+def preload_estimators() -> None:
+    """Import the estimators that the engine otherwise loads on first use"""
+    from sklearn.ensemble import IsolationForest
+    from sklearn.feature_selection import mutual_info_regression
+    try:
+        from statsmodels.tsa.stattools import grangercausalitytests
+    except ImportError:
+        pass
+
+def granger_causality(df: pd.DataFrame) -> Dict[str, Dict[str, Any]]:
+    """Lag-1 SSR chi-squared Granger test for every ordered pair of columns"""
+    from statsmodels.tsa.stattools import grangercausalitytests
+    granger_results = {}
+    for col1 in df.columns:
+        for col2 in df.columns:
+            if col1 != col2:
+                try:
+                    gc_res = grangercausalitytests(
+                        df[[col1, col2]],
+                        maxlag=2,
+                        verbose=False
+                    )
+                    granger_results[f"{col1}_to_{col2}"] = {
+                        'p_value': gc_res[1][0]['ssr_chi2test'][1],
+                        'causal': gc_res[1][0]['ssr_chi2test'][1] < 0.05
+                    }
+                except:
+                    continue
+    return granger_results
+
+def forecast_series(values: np.ndarray, horizon: int, n_estimators: int = 50) -> np.ndarray:
+    """Fit a small Random Forest on one series and forecast `horizon` steps"""
+    X = np.arange(len(values)).reshape(-1, 1)
+    model = RandomForestRegressor(n_estimators=n_estimators, n_jobs=1)
+    model.fit(X, values)
+    future_X = np.arange(len(values), len(values) + horizon).reshape(-1, 1)
+    return model.predict(future_X)
+
+def forecast_shared_rows(
+    source: SharedArray,
+    output: SharedArray,
+    start: int,
+    lengths: List[int],
+    horizon: int,
+    n_estimators: int = 50
+) -> None:
+    """Forecast rows start.. of a shared padded matrix into the shared output (runs in a worker process)"""
+    with attached(source, output) as (matrix, forecasts):
+        for i, n in enumerate(lengths, start):
+            forecasts[i] = forecast_series(matrix[i, :n], horizon, n_estimators)
+
 class UniversalAnalytics:
     """Universal analytics engine with advanced capabilities"""
     
     def __init__(self):
         self.models = {}
         self.scalers = {}
+        self.forecast_pool: Optional[ProcessPoolExecutor] = None
+        self.forecast_workers = 0
         self.initialize_models()
         
     def initialize_models(self):
         """Initialize ML models for different analytics tasks"""
         self.models = {
-            'random_forest': RandomForestRegressor(n_estimators=100),
             'xgboost': xgb.XGBRegressor(n_estimators=100, learning_rate=0.1),
             'lightgbm': lgb.LGBMRegressor(n_estimators=100, learning_rate=0.1),
             'prophet': Prophet(
@@ -60,68 +146,87 @@ class UniversalAnalytics:
     async def advanced_time_series_analysis(
         self,
         data: List[float],
-        config: Dict[str, Any]
+        config: Dict[str, Any],
+        summary: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
-        """Perform advanced time series analysis"""
+        """Perform advanced time series analysis
+
+        `summary` carries precomputed 'statistics' and 'trend' blocks (as produced
+        by the micro-batcher); when given, those stages are not recomputed.
+        """
         try:
             if not data or len(data) < 2:
                 raise ValueError("Insufficient data points for analysis")
-            
+
             results = {}
-            
-            # Basic statistics
-            results['statistics'] = {
-                'mean': float(np.mean(data)),
-                'std': float(np.std(data)),
-                'min': float(np.min(data)),
-                'max': float(np.max(data)),
-                'skewness': float(stats.skew(data)),
-                'kurtosis': float(stats.kurtosis(data))
-            }
-            
-            # Trend analysis
-            x = np.arange(len(data))
-            slope, intercept, r_value, p_value, std_err = stats.linregress(x, data)
-            results['trend'] = {
-                'slope': float(slope),
-                'intercept': float(intercept),
-                'r_squared': float(r_value ** 2),
-                'p_value': float(p_value),
-                'direction': 'upward' if slope > 0 else 'downward',
-                'strength': abs(r_value)
-            }
-            
+            dtype = compute_dtype(config)
+            values = as_float_array(data, dtype)
+
+            if summary is not None:
+                results['statistics'] = summary['statistics']
+                results['trend'] = summary['trend']
+            else:
+                # Basic statistics
+                with stage_timer('time_series', 'statistics'):
+                    summary_stats = describe(values, quantiles=())
+                    results['statistics'] = {
+                        name: summary_stats[name]
+                        for name in ('mean', 'std', 'min', 'max', 'skewness', 'kurtosis')
+                    }
+
+                # Trend analysis
+                with stage_timer('time_series', 'trend'):
+                    x = np.arange(len(values))
+                    slope, intercept, r_value, p_value, std_err = stats.linregress(x, values)
+                results['trend'] = {
+                    'slope': float(slope),
+                    'intercept': float(intercept),
+                    'r_squared': float(r_value ** 2),
+                    'p_value': float(p_value),
+                    'direction': 'upward' if slope > 0 else 'downward',
+                    'strength': abs(r_value)
+                }
+
+            if config.get('seasonality'):
+                with stage_timer('time_series', 'seasonality'):
+                    results['seasonality'] = seasonality_analysis(values, config.get('seasonality_config'))
+
             # Multiple model predictions
             predictions = {}
-            
+            confidence, interval_method = interval_config(config)
+            X = np.arange(len(values), dtype=dtype).reshape(-1, 1)
+            next_X = np.array([[len(values)]], dtype=dtype)
+
+            rf_interval = None
             try:
-                # Random Forest prediction
-                rf_model = self.models['random_forest']
-                X = np.arange(len(data)).reshape(-1, 1)
-                rf_model.fit(X, data)
-                predictions['random_forest'] = float(rf_model.predict(np.array([[len(data)]]))[0])
+                # Random Forest prediction, with its interval from the same stacked tree pass
+                with stage_timer('time_series', 'random_forest'):
+                    rf_interval = forest_cache.fit(values).predict(next_X, confidence, interval_method)
+                    predictions['random_forest'] = float(rf_interval['predictions'][0])
             except Exception as e:
                 logger.warning(f"Random Forest prediction failed: {e}")
             
             try:
                 # XGBoost prediction
-                xgb_model = self.models['xgboost']
-                xgb_model.fit(X, data)
-                predictions['xgboost'] = float(xgb_model.predict(np.array([[len(data)]]))[0])
+                with stage_timer('time_series', 'xgboost'):
+                    xgb_model = self.models['xgboost']
+                    xgb_model.fit(X, values)
+                    predictions['xgboost'] = float(xgb_model.predict(next_X)[0])
             except Exception as e:
                 logger.warning(f"XGBoost prediction failed: {e}")
             
             try:
                 # Prophet prediction
-                prophet_model = self.models['prophet']
-                df = pd.DataFrame({
-                    'ds': pd.date_range('2024-01-01', periods=len(data)),
-                    'y': data
-                })
-                prophet_model.fit(df)
-                future = prophet_model.make_future_dataframe(periods=1)
-                prophet_forecast = prophet_model.predict(future)
-                predictions['prophet'] = float(prophet_forecast['yhat'].iloc[-1])
+                with stage_timer('time_series', 'prophet'):
+                    prophet_model = self.models['prophet']
+                    df = pd.DataFrame({
+                        'ds': pd.date_range('2024-01-01', periods=len(values)),
+                        'y': values
+                    })
+                    prophet_model.fit(df)
+                    future = prophet_model.make_future_dataframe(periods=1)
+                    prophet_forecast = prophet_model.predict(future)
+                    predictions['prophet'] = float(prophet_forecast['yhat'].iloc[-1])
             except Exception as e:
                 logger.warning(f"Prophet prediction failed: {e}")
             
@@ -132,8 +237,16 @@ class UniversalAnalytics:
                 ensemble_pred = np.mean(list(predictions.values()))
                 results['ensemble_prediction'] = {
                     'value': float(ensemble_pred),
-                    'confidence': float(1 - np.std(list(predictions.values())) / abs(ensemble_pred))
+                    'confidence': confidence
                 }
+                if rf_interval is not None:
+                    # The forest's calibrated interval, re-centred on the ensemble value
+                    shift = ensemble_pred - rf_interval['predictions'][0]
+                    results['ensemble_prediction'].update({
+                        'lower_bound': float(rf_interval['lower'][0] + shift),
+                        'upper_bound': float(rf_interval['upper'][0] + shift),
+                        'interval_method': rf_interval['method']
+                    })
             else:
                 results['predictions'] = {}
                 results['ensemble_prediction'] = {
@@ -147,57 +260,304 @@ class UniversalAnalytics:
             logger.error(f"Time series analysis error: {e}")
             raise Exception(f"Time series analysis failed: {str(e)}")
     
-    async def advanced_anomaly_detection(
+    async def batch_time_series_analysis(
+        self,
+        series: List[Any],
+        config: Dict[str, Any],
+        lengths: Optional[List[int]] = None
+    ) -> Dict[str, Any]:
+        """Profile many series at once with vectorized statistics and trend stages
+
+        `series` is either a list of series (equal length or ragged) or, when
+        `lengths` is given, the flat concatenation of all series.
+        """
+        try:
+            matrix, lengths = pad_series(series, lengths, dtype=compute_dtype(config))
+            if lengths.size == 0:
+                raise ValueError("No series provided for batch analysis")
+            if np.any(lengths < 2):
+                raise ValueError("Insufficient data points for analysis in at least one series")
+
+            with stage_timer('batch', 'statistics_trend'):
+                summaries = split_series_summary(matrix, lengths)
+            ids = config.get('ids') or list(range(len(summaries)))
+            if len(ids) != len(summaries):
+                raise ValueError("Number of ids does not match the number of series")
+
+            for summary, series_id, length in zip(summaries, ids, lengths.tolist()):
+                summary['id'] = series_id
+                summary['length'] = length
+
+            # Optional per-series forecasting spread across a process pool
+            if config.get('forecast', False):
+                horizon = int(config.get('horizon', 5))
+                with stage_timer('batch', 'forecast'):
+                    forecasts = await self._forecast_many(matrix, lengths, horizon, config)
+                for summary, forecast in zip(summaries, forecasts):
+                    summary['forecast'] = forecast
+
+            return {
+                'count': len(summaries),
+                'series': summaries
+            }
+
+        except Exception as e:
+            logger.error(f"Batch time series analysis error: {e}")
+            raise Exception(f"Batch time series analysis failed: {str(e)}")
+
+    async def _forecast_many(
+        self,
+        matrix: np.ndarray,
+        lengths: np.ndarray,
+        horizon: int,
+        config: Dict[str, Any]
+    ) -> List[List[float]]:
+        """Forecast every row in chunks on the shared worker pool
+
+        The padded matrix goes to the workers as one shared-memory segment and they
+        write forecasts into a shared output matrix, so only handles are pickled,
+        whatever the batch size. Every chunk finishes (or fails) before the segments
+        are unlinked; the first failure is then raised.
+        """
+        if self.forecast_pool is None:
+            self.forecast_workers = FORECAST_WORKERS
+            ensure_tracker()
+            self.forecast_pool = ProcessPoolExecutor(max_workers=self.forecast_workers)
+
+        # A few chunks per worker keeps the pool busy and balances uneven rows
+        n_series = lengths.size
+        chunk_size = max(1, -(-n_series // (self.forecast_workers * 4)))
+        n_estimators = int(config.get('n_estimators', 50))
+
+        loop = asyncio.get_running_loop()
+        with SharedArena() as arena:
+            source = arena.put(matrix)
+            output, forecasts = arena.empty((n_series, horizon))
+            outcomes = await asyncio.gather(*[
+                loop.run_in_executor(
+                    self.forecast_pool,
+                    forecast_shared_rows,
+                    source,
+                    output,
+                    start,
+                    lengths[start:start + chunk_size].tolist(),
+                    horizon,
+                    n_estimators
+                )
+                for start in range(0, n_series, chunk_size)
+            ], return_exceptions=True)
+            for outcome in outcomes:
+                if isinstance(outcome, BaseException):
+                    raise outcome
+            return forecasts.tolist()
+
+    async def streaming_statistics(
+        self,
+        source: Any,
+        config: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Compute column statistics from a CSV path or file object in bounded memory"""
+        try:
+            workers = int(config.get('workers', 0))
+            executor = ThreadPoolExecutor(max_workers=workers) if workers > 1 else None
+            try:
+                loop = asyncio.get_running_loop()
+                statistics = await loop.run_in_executor(
+                    None,
+                    lambda: stream_csv_statistics(
+                        source,
+                        columns=config.get('columns'),
+                        chunksize=int(config.get('chunksize', 100_000)),
+                        quantiles=config.get('quantiles', DEFAULT_QUANTILES),
+                        executor=executor,
+                        max_in_flight=max(2 * workers, 2)
+                    )
+                )
+            finally:
+                if executor is not None:
+                    executor.shutdown(wait=False)
+
+            return {'statistics': statistics}
+
+        except Exception as e:
+            logger.error(f"Streaming statistics error: {e}")
+            raise Exception(f"Streaming statistics failed: {str(e)}")
+
+    async def seasonality_analysis(
         self,
         data: List[float],
         config: Dict[str, Any]
-    ) -> List[Dict[str, Any]]:
-        """Perform advanced anomaly detection"""
+    ) -> Dict[str, Any]:
+        """Detect dominant periods and compute a seasonal profile for each"""
+        try:
+            if not data or len(data) < 4:
+                raise ValueError("Insufficient data points for seasonality analysis")
+            return seasonality_analysis(as_float_array(data, compute_dtype(config)), config)
+        except Exception as e:
+            logger.error(f"Seasonality analysis error: {e}")
+            raise Exception(f"Seasonality analysis failed: {str(e)}")
+
+    async def rolling_analysis(
+        self,
+        data: List[float],
+        config: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Rolling mean, std, extremes, quantiles and trend slope over trailing windows"""
         try:
+            return rolling_analysis(as_float_array(data, compute_dtype(config)), config)
+        except Exception as e:
+            logger.error(f"Rolling analysis error: {e}")
+            raise Exception(f"Rolling analysis failed: {str(e)}")
+
+    async def hypothesis_tests(
+        self,
+        groups: List[Any],
+        metrics: Dict[str, List[Optional[float]]],
+        config: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Two-sample and ANOVA tests of every metric across groups, resampling blocks on a thread pool"""
+        try:
+            workers = int(config.get('workers') or os.cpu_count() or 1)
+            executor = ThreadPoolExecutor(max_workers=workers) if workers > 1 else None
+            try:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(
+                    None,
+                    lambda: hypothesis_tests(groups, metrics, config, executor)
+                )
+            finally:
+                if executor is not None:
+                    executor.shutdown(wait=False)
+        except ValueError:
+            raise  # invalid labels or config, reported to the client as 422
+        except Exception as e:
+            logger.error(f"Hypothesis testing error: {e}")
+            raise Exception(f"Hypothesis testing failed: {str(e)}")
+
+    async def advanced_anomaly_detection(
+        self,
+        data: List[float],
+        config: Dict[str, Any],
+        z_scores: Optional[np.ndarray] = None
+    ) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
+        """Perform advanced anomaly detection
+
+        `z_scores` may be supplied precomputed (as produced by the micro-batcher);
+        otherwise they are calculated here. With `config['format'] == 'columnar'`
+        the result is parallel index / value / severity / method-bitmask arrays
+        instead of one dict per flagged point.
+
+        With `config['approximate']` the IsolationForest is fitted on a stratified
+        sample sized from `target_latency_ms` (or `sample_size`) and every point is
+        scored once. The result is then `{'anomalies': ..., 'approximation': ...}`.
+
+        With `config['baseline']` nothing is fitted: points are scored against the
+        stored reference baseline of that key (see api.baselines), and the result is
+        `{'anomalies': ..., 'baseline': ...}` with its drift and refresh state.
+        """
+        try:
+            result_format = config.get('format', 'rows')
+            if result_format not in RESULT_FORMATS:
+                raise ValueError(f"Unsupported format '{result_format}'; use one of {', '.join(RESULT_FORMATS)}")
+            approximate = bool(config.get('approximate'))
+            baseline_key = config.get('baseline')
+            extras = {}
             anomalies = []
-            
-            # Statistical method (Z-score)
-            z_scores = np.abs(stats.zscore(data))
-            statistical_anomalies = z_scores > 3
-            
-            # Isolation Forest
-            from sklearn.ensemble import IsolationForest
-            iso_forest = IsolationForest(contamination=0.1, random_state=42)
-            iso_predictions = iso_forest.fit_predict(np.array(data).reshape(-1, 1))
-            
-            # DBSCAN clustering
-            from sklearn.cluster import DBSCAN
-            dbscan = DBSCAN(eps=np.std(data) * 0.5, min_samples=3)
-            clusters = dbscan.fit_predict(np.array(data).reshape(-1, 1))
-            dbscan_anomalies = clusters == -1
-            
+            values = as_float_array(data, compute_dtype(config))
+            X = values.reshape(-1, 1)
+
+            if baseline_key is not None:
+                # Score against a stored reference model: no fitting, and the window is not its own reference
+                with stage_timer('anomaly', 'baseline'):
+                    scored = anomaly_baselines.score(baseline_key, values)
+                if scored is None:
+                    raise ValueError(f"Unknown anomaly baseline '{baseline_key}'")
+                z_scores = np.abs(scored['z_scores'])
+                statistical_anomalies = z_scores > 3
+                iso_scores = scored['scores']
+                iso_anomalies = scored['isolation_forest']
+                dbscan_anomalies = scored['dbscan']
+            else:
+                # Statistical method (Z-score)
+                with stage_timer('anomaly', 'zscore'):
+                    if z_scores is None:
+                        z_scores = stats.zscore(values)
+                    z_scores = np.abs(z_scores)
+                    statistical_anomalies = z_scores > 3
+
+                # Isolation Forest
+                with stage_timer('anomaly', 'isolation_forest'):
+                    from sklearn.ensemble import IsolationForest
+                    iso_forest = IsolationForest(contamination=0.1, random_state=42)
+                    if approximate:
+                        sample_size, predicted = anomaly_sample_size(values.size, config)
+                        iso_forest.fit(X[stratified_indices(values.size, sample_size, sample_seed(config))])
+                        # One scoring pass serves both the threshold test and the severities
+                        iso_scores = iso_forest.score_samples(X)
+                        iso_anomalies = iso_scores < iso_forest.offset_
+                    else:
+                        iso_anomalies = iso_forest.fit_predict(X) == -1
+                        iso_scores = None
+
+                # DBSCAN clustering: on 1-D data the exact noise mask needs only a sort, where
+                # sklearn's DBSCAN would store every neighbourhood (quadratic memory)
+                with stage_timer('anomaly', 'dbscan'):
+                    eps = np.std(values) * 0.5
+                    dbscan_anomalies = dbscan_noise_1d(values, eps, 3)
+
             # Combine results
-            for i, value in enumerate(data):
-                is_anomaly = (
-                    statistical_anomalies[i] or
-                    iso_predictions[i] == -1 or
-                    dbscan_anomalies[i]
+            flagged = np.flatnonzero(statistical_anomalies | iso_anomalies | dbscan_anomalies)
+            if flagged.size == 0:
+                severities = np.empty(0)
+            else:
+                severities = np.maximum.reduce([
+                    z_scores[flagged] / 3,  # Normalize Z-score
+                    np.abs(iso_scores[flagged] if iso_scores is not None else iso_forest.score_samples(X[flagged])),
+                    dbscan_anomalies[flagged].astype(float)
+                ])
+
+            if baseline_key is not None:
+                extras['baseline'] = {'key': baseline_key, **anomaly_baselines.get(baseline_key).summary()}
+            elif approximate:
+                approximation = approximation_report(values.size, sample_size, predicted, config)
+                # The 10% contamination threshold is a quantile of the sample's scores
+                approximation['isolation_forest'] = {
+                    'contamination': 0.1,
+                    'flagged_fraction': float(iso_anomalies.mean()),
+                    'margin': proportion_margin(0.1, sample_size)
+                }
+                approximation['exact'] = ['statistical', 'dbscan']
+                extras['approximation'] = approximation
+
+            if result_format == 'columnar':
+                methods = (
+                    statistical_anomalies[flagged] * ANOMALY_METHOD_BITS['statistical']
+                    | iso_anomalies[flagged] * ANOMALY_METHOD_BITS['isolation_forest']
+                    | dbscan_anomalies[flagged] * ANOMALY_METHOD_BITS['dbscan']
                 )
-                
-                if is_anomaly:
-                    severity = max(
-                        z_scores[i] / 3,  # Normalize Z-score
-                        abs(iso_forest.score_samples([[value]])[0]),
-                        int(dbscan_anomalies[i])
-                    )
-                    
-                    anomalies.append({
-                        'index': i,
-                        'value': float(value),
-                        'severity': float(severity),
-                        'detection_methods': {
-                            'statistical': bool(statistical_anomalies[i]),
-                            'isolation_forest': bool(iso_predictions[i] == -1),
-                            'dbscan': bool(dbscan_anomalies[i])
-                        }
-                    })
-            
-            return anomalies
+                anomalies = {
+                    'format': 'columnar',
+                    'index': flagged.tolist(),
+                    'value': values[flagged].tolist(),
+                    'severity': severities.tolist(),
+                    'methods': methods.tolist(),
+                    'method_bits': ANOMALY_METHOD_BITS
+                }
+                return {'anomalies': anomalies, **extras} if extras else anomalies
+
+            for i, severity in zip(flagged.tolist(), severities.tolist()):
+                anomalies.append({
+                    'index': i,
+                    'value': float(values[i]),
+                    'severity': float(severity),
+                    'detection_methods': {
+                        'statistical': bool(statistical_anomalies[i]),
+                        'isolation_forest': bool(iso_anomalies[i]),
+                        'dbscan': bool(dbscan_anomalies[i])
+                    }
+                })
+
+            return {'anomalies': anomalies, **extras} if extras else anomalies
             
         except Exception as e:
             logger.error(f"Anomaly detection error: {e}")
@@ -205,52 +565,63 @@ class UniversalAnalytics:
     
     async def advanced_correlation_analysis(
         self,
-        data: Dict[str, List[float]]
+        data: Dict[str, List[float]],
+        config: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
-        """Perform advanced correlation analysis"""
+        """Perform advanced correlation analysis
+
+        With `config['reduced']` only Pearson and Spearman are computed, from
+        row-blocked cross-products over complete rows, for inputs too large for
+        the pairwise Kendall, mutual information and Granger stages. With
+        `config['approximate']` those stages run on a sample instead.
+        """
         try:
             results = {}
             
             # Convert to DataFrame
-            df = pd.DataFrame(data)
+            dtype = compute_dtype(config)
+            df = pd.DataFrame(data, dtype=dtype)
+            
+            if (config or {}).get('reduced'):
+                values = df.dropna().to_numpy(dtype=dtype)
+                with stage_timer('correlation', 'pearson'):
+                    pearson_corr = pd.DataFrame(column_correlations(values), index=df.columns, columns=df.columns)
+                    results['pearson'] = pearson_corr.to_dict()
+                with stage_timer('correlation', 'spearman'):
+                    ranks = stats.rankdata(values, axis=0).astype(dtype, copy=False)
+                    spearman_corr = pd.DataFrame(column_correlations(ranks), index=df.columns, columns=df.columns)
+                    results['spearman'] = spearman_corr.to_dict()
+                results['skipped'] = ['kendall', 'mutual_information', 'granger_causality']
+                return results
+
+            if (config or {}).get('approximate'):
+                return self._approximate_correlation(df, config, dtype)
             
             # Pearson correlation
-            pearson_corr = df.corr(method='pearson')
-            results['pearson'] = pearson_corr.to_dict()
+            with stage_timer('correlation', 'pearson'):
+                pearson_corr = df.corr(method='pearson')
+                results['pearson'] = pearson_corr.to_dict()
             
             # Spearman correlation
-            spearman_corr = df.corr(method='spearman')
-            results['spearman'] = spearman_corr.to_dict()
+            with stage_timer('correlation', 'spearman'):
+                spearman_corr = df.corr(method='spearman')
+                results['spearman'] = spearman_corr.to_dict()
             
             # Kendall correlation
-            kendall_corr = df.corr(method='kendall')
-            results['kendall'] = kendall_corr.to_dict()
+            with stage_timer('correlation', 'kendall'):
+                kendall_corr = df.corr(method='kendall')
+                results['kendall'] = kendall_corr.to_dict()
             
             # Mutual Information
-            from sklearn.feature_selection import mutual_info_regression
-            mi_scores = mutual_info_regression(df, df.iloc[:, 0])
-            results['mutual_information'] = dict(zip(df.columns, mi_scores))
+            with stage_timer('correlation', 'mutual_information'):
+                from sklearn.feature_selection import mutual_info_regression
+                mi_scores = mutual_info_regression(df, df.iloc[:, 0])
+                results['mutual_information'] = dict(zip(df.columns, mi_scores))
             
             # Granger Causality (if enough data points)
             if len(df) > 30:
-                from statsmodels.tsa.stattools import grangercausalitytests
-                granger_results = {}
-                for col1 in df.columns:
-                    for col2 in df.columns:
-                        if col1 != col2:
-                            try:
-                                gc_res = grangercausalitytests(
-                                    df[[col1, col2]],
-                                    maxlag=2,
-                                    verbose=False
-                                )
-                                granger_results[f"{col1}_to_{col2}"] = {
-                                    'p_value': gc_res[1][0]['ssr_chi2test'][1],
-                                    'causal': gc_res[1][0]['ssr_chi2test'][1] < 0.05
-                                }
-                            except:
-                                continue
-                results['granger_causality'] = granger_results
+                with stage_timer('correlation', 'granger'):
+                    results['granger_causality'] = granger_causality(df)
             
             return results
             
@@ -258,6 +629,50 @@ class UniversalAnalytics:
             logger.error(f"Correlation analysis error: {e}")
             raise Exception(f"Correlation analysis failed: {str(e)}")
     
+    def _approximate_correlation(self, df: pd.DataFrame, config: Dict[str, Any], dtype: type) -> Dict[str, Any]:
+        """Exact Pearson / Spearman; Kendall and mutual information on a stratified row sample
+
+        Granger tests need consecutive rows, so they run on the most recent
+        sample-sized block instead. Each sampled stage reports its uncertainty.
+        """
+        results = {}
+        values = df.dropna().to_numpy(dtype=dtype)
+        n_rows, n_cols = values.shape
+        sample_size, predicted = correlation_sample_size(n_rows, n_cols, config)
+        seed = sample_seed(config)
+        sample = values[stratified_indices(n_rows, sample_size, seed)]
+        approximation = approximation_report(n_rows, sample_size, predicted, config)
+
+        with stage_timer('correlation', 'pearson'):
+            results['pearson'] = pd.DataFrame(column_correlations(values), index=df.columns, columns=df.columns).to_dict()
+        with stage_timer('correlation', 'spearman'):
+            ranks = stats.rankdata(values, axis=0).astype(dtype, copy=False)
+            results['spearman'] = pd.DataFrame(column_correlations(ranks), index=df.columns, columns=df.columns).to_dict()
+
+        with stage_timer('correlation', 'kendall'):
+            kendall_corr = pd.DataFrame(sample, columns=df.columns).corr(method='kendall')
+            results['kendall'] = kendall_corr.to_dict()
+            margin = kendall_margin(kendall_corr.to_numpy(), sample_size)
+            approximation['kendall_margin'] = pd.DataFrame(margin, index=df.columns, columns=df.columns).to_dict()
+
+        with stage_timer('correlation', 'mutual_information'):
+            from sklearn.feature_selection import mutual_info_regression
+            mi_scores = mutual_info_regression(sample, sample[:, 0], random_state=seed)
+            results['mutual_information'] = dict(zip(df.columns, mi_scores))
+            # Half the gap between estimates from two disjoint halves of the sample
+            halves = [mutual_info_regression(half, half[:, 0], random_state=seed) for half in (sample[::2], sample[1::2])]
+            approximation['mutual_information_spread'] = dict(zip(df.columns, np.abs(halves[0] - halves[1]) / 2))
+
+        if sample_size > 30:
+            with stage_timer('correlation', 'granger'):
+                results['granger_causality'] = granger_causality(
+                    pd.DataFrame(values[-sample_size:], columns=df.columns)
+                )
+            approximation['granger_rows'] = min(sample_size, n_rows)
+
+        results['approximation'] = approximation
+        return results
+
     async def advanced_forecasting(
         self,
         data: List[float],
@@ -270,25 +685,29 @@ class UniversalAnalytics:
             
             results = {}
             horizon = config.get('horizon', 5)
+            confidence, interval_method = interval_config(config)
+            dtype = compute_dtype(config)
+            values = as_float_array(data, dtype)
             
             # Prepare data
             df = pd.DataFrame({
-                'ds': pd.date_range('2024-01-01', periods=len(data)),
-                'y': data
+                'ds': pd.date_range('2024-01-01', periods=len(values)),
+                'y': values
             })
             
             # Prophet forecasting
             try:
-                prophet_model = self.models['prophet']
-                prophet_model.fit(df)
-                future = prophet_model.make_future_dataframe(periods=horizon)
-                prophet_forecast = prophet_model.predict(future)
+                with stage_timer('forecast', 'prophet'):
+                    prophet_model = self.models['prophet']
+                    prophet_model.fit(df)
+                    future = prophet_model.make_future_dataframe(periods=horizon)
+                    prophet_forecast = prophet_model.predict(future)
                 
-                results['prophet'] = {
-                    'predictions': prophet_forecast['yhat'].tail(horizon).tolist(),
-                    'lower_bound': prophet_forecast['yhat_lower'].tail(horizon).tolist(),
-                    'upper_bound': prophet_forecast['yhat_upper'].tail(horizon).tolist()
-                }
+                    results['prophet'] = {
+                        'predictions': prophet_forecast['yhat'].tail(horizon).tolist(),
+                        'lower_bound': prophet_forecast['yhat_lower'].tail(horizon).tolist(),
+                        'upper_bound': prophet_forecast['yhat_upper'].tail(horizon).tolist()
+                    }
             except Exception as e:
                 logger.error(f"Prophet forecasting error: {e}")
                 results['prophet'] = {
@@ -297,36 +716,39 @@ class UniversalAnalytics:
                     'upper_bound': []
                 }
             
-            # Random Forest forecasting
+            # Random Forest forecasting: every step and its interval from one stacked tree pass
+            rf_interval = None
             try:
-                rf_model = self.models['random_forest']
-                X = np.arange(len(data)).reshape(-1, 1)
-                rf_model.fit(X, data)
-                
-                rf_predictions = []
-                for i in range(horizon):
-                    pred = rf_model.predict(np.array([[len(data) + i]]))[0]
-                    rf_predictions.append(float(pred))
+                with stage_timer('forecast', 'random_forest'):
+                    future_X = np.arange(len(values), len(values) + horizon, dtype=dtype).reshape(-1, 1)
+                    rf_interval = forest_cache.fit(values).predict(future_X, confidence, interval_method)
                 
                 results['random_forest'] = {
-                    'predictions': rf_predictions
+                    'predictions': rf_interval['predictions'].tolist(),
+                    'lower_bound': rf_interval['lower'].tolist(),
+                    'upper_bound': rf_interval['upper'].tolist(),
+                    'interval_method': rf_interval['method']
                 }
             except Exception as e:
                 logger.error(f"Random Forest forecasting error: {e}")
+                rf_interval = None
                 results['random_forest'] = {
-                    'predictions': []
+                    'predictions': [],
+                    'lower_bound': [],
+                    'upper_bound': []
                 }
             
             # XGBoost forecasting
             try:
-                xgb_model = self.models['xgboost']
-                X = np.arange(len(data)).reshape(-1, 1)
-                xgb_model.fit(X, data)
+                with stage_timer('forecast', 'xgboost'):
+                    xgb_model = self.models['xgboost']
+                    X = np.arange(len(values), dtype=dtype).reshape(-1, 1)
+                    xgb_model.fit(X, values)
                 
-                xgb_predictions = []
-                for i in range(horizon):
-                    pred = xgb_model.predict(np.array([[len(data) + i]]))[0]
-                    xgb_predictions.append(float(pred))
+                    xgb_predictions = []
+                    for i in range(horizon):
+                        pred = xgb_model.predict(np.array([[len(values) + i]], dtype=dtype))[0]
+                        xgb_predictions.append(float(pred))
                 
                 results['xgboost'] = {
                     'predictions': xgb_predictions
@@ -355,8 +777,13 @@ class UniversalAnalytics:
                 
                 results['ensemble'] = {
                     'predictions': ensemble_predictions,
-                    'confidence': float(1 - np.std(ensemble_predictions) / np.mean(ensemble_predictions)) if ensemble_predictions else 0.0
+                    'confidence': confidence
                 }
+                if rf_interval is not None:
+                    # The forest's calibrated interval, re-centred on the ensemble at each step
+                    shift = np.array(ensemble_predictions) - rf_interval['predictions']
+                    results['ensemble']['lower_bound'] = (rf_interval['lower'] + shift).tolist()
+                    results['ensemble']['upper_bound'] = (rf_interval['upper'] + shift).tolist()
             except Exception as e:
                 logger.error(f"Ensemble forecasting error: {e}")
                 results['ensemble'] = {
@@ -364,6 +791,17 @@ class UniversalAnalytics:
                     'confidence': 0.0
                 }
             
+            # Optional chart-bound reduction: every horizon-long array shares one index
+            max_points = int(config.get('max_points') or 0)
+            reference = next((block['predictions'] for block in results.values() if block['predictions']), None)
+            if max_points and reference and horizon > max_points:
+                index = downsample_indices(reference, max_points, config.get('downsample', 'lttb'))
+                for block in results.values():
+                    for key, series in block.items():
+                        if isinstance(series, list) and len(series) == horizon:
+                            block[key] = take(series, index)
+                results['index'] = index.tolist()
+            
             return results
             
         except Exception as e:
@@ -0,0 +1,256 @@
+"""
+Vectorized Analytics Stages
+Row-wise statistics, z-score and trend kernels over 2-D series matrices
+"""
+
+import numpy as np
+from typing import List, Dict, Any, Optional, Sequence, Tuple
+from scipy import stats
+from .descriptive_stats import describe
+from .precision import as_float_array
+
+STATISTIC_NAMES = ('mean', 'std', 'min', 'max', 'skewness', 'kurtosis')
+
+
+def as_series_matrix(series: Any) -> np.ndarray:
+    """Coerce a single series or a stack of equal-length series to a 2-D float array"""
+    matrix = as_float_array(series)
+    if matrix.ndim == 1:
+        matrix = matrix.reshape(1, -1)
+    if matrix.ndim != 2:
+        raise ValueError("Expected a 2-D matrix of series (one series per row)")
+    return matrix
+
+
+def pad_series(
+    series: Sequence[Any],
+    lengths: Optional[Sequence[int]] = None,
+    dtype: Optional[type] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Stack a matrix, a ragged list of series, or flat values split by `lengths` into a NaN-padded matrix"""
+    if lengths is not None:
+        lengths = np.asarray(lengths, dtype=int)
+        if np.any(lengths < 0):
+            raise ValueError("Series lengths must be non-negative")
+        flat = as_float_array(series, dtype)
+        if flat.ndim != 1 or flat.size != int(lengths.sum()):
+            raise ValueError("Flat values do not match the sum of the series lengths")
+        width = int(lengths.max()) if lengths.size else 0
+        matrix = np.full((lengths.size, width), np.nan, dtype=flat.dtype)
+        mask = np.arange(width) < lengths[:, None]
+        matrix[mask] = flat
+        return matrix, lengths
+
+    rows = [as_float_array(row, dtype).ravel() for row in series]
+    lengths = np.array([row.size for row in rows], dtype=int)
+    if lengths.size and np.all(lengths == lengths[0]):
+        return np.vstack(rows), lengths
+
+    width = int(lengths.max()) if lengths.size else 0
+    matrix = np.full((lengths.size, width), np.nan, dtype=np.result_type(*rows) if rows else np.float64)
+    for i, row in enumerate(rows):
+        matrix[i, :row.size] = row
+    return matrix, lengths
+
+
+def _row_mask(matrix: np.ndarray, lengths: Optional[np.ndarray]) -> Optional[np.ndarray]:
+    """Mask of valid cells, or None when every row spans the full width"""
+    if lengths is None or np.all(lengths == matrix.shape[1]):
+        return None
+    return np.arange(matrix.shape[1]) < lengths[:, None]
+
+
+def batch_statistics(matrix: np.ndarray, lengths: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+    """Calculate descriptive statistics for every row of the matrix at once
+
+    Ragged rows are grouped by length, and each group goes through `describe` as a
+    dense block without its padding. Empty rows come back as NaN.
+    """
+    matrix = as_series_matrix(matrix)
+    mask = _row_mask(matrix, lengths)
+
+    if mask is None:
+        summary = describe(matrix, quantiles=())
+        return {name: summary[name] for name in STATISTIC_NAMES}
+
+    results = {name: np.full(matrix.shape[0], np.nan) for name in STATISTIC_NAMES}
+    for length in np.unique(lengths[lengths > 0]):
+        rows = np.flatnonzero(lengths == length)
+        summary = describe(matrix[rows, :length], quantiles=())
+        for name, values in results.items():
+            values[rows] = summary[name]
+    return results
+
+
+def batch_zscores(matrix: np.ndarray) -> np.ndarray:
+    """Calculate population z-scores row by row (same convention as stats.zscore)"""
+    matrix = as_series_matrix(matrix)
+    mean = matrix.mean(axis=1, keepdims=True, dtype=np.float64)
+    centered = matrix - mean.astype(matrix.dtype)
+    std = np.sqrt(np.einsum('ij,ij->i', centered, centered, dtype=np.float64) / matrix.shape[1])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        centered /= std[:, None].astype(matrix.dtype)
+    return centered
+
+
+def batch_trend(matrix: np.ndarray, lengths: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+    """Fit a least-squares trend line against the index for every row at once"""
+    matrix = as_series_matrix(matrix)
+    width = matrix.shape[1]
+    mask = _row_mask(matrix, lengths)
+    n = np.full(matrix.shape[0], width, dtype=float) if mask is None else lengths.astype(float)
+    if mask is None and width < 2:
+        raise ValueError("Insufficient data points for trend analysis")
+
+    x = np.arange(width, dtype=float)
+    x_mean = (n - 1) / 2
+    # Sum of squared deviations of 0..n-1 has a closed form
+    ssx = n * (n * n - 1) / 12
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Centered values keep the matrix dtype; the reductions accumulate in float64
+        if mask is None:
+            y_mean = matrix.mean(axis=1, dtype=np.float64)
+            y_centered = matrix - y_mean[:, None].astype(matrix.dtype)
+            ssxy = np.einsum('ij,j->i', y_centered, x - (width - 1) / 2, dtype=np.float64)
+        else:
+            y_mean = np.where(mask, matrix, 0.0).sum(axis=1, dtype=np.float64) / n
+            y_centered = np.where(mask, matrix - y_mean[:, None].astype(matrix.dtype), 0.0)
+            ssxy = np.einsum('ij,ij->i', y_centered, np.where(mask, x - x_mean[:, None], 0.0), dtype=np.float64)
+        ssy = np.einsum('ij,ij->i', y_centered, y_centered, dtype=np.float64)
+
+    return trend_from_sums(n, x_mean, ssx, ssxy, ssy, y_mean)
+
+
+def trend_from_sums(
+    n: np.ndarray,
+    x_mean: np.ndarray,
+    ssx: np.ndarray,
+    ssxy: np.ndarray,
+    ssy: np.ndarray,
+    y_mean: np.ndarray
+) -> Dict[str, np.ndarray]:
+    """Slope, intercept, r and two-sided p-value from centered sums (stats.linregress conventions)"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        slope = ssxy / ssx
+        intercept = y_mean - slope * x_mean
+        r_value = np.where(ssy > 0, ssxy / np.sqrt(ssx * ssy), 0.0)
+        r_value = np.clip(r_value, -1.0, 1.0)
+
+        df = n - 2
+        t_stat = r_value * np.sqrt(df / ((1.0 - r_value) * (1.0 + r_value)))
+        p_value = 2 * stats.t.sf(np.abs(t_stat), np.maximum(df, 1))
+
+    # Two points always fit exactly; mirror stats.linregress
+    p_value = np.where(df == 0, np.where(ssy > 0, 0.0, 1.0), p_value)
+    too_short = n < 2
+    if np.any(too_short):
+        for values in (slope, intercept, r_value, p_value):
+            values[too_short] = np.nan
+
+    return {
+        'slope': slope,
+        'intercept': intercept,
+        'r_value': r_value,
+        'p_value': p_value
+    }
+
+
+def _segments(values: Any, lengths: Sequence[int]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Validated values, lengths, segment start offsets and per-value segment ids"""
+    values = as_float_array(values).ravel()
+    lengths = np.asarray(lengths, dtype=np.int64)
+    if np.any(lengths <= 0) or lengths.sum() != values.size:
+        raise ValueError("Segment lengths must be positive and add up to the number of values")
+    starts = np.cumsum(lengths) - lengths
+    segment = np.repeat(np.arange(lengths.size), lengths)
+    return values, lengths, starts, segment
+
+
+def segment_statistics(values: Any, lengths: Sequence[int]) -> Dict[str, np.ndarray]:
+    """batch_statistics for consecutive segments of a flat array (e.g. values sorted by group)
+
+    Uses segmented reductions, so cost is linear in the number of values however
+    unevenly they are spread over segments (no padding to the longest one).
+    """
+    values, lengths, starts, segment = _segments(values, lengths)
+    count = lengths.astype(float)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = np.add.reduceat(values, starts, dtype=np.float64) / count
+        centered = values - mean[segment].astype(values.dtype)
+        squared = centered * centered
+        m2 = np.add.reduceat(squared, starts, dtype=np.float64) / count
+        m3 = np.add.reduceat(squared * centered, starts, dtype=np.float64) / count
+        m4 = np.add.reduceat(squared * squared, starts, dtype=np.float64) / count
+        skewness = m3 / m2 ** 1.5
+        kurtosis = m4 / (m2 * m2) - 3.0
+
+    return {
+        'mean': mean,
+        'std': np.sqrt(m2),
+        'min': np.minimum.reduceat(values, starts),
+        'max': np.maximum.reduceat(values, starts),
+        'skewness': skewness,
+        'kurtosis': kurtosis
+    }
+
+
+def segment_trend(values: Any, lengths: Sequence[int]) -> Dict[str, np.ndarray]:
+    """batch_trend for consecutive segments: a least-squares line against the position within each"""
+    values, lengths, starts, segment = _segments(values, lengths)
+    n = lengths.astype(float)
+    x_mean = (n - 1) / 2
+    ssx = n * (n * n - 1) / 12
+    x_centered = np.arange(values.size) - starts[segment] - x_mean[segment]
+
+    y_mean = np.add.reduceat(values, starts, dtype=np.float64) / n
+    y_centered = values - y_mean[segment].astype(values.dtype)
+    ssxy = np.add.reduceat(y_centered * x_centered, starts, dtype=np.float64)
+    ssy = np.add.reduceat(y_centered * y_centered, starts, dtype=np.float64)
+    return trend_from_sums(n, x_mean, ssx, ssxy, ssy, y_mean)
+
+
+def split_series_summary(matrix: np.ndarray, lengths: Optional[np.ndarray] = None) -> List[Dict[str, Any]]:
+    """Run the statistics and trend stages once and split them into per-series result blocks"""
+    statistics = batch_statistics(matrix, lengths)
+    trend = batch_trend(matrix, lengths)
+
+    summaries = []
+    for i in range(len(trend['slope'])):
+        slope = float(trend['slope'][i])
+        r_value = float(trend['r_value'][i])
+        summaries.append({
+            'statistics': {name: float(values[i]) for name, values in statistics.items()},
+            'trend': {
+                'slope': slope,
+                'intercept': float(trend['intercept'][i]),
+                'r_squared': r_value ** 2,
+                'p_value': float(trend['p_value'][i]),
+                'direction': 'upward' if slope > 0 else 'downward',
+                'strength': abs(r_value)
+            }
+        })
+    return summaries
+
+
+def split_zscores(matrix: np.ndarray) -> List[np.ndarray]:
+    """Run the z-score stage once and split it back into per-series arrays"""
+    return list(batch_zscores(matrix))
+
+
+def column_correlations(matrix: np.ndarray, block_rows: int = 65536) -> np.ndarray:
+    """Pearson correlation between the columns of a complete (n, c) matrix
+
+    Centered cross-products are accumulated over row blocks, so the working set
+    is one block plus the (c, c) result instead of pairwise copies.
+    """
+    means = matrix.mean(axis=0, dtype=np.float64).astype(matrix.dtype)
+    cross = np.zeros((matrix.shape[1], matrix.shape[1]))
+    for start in range(0, matrix.shape[0], block_rows):
+        block = matrix[start:start + block_rows] - means
+        # Block products run in the matrix dtype; the running sum is float64
+        cross += block.T @ block
+    scale = np.sqrt(np.diag(cross))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return cross / np.outer(scale, scale)
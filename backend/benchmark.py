@@ -0,0 +1,386 @@
+"""
+Benchmark Suite
+Drives the analytics engines and the FastAPI app in-process over a grid of data sizes
+and concurrency levels, reporting throughput, latency percentiles and peak memory.
+
+Usage:
+    python benchmark.py --sizes 256,4096 --concurrency 1,8 --iterations 20 --output results.json
+    python benchmark.py --scenarios engine.anomaly,http.analyze --format csv --output results.csv
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import numpy as np
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+Factory = Callable[[int, np.random.Generator], Callable[[], Awaitable[Any]]]
+
+WORDS = (
+    "the service was good great slow fast reliable broken not very easy difficult "
+    "support team delivered excellent results but the latency was terrible today"
+).split()
+
+
+def make_series(size: int, rng: np.random.Generator) -> List[float]:
+    """Trend + daily seasonality + noise, with a few injected spikes"""
+    t = np.arange(size)
+    values = 100 + 0.05 * t + 10 * np.sin(2 * np.pi * t / 24) + rng.normal(0, 2, size)
+    spikes = rng.choice(size, size=max(1, size // 100), replace=False)
+    values[spikes] += rng.choice([-1, 1], spikes.size) * 40
+    return values.tolist()
+
+
+def make_texts(count: int, rng: np.random.Generator, words_per_text: int = 20) -> List[str]:
+    return [' '.join(rng.choice(WORDS, words_per_text)) for _ in range(count)]
+
+
+def in_thread(function: Callable[[], Any]) -> Callable[[], Awaitable[Any]]:
+    """Run a synchronous call on the default executor so concurrency applies to it too"""
+    async def call():
+        return await asyncio.get_running_loop().run_in_executor(None, function)
+    return call
+
+
+def engine_scenarios() -> Dict[str, Factory]:
+    """Direct calls into the engines, bypassing HTTP"""
+    from api.universal import universal_analytics
+    from api.sentiment_analysis import analyze_sentiment, SentimentRequest
+    from api.summarize import analyze_summarize, TextRequest
+
+    scenarios: Dict[str, Factory] = {
+        'engine.time_series': lambda size, rng: (
+            lambda data=make_series(size, rng): universal_analytics.advanced_time_series_analysis(data, {})
+        ),
+        'engine.anomaly': lambda size, rng: (
+            lambda data=make_series(size, rng): universal_analytics.advanced_anomaly_detection(data, {})
+        ),
+        'engine.correlation': lambda size, rng: (
+            lambda data={f'm{i}': make_series(size, rng) for i in range(3)}:
+                universal_analytics.advanced_correlation_analysis(data)
+        ),
+        'engine.forecast': lambda size, rng: (
+            lambda data=make_series(size, rng): universal_analytics.advanced_forecasting(data, {'horizon': 10})
+        ),
+        'engine.seasonality': lambda size, rng: (
+            lambda data=make_series(size, rng): universal_analytics.seasonality_analysis(data, {})
+        ),
+        'engine.batch': lambda size, rng: (
+            lambda series=[make_series(size, rng) for _ in range(64)]:
+                universal_analytics.batch_time_series_analysis(series, {})
+        ),
+        'engine.batch_forecast': lambda size, rng: (
+            lambda series=[make_series(size, rng) for _ in range(64)]:
+                universal_analytics.batch_time_series_analysis(series, {'forecast': True, 'n_estimators': 10})
+        ),
+        'engine.sentiment': lambda size, rng: in_thread(
+            lambda request=SentimentRequest(texts=make_texts(size, rng)): analyze_sentiment(request)
+        ),
+        'engine.summarize': lambda size, rng: (
+            lambda request=TextRequest(texts=['. '.join(make_texts(size, rng, 12))]): analyze_summarize(request)
+        ),
+    }
+
+    try:
+        from api.regression_analyzer import RegressionAnalysisService
+    except Exception as e:
+        print(f"Skipping regression scenarios: {e}", file=sys.stderr)
+        return scenarios
+
+    service = RegressionAnalysisService()
+
+    def regression_data(size, rng):
+        X = np.arange(size, dtype=float)
+        return X.tolist(), (3 + 0.5 * X + rng.normal(0, 5, size)).tolist()
+
+    def multiple_data(size, rng):
+        X = rng.normal(size=(size, 4))
+        return X.tolist(), (X @ np.array([1.0, -2.0, 0.5, 3.0]) + rng.normal(0, 0.5, size)).tolist()
+
+    scenarios.update({
+        'engine.regression_simple': lambda size, rng: in_thread(
+            lambda d=regression_data(size, rng): service.analyze_simple_regression(*d)
+        ),
+        'engine.regression_multiple': lambda size, rng: in_thread(
+            lambda d=multiple_data(size, rng): service.analyze_multiple_regression(*d)
+        ),
+        'engine.regression_polynomial': lambda size, rng: in_thread(
+            lambda d=regression_data(size, rng): service.analyze_polynomial_regression(*d, degree=5)
+        ),
+        'engine.regression_time_series': lambda size, rng: in_thread(
+            lambda d=regression_data(size, rng): service.analyze_time_series_regression(*d)
+        ),
+    })
+    return scenarios
+
+
+def http_scenarios(client) -> Dict[str, Factory]:
+    """Requests through the full FastAPI stack over an in-process ASGI transport"""
+
+    def post(path: str, body: Dict[str, Any]) -> Callable[[], Awaitable[Any]]:
+        payload = json.dumps(body).encode()
+        headers = {'content-type': 'application/json'}
+
+        async def call():
+            response = await client.post(path, content=payload, headers=headers)
+            if response.status_code >= 400:
+                raise RuntimeError(f"{path} returned {response.status_code}: {response.text[:200]}")
+            return response
+        return call
+
+    return {
+        'http.health': lambda size, rng: (lambda: client.get('/api/health')),
+        'http.analyze': lambda size, rng: post(
+            '/api/advanced/analyze', {'data': make_series(size, rng), 'config': {}}
+        ),
+        'http.anomalies': lambda size, rng: post(
+            '/api/detect-anomalies', {'data': make_series(size, rng)}
+        ),
+        'http.seasonality': lambda size, rng: post(
+            '/api/advanced/seasonality', {'data': make_series(size, rng), 'config': {}}
+        ),
+        'http.batch': lambda size, rng: post(
+            '/api/advanced/batch-analyze', {'series': [make_series(size, rng) for _ in range(64)], 'config': {}}
+        ),
+        'http.summarize': lambda size, rng: post(
+            '/analyze/summarize', {'texts': ['. '.join(make_texts(size, rng, 12))]}
+        ),
+    }
+
+
+def max_rss_bytes() -> Optional[int]:
+    """Process high-water mark of resident memory (Linux reports KiB)"""
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return usage if sys.platform == 'darwin' else usage * 1024
+
+
+async def measure_peak_memory(call: Callable[[], Awaitable[Any]]) -> int:
+    """Peak bytes allocated by one call, traced separately so timing runs stay untraced"""
+    tracemalloc.start()
+    try:
+        await call()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+async def run_case(
+    call: Callable[[], Awaitable[Any]],
+    concurrency: int,
+    iterations: int,
+    warmup: int
+) -> Dict[str, Any]:
+    """Run `iterations` calls with at most `concurrency` in flight"""
+    for _ in range(warmup):
+        await call()
+
+    latencies: List[float] = []
+    errors: List[str] = []
+    remaining = iter(range(iterations))
+
+    async def worker():
+        for _ in remaining:
+            start = time.perf_counter()
+            try:
+                await call()
+            except Exception as e:
+                errors.append(str(e))
+                continue
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - start
+
+    result = {
+        'iterations': iterations,
+        'errors': len(errors),
+        'wall_seconds': wall,
+        'throughput_per_second': len(latencies) / wall if wall > 0 else None
+    }
+    if latencies:
+        p50, p90, p99 = np.percentile(latencies, [50, 90, 99])
+        result.update({
+            'latency_mean_ms': float(np.mean(latencies)) * 1e3,
+            'latency_p50_ms': float(p50) * 1e3,
+            'latency_p90_ms': float(p90) * 1e3,
+            'latency_p99_ms': float(p99) * 1e3,
+            'latency_max_ms': float(np.max(latencies)) * 1e3
+        })
+    if errors:
+        result['first_error'] = errors[0]
+    return result
+
+
+async def run_suite(
+    selected: Optional[List[str]],
+    sizes: List[int],
+    concurrency_levels: List[int],
+    iterations: int,
+    warmup: int,
+    seed: int,
+    trace_memory: bool
+) -> List[Dict[str, Any]]:
+    import httpx
+    from main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url='http://benchmark') as client:
+        scenarios = {**engine_scenarios(), **http_scenarios(client)}
+        names = [
+            name for name in scenarios
+            if not selected or any(name == s or name.startswith(s.rstrip('.') + '.') for s in selected)
+        ]
+
+        results = []
+        for name in names:
+            for size in sizes:
+                rng = np.random.default_rng(seed)
+                try:
+                    call = scenarios[name](size, rng)
+                    peak = await measure_peak_memory(call) if trace_memory else None
+                except Exception as e:
+                    results.append({'scenario': name, 'size': size, 'error': str(e)})
+                    print(f"{name:<32} size={size:<7} failed: {e}", file=sys.stderr)
+                    continue
+
+                for concurrency in concurrency_levels:
+                    result = await run_case(call, concurrency, iterations, warmup)
+                    result.update({
+                        'scenario': name,
+                        'size': size,
+                        'concurrency': concurrency,
+                        'peak_traced_bytes': peak,
+                        'max_rss_bytes': max_rss_bytes()
+                    })
+                    results.append(result)
+                    print(
+                        f"{name:<32} size={size:<7} c={concurrency:<3} "
+                        f"{result.get('throughput_per_second') or 0:9.2f}/s "
+                        f"p50={result.get('latency_p50_ms', float('nan')):9.2f}ms "
+                        f"p99={result.get('latency_p99_ms', float('nan')):9.2f}ms",
+                        file=sys.stderr
+                    )
+        return results
+
+
+def environment() -> Dict[str, Any]:
+    """Enough context to tell whether two result files are comparable"""
+    import numpy
+    import pandas
+    import sklearn
+
+    try:
+        revision = subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, timeout=5,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip() or None
+    except Exception:
+        revision = None
+
+    return {
+        'timestamp': datetime.now().isoformat(),
+        'git_revision': revision,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'numpy': numpy.__version__,
+        'pandas': pandas.__version__,
+        'scikit_learn': sklearn.__version__
+    }
+
+
+def write_results(report: Dict[str, Any], path: Optional[str], output_format: str):
+    if output_format == 'csv':
+        rows = report['results']
+        leading = ['scenario', 'size', 'concurrency']
+        columns = leading + sorted({key for row in rows for key in row} - set(leading))
+        handle = open(path, 'w', newline='') if path else sys.stdout
+        try:
+            writer = csv.DictWriter(handle, fieldnames=columns)
+            writer.writeheader()
+            writer.writerows(rows)
+        finally:
+            if path:
+                handle.close()
+        return
+
+    text = json.dumps(report, indent=2)
+    if path:
+        with open(path, 'w') as handle:
+            handle.write(text + '\n')
+    else:
+        print(text)
+
+
+def parse_list(value: str) -> List[int]:
+    return [int(v) for v in value.split(',') if v.strip()]
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Benchmark the analytics engines and API in-process")
+    parser.add_argument('--scenarios', help="Comma-separated scenario names or prefixes (e.g. engine,http.analyze)")
+    parser.add_argument('--sizes', default='256,4096', help="Data points per request")
+    parser.add_argument('--concurrency', default='1,8', help="Requests in flight")
+    parser.add_argument('--iterations', type=int, default=20, help="Measured calls per case")
+    parser.add_argument('--warmup', type=int, default=2, help="Unmeasured calls per case")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--no-memory', action='store_true', help="Skip the traced peak-memory pass")
+    parser.add_argument('--format', choices=('json', 'csv'), default='json')
+    parser.add_argument('--output', help="Result file (default: stdout)")
+    parser.add_argument('--list', action='store_true', help="List scenario names and exit")
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+    if args.list:
+        async def names():
+            import httpx
+            async with httpx.AsyncClient() as client:
+                return [*engine_scenarios(), *http_scenarios(client)]
+        print('\n'.join(asyncio.run(names())))
+        return
+
+    selected = [s.strip() for s in args.scenarios.split(',')] if args.scenarios else None
+    results = asyncio.run(run_suite(
+        selected,
+        parse_list(args.sizes),
+        parse_list(args.concurrency),
+        args.iterations,
+        args.warmup,
+        args.seed,
+        not args.no_memory
+    ))
+    report = {
+        'environment': environment(),
+        'config': {
+            'sizes': parse_list(args.sizes),
+            'concurrency': parse_list(args.concurrency),
+            'iterations': args.iterations,
+            'warmup': args.warmup,
+            'seed': args.seed
+        },
+        'results': results
+    }
+    write_results(report, args.output, args.format)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,4 @@
-from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi import APIRouter, BackgroundTasks, FastAPI, HTTPException, WebSocket, WebSocketDisconnect, UploadFile, File, Form
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import List, Dict, Any, Optional, Union
@@ -11,8 +11,41 @@ import joblib
 import json
 from scipy import stats
 import logging
-from api.universal import universal_analytics
+from api.universal import universal_analytics, RESULT_FORMATS
+from api.micro_batching import MicroBatcher
+from api.vectorized import split_series_summary, split_zscores
+from api.descriptive_stats import describe
+from api.rolling import DEFAULT_ROLLING_QUANTILES
+from api.hypothesis_testing import RESAMPLING_TESTS
+from api.series_sessions import series_sessions
+from api.sampling import correlation_sample_size
+from api.baselines import anomaly_baselines, MAX_REFERENCE_POINTS
+from api.covariance_streams import covariance_streams
+from api.shared_arrays import live_segments
+from api.forest_intervals import DEFAULT_INTERVAL_METHOD, INTERVAL_METHODS, forecast_intervals, forest_cache
+from api.admission import ADMISSION_CONTROL, AdmissionMiddleware, admission
+from api.metrics import install_metrics, queue_depth, cache_entries
+from api.prefork import serve_prefork
+from api.regression import router as regression_router
+from api.industry import router as industry_router
+from api.online_models import online_models
+from api.sentiment_analysis import router as sentiment_router
+from api.summarize import router as summarize_router
+from api.memory_budget import (
+    memory_budget,
+    MemoryBudgetExceeded,
+    estimate_time_series,
+    estimate_forecast,
+    estimate_anomaly_detection,
+    estimate_seasonality,
+    estimate_rolling,
+    estimate_batch,
+    estimate_correlation,
+    estimate_covariance_batch,
+    estimate_hypothesis_tests
+)
 import math
+import os
 import asyncio
 from typing import Set
 
@@ -20,16 +53,7 @@ from typing import Set
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="Analytics Platform Backend")
-
-# Configure CORS
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # In production, replace with specific origins
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+router = APIRouter()
 
 # WebSocket connection manager
 class ConnectionManager:
@@ -52,6 +76,26 @@ class ConnectionManager:
 
 manager = ConnectionManager()
 
+# Opt-in micro-batching: small concurrent requests share one vectorized stage call
+MICRO_BATCHING = os.getenv("ANALYTICS_MICRO_BATCHING", "false").lower() in ("1", "true", "yes")
+MICRO_BATCH_MAX_WAIT_MS = float(os.getenv("ANALYTICS_MICRO_BATCH_MAX_WAIT_MS", "2"))
+MICRO_BATCH_MAX_SIZE = int(os.getenv("ANALYTICS_MICRO_BATCH_MAX_SIZE", "256"))
+MICRO_BATCH_MAX_POINTS = int(os.getenv("ANALYTICS_MICRO_BATCH_MAX_POINTS", "4096"))
+
+summary_batcher = MicroBatcher(split_series_summary, MICRO_BATCH_MAX_WAIT_MS, MICRO_BATCH_MAX_SIZE)
+zscore_batcher = MicroBatcher(split_zscores, MICRO_BATCH_MAX_WAIT_MS, MICRO_BATCH_MAX_SIZE)
+queue_depth.set_function(lambda: summary_batcher.pending, 'micro_batch_summary')
+queue_depth.set_function(lambda: zscore_batcher.pending, 'micro_batch_zscore')
+
+def should_micro_batch(data: List[float]) -> bool:
+    """Only small series are worth holding back for a batch"""
+    return MICRO_BATCHING and 2 <= len(data) <= MICRO_BATCH_MAX_POINTS
+
+def memory_refusal(error: MemoryBudgetExceeded) -> HTTPException:
+    """413 for requests that can never fit, 503 with Retry-After while the budget is committed"""
+    headers = {"Retry-After": "1"} if error.status_code == 503 else None
+    return HTTPException(status_code=error.status_code, detail=str(error), headers=headers)
+
 # Data Models
 class DataField(BaseModel):
     name: str
@@ -67,13 +111,31 @@ class PredictionRequest(BaseModel):
     data: List[float]
     horizon: int
     confidence: float
+    interval_method: str = DEFAULT_INTERVAL_METHOD  # 'conformal' or 'quantile'
 
 class AnomalyDetectionRequest(BaseModel):
     data: List[float]
     threshold: float = 0.95
+    config: Dict[str, Any] = {}
+
+class BaselineRequest(BaseModel):
+    data: List[float]  # reference window
+    config: Dict[str, Any] = {}  # contamination, refresh_interval_s, drift_threshold
+
+class CovarianceBatchRequest(BaseModel):
+    columns: List[str]
+    rows: List[List[Optional[float]]]  # one value per column; rows with a null are skipped
+
+class CovariancePartial(BaseModel):
+    columns: List[str]
+    count: int
+    mean: List[float]
+    comoment: List[List[float]]
+    dropped: int = 0
 
 class CorrelationRequest(BaseModel):
     data: List[List[float]]
+    config: Dict[str, Any] = {}
 
 class ForecastRequest(BaseModel):
     data: List[float]
@@ -83,8 +145,20 @@ class TimeSeriesAnalysisRequest(BaseModel):
     data: List[float]
     config: Dict[str, Any]
 
-class TextRequest(BaseModel):
-    texts: List[str]
+class HypothesisTestRequest(BaseModel):
+    groups: List[Union[str, int]]  # group label of each row
+    metrics: Dict[str, List[Optional[float]]]  # one value per row; null for missing
+    config: Dict[str, Any] = {}  # tests, control, alternative, correction, alpha, n_resamples, seed, workers, format
+
+class SeriesAppendRequest(BaseModel):
+    values: List[float]
+    x: Optional[List[float]] = None  # defaults to the positions after the last point
+
+class BatchTimeSeriesRequest(BaseModel):
+    series: Optional[List[List[float]]] = None  # one row per series, may be ragged
+    values: Optional[List[float]] = None  # flat alternative, split by `lengths`
+    lengths: Optional[List[int]] = None
+    config: Dict[str, Any] = {}
 
 # Analytics Engine
 class AnalyticsEngine:
@@ -119,12 +193,10 @@ class AnalyticsEngine:
             # Basic statistics for numeric data
             if prepared_data['numeric']:
                 numeric_values = list(prepared_data['numeric'].values())
+                summary = describe(numeric_values)
                 results['statistics'] = {
-                    'mean': float(np.mean(numeric_values)),
-                    'median': float(np.median(numeric_values)),
-                    'std': float(np.std(numeric_values)),
-                    'min': float(np.min(numeric_values)),
-                    'max': float(np.max(numeric_values))
+                    name: summary[name]
+                    for name in ('mean', 'median', 'std', 'min', 'max')
                 }
 
                 # Perform specific analysis based on type
@@ -140,7 +212,8 @@ class AnalyticsEngine:
                     )
                 elif analysis_type == 'correlation':
                     results['correlation'] = await self.universal_analytics.advanced_correlation_analysis(
-                        prepared_data['numeric']
+                        prepared_data['numeric'],
+                        parameters
                     )
                 elif analysis_type == 'industry':
                     industry = (parameters or {}).get('industry', '').lower()
@@ -173,24 +246,70 @@ class AnalyticsEngine:
             logger.error(f"Analysis error: {str(e)}")
             raise HTTPException(status_code=500, detail=str(e))
 
+    def predict_future_values(
+        self,
+        data: List[float],
+        horizon: int,
+        confidence: float,
+        interval_method: str = DEFAULT_INTERVAL_METHOD
+    ) -> Dict[str, Any]:
+        """Forest forecast with a conformal or tree-quantile interval"""
+        try:
+            forecast = forecast_intervals(np.array(data, dtype=np.float64), horizon, confidence, interval_method)
+            return {
+                'predictions': forecast['predictions'].tolist(),
+                'confidence_intervals': {
+                    'lower': forecast['lower'].tolist(),
+                    'upper': forecast['upper'].tolist()
+                },
+                'confidence': confidence,
+                'interval_method': forecast['method'],
+                'calibration_size': forecast['calibration_size']
+            }
+        except Exception as e:
+            logger.error(f"Prediction error: {str(e)}")
+            raise HTTPException(status_code=500, detail=str(e))
+
 # Initialize analytics engine
 analytics_engine = AnalyticsEngine()
+cache_entries.set_function(lambda: len(universal_analytics.models), 'universal_models')
+cache_entries.set_function(lambda: len(series_sessions), 'series_sessions')
+cache_entries.set_function(lambda: len(anomaly_baselines), 'anomaly_baselines')
+cache_entries.set_function(live_segments, 'shared_memory_segments')
+cache_entries.set_function(lambda: len(forest_cache), 'forest_intervals')
 
 # API Endpoints
-@app.post("/api/analyze")
+@router.post("/api/analyze")
 async def analyze_data(request: AnalysisRequest):
     """Analyze data with specified analysis type"""
+    # The time series, anomaly and correlation types run the advanced engines, so they reserve memory like those endpoints
+    n_numeric = sum(1 for field in request.data if field.type == 'number')
+    parameters = dict(request.parameters or {})
+    estimate = 0
+    if request.analysis_type == 'time_series':
+        estimate = estimate_time_series(n_numeric)
+    elif request.analysis_type == 'anomaly':
+        estimate = estimate_anomaly_detection(n_numeric, bool(parameters.get('approximate')))
+    elif request.analysis_type == 'correlation':
+        # The numeric fields form one row; too wide for the pairwise tests falls back to Pearson / Spearman only
+        estimate = estimate_correlation(1, n_numeric)
+        if not memory_budget.fits(estimate):
+            parameters['reduced'] = True
+            estimate = estimate_correlation(1, n_numeric, reduced=True)
     try:
-        results = await analytics_engine.analyze_data(
-            request.data,
-            request.analysis_type,
-            request.parameters
-        )
+        with memory_budget.reserve('analyze', estimate):
+            results = await analytics_engine.analyze_data(
+                request.data,
+                request.analysis_type,
+                parameters
+            )
         return results
+    except MemoryBudgetExceeded as e:
+        raise memory_refusal(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.websocket("/ws")
+@router.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     await manager.connect(websocket)
     try:
@@ -204,25 +323,28 @@ async def websocket_endpoint(websocket: WebSocket):
         logger.error(f"WebSocket error: {e}")
         manager.disconnect(websocket)
 
-@app.post("/api/predict")
+@router.post("/api/predict")
 async def predict_values(request: PredictionRequest):
     """Predict future values"""
+    if request.interval_method not in INTERVAL_METHODS:
+        raise HTTPException(status_code=422, detail=f"interval_method must be one of {', '.join(INTERVAL_METHODS)}")
     try:
         predictions = analytics_engine.predict_future_values(
             request.data,
             request.horizon,
-            request.confidence
+            request.confidence,
+            request.interval_method
         )
         return predictions
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/api/detect-anomalies")
-async def detect_anomalies(request: AnomalyDetectionRequest):
+@router.post("/api/detect-anomalies")
+async def detect_anomalies(request: AnomalyDetectionRequest, background_tasks: BackgroundTasks):
     """Detect anomalies in data"""
     try:
         # Extract threshold from config if provided, otherwise use default
-        threshold = request.config.get('threshold', 0.95) if hasattr(request, 'config') else 0.95
+        threshold = request.config.get('threshold', request.threshold)
         
         # Validate data
         if not request.data or len(request.data) < 2:
@@ -231,90 +353,324 @@ async def detect_anomalies(request: AnomalyDetectionRequest):
         # Check for invalid values
         if any(not isinstance(x, (int, float)) or math.isnan(x) or math.isinf(x) for x in request.data):
             raise HTTPException(status_code=422, detail="Data contains invalid values (NaN or infinite)")
+
+        if request.config.get('format', 'rows') not in RESULT_FORMATS:
+            raise HTTPException(status_code=422, detail=f"format must be one of {', '.join(RESULT_FORMATS)}")
             
-        anomalies = await universal_analytics.advanced_anomaly_detection(
-            request.data,
-            {'threshold': threshold}
-        )
-        return {"anomalies": anomalies}
+        baseline = request.config.get('baseline')
+        if baseline is not None and anomaly_baselines.get(baseline) is None:
+            raise HTTPException(status_code=404, detail=f"Unknown anomaly baseline '{baseline}'")
+
+        approximate = bool(request.config.get('approximate'))
+        estimate = estimate_anomaly_detection(len(request.data), approximate or baseline is not None)
+        with memory_budget.reserve('anomaly', estimate):
+            z_scores = None
+            # Baseline z-scores use the reference mean / std, not the window's own
+            if baseline is None and should_micro_batch(request.data):
+                z_scores = await zscore_batcher.submit(request.data)
+
+            anomalies = await universal_analytics.advanced_anomaly_detection(
+                request.data,
+                {**request.config, 'threshold': threshold},
+                z_scores=z_scores
+            )
+        if baseline is not None and anomaly_baselines.refresh_due(baseline):
+            background_tasks.add_task(anomaly_baselines.refresh, baseline)
+        # Approximate and baseline results already carry 'anomalies' next to their report
+        return anomalies if approximate or baseline is not None else {"anomalies": anomalies}
     except HTTPException as e:
         raise e
+    except MemoryBudgetExceeded as e:
+        raise memory_refusal(e)
     except Exception as e:
         logger.error(f"Anomaly detection error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Anomaly detection failed: {str(e)}")
 
-@app.post("/api/advanced/correlation")
+@router.post("/api/anomaly-baselines/{key}")
+async def fit_anomaly_baseline(key: str, request: BaselineRequest):
+    """Fit the reference anomaly model that later windows are scored against"""
+    if any(not math.isfinite(x) for x in request.data):
+        raise HTTPException(status_code=422, detail="Data contains invalid values (NaN or infinite)")
+    estimate = estimate_anomaly_detection(min(len(request.data), MAX_REFERENCE_POINTS), approximate=True)
+    try:
+        with memory_budget.reserve('anomaly_baseline', estimate):
+            baseline = anomaly_baselines.fit(key, request.data, request.config)
+    except MemoryBudgetExceeded as e:
+        raise memory_refusal(e)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return {"key": key, **baseline.summary()}
+
+@router.get("/api/anomaly-baselines/{key}")
+async def get_anomaly_baseline(key: str):
+    """Reference statistics, drift and refresh state of a baseline"""
+    baseline = anomaly_baselines.get(key)
+    if baseline is None:
+        raise HTTPException(status_code=404, detail=f"Unknown anomaly baseline '{key}'")
+    return {"key": key, **baseline.summary()}
+
+@router.delete("/api/anomaly-baselines/{key}")
+async def delete_anomaly_baseline(key: str):
+    """Discard a baseline"""
+    if not anomaly_baselines.delete(key):
+        raise HTTPException(status_code=404, detail=f"Unknown anomaly baseline '{key}'")
+    return {"key": key, "deleted": True}
+
+@router.post("/api/advanced/correlation")
 async def analyze_correlation(request: CorrelationRequest):
-    correlations = await universal_analytics.advanced_correlation_analysis(
-        request.data
-    )
+    # Inputs too large for the pairwise tests fall back to Pearson / Spearman only
+    rows = len(request.data)
+    columns = max((len(row) for row in request.data), default=0)
+    config = dict(request.config)
+    sample_rows = correlation_sample_size(rows, columns, config)[0] if config.get('approximate') else None
+    estimate = estimate_correlation(rows, columns, sample_rows=sample_rows)
+    if not memory_budget.fits(estimate):
+        config['reduced'] = True
+        estimate = estimate_correlation(rows, columns, reduced=True)
+    try:
+        with memory_budget.reserve('correlation', estimate):
+            correlations = await universal_analytics.advanced_correlation_analysis(
+                request.data,
+                config
+            )
+    except MemoryBudgetExceeded as e:
+        raise memory_refusal(e)
     return correlations
 
-@app.post("/api/advanced/forecast")
+@router.post("/api/advanced/covariance/{stream_id}")
+async def add_covariance_batch(stream_id: str, request: CovarianceBatchRequest):
+    """Fold a batch of rows into a stream's running means and co-moment matrix"""
+    estimate = estimate_covariance_batch(len(request.rows), len(request.columns))
+    try:
+        with memory_budget.reserve('covariance', estimate):
+            added = covariance_streams.update(stream_id, request.columns, request.rows)
+    except MemoryBudgetExceeded as e:
+        raise memory_refusal(e)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return {"stream_id": stream_id, "added": added}
+
+@router.get("/api/advanced/covariance/{stream_id}")
+async def get_covariance(stream_id: str, partial: bool = False):
+    """Means, covariance and Pearson correlation so far (or this worker's raw partial)"""
+    stream = covariance_streams.partial(stream_id) if partial else covariance_streams.view(stream_id)
+    if stream is None:
+        raise HTTPException(status_code=404, detail=f"Unknown covariance stream '{stream_id}'")
+    return {"stream_id": stream_id, **(stream.export() if partial else stream.summary())}
+
+@router.post("/api/advanced/covariance/{stream_id}/merge")
+async def merge_covariance(stream_id: str, request: CovariancePartial):
+    """Merge a partial accumulator exported by another worker or service"""
+    try:
+        covariance_streams.merge_partial(stream_id, request.model_dump())
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return {"stream_id": stream_id, "merged": request.count}
+
+@router.delete("/api/advanced/covariance/{stream_id}")
+async def delete_covariance(stream_id: str):
+    """Discard a stream and its saved partials"""
+    if not covariance_streams.delete(stream_id):
+        raise HTTPException(status_code=404, detail=f"Unknown covariance stream '{stream_id}'")
+    return {"stream_id": stream_id, "deleted": True}
+
+@router.post("/api/advanced/forecast")
 async def forecast(request: ForecastRequest):
-    forecast = await universal_analytics.advanced_forecasting(
-        request.data,
-        request.config
-    )
+    estimate = estimate_forecast(len(request.data), int(request.config.get('horizon', 5)))
+    try:
+        with memory_budget.reserve('forecast', estimate):
+            forecast = await universal_analytics.advanced_forecasting(
+                request.data,
+                request.config
+            )
+    except MemoryBudgetExceeded as e:
+        raise memory_refusal(e)
     return forecast
 
-@app.post("/api/advanced/analyze")
+@router.post("/api/advanced/analyze")
 async def analyze_time_series(request: TimeSeriesAnalysisRequest):
     """Perform advanced time series analysis"""
     try:
-        results = await universal_analytics.advanced_time_series_analysis(
-            request.data,
-            request.config
-        )
+        with memory_budget.reserve('time_series', estimate_time_series(len(request.data))):
+            summary = None
+            if should_micro_batch(request.data):
+                summary = await summary_batcher.submit(request.data)
+
+            results = await universal_analytics.advanced_time_series_analysis(
+                request.data,
+                request.config,
+                summary=summary
+            )
         return results
+    except MemoryBudgetExceeded as e:
+        raise memory_refusal(e)
     except Exception as e:
         logger.error(f"Time series analysis error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/analyze/summarize")
-async def analyze_summarize(req: TextRequest):
-    if not req.texts or not any(t.strip() for t in req.texts):
-        return {"error": "No valid text provided for summarization."}
-    
+@router.post("/api/advanced/seasonality")
+async def analyze_seasonality(request: TimeSeriesAnalysisRequest):
+    """Detect seasonal periods and profiles"""
     try:
-        # Simple extractive summarization for now
-        text = req.texts[0]  # Take first text for now
-        sentences = text.split('.')
-        sentences = [s.strip() for s in sentences if s.strip()]
-        
-        # Calculate sentence scores based on word frequency
-        word_freq = {}
-        for sentence in sentences:
-            for word in sentence.lower().split():
-                word_freq[word] = word_freq.get(word, 0) + 1
-        
-        # Score sentences
-        sentence_scores = []
-        for sentence in sentences:
-            score = sum(word_freq.get(word.lower(), 0) for word in sentence.split())
-            sentence_scores.append((sentence, score))
-        
-        # Get top 3 sentences
-        top_sentences = sorted(sentence_scores, key=lambda x: x[1], reverse=True)[:3]
-        summary = '. '.join(s[0] for s in sorted(top_sentences, key=lambda x: sentences.index(x[0])))
-        
-        return {
-            "results": [summary],
-            "stats": {
-                "original_length": len(text.split()),
-                "summary_length": len(summary.split()),
-                "compression_ratio": len(summary.split()) / len(text.split())
-            }
-        }
+        with memory_budget.reserve('seasonality', estimate_seasonality(len(request.data))):
+            return await universal_analytics.seasonality_analysis(request.data, request.config)
+    except MemoryBudgetExceeded as e:
+        raise memory_refusal(e)
+    except Exception as e:
+        logger.error(f"Seasonality analysis error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/api/advanced/rolling")
+async def analyze_rolling(request: TimeSeriesAnalysisRequest):
+    """Rolling-window statistics and trend slope in one linear-time pass per statistic"""
+    estimate = estimate_rolling(
+        len(request.data),
+        len(request.config.get('quantiles', DEFAULT_ROLLING_QUANTILES)),
+        int(request.config.get('step', 1))
+    )
+    try:
+        with memory_budget.reserve('rolling', estimate):
+            return await universal_analytics.rolling_analysis(request.data, request.config)
+    except MemoryBudgetExceeded as e:
+        raise memory_refusal(e)
+    except Exception as e:
+        logger.error(f"Rolling analysis error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/api/advanced/hypothesis-tests")
+async def run_hypothesis_tests(request: HypothesisTestRequest):
+    """t, Welch, Mann-Whitney, permutation, bootstrap and ANOVA tests across many groups and metrics"""
+    if any(len(values) != len(request.groups) for values in request.metrics.values()):
+        raise HTTPException(status_code=422, detail="Every metric needs one value per group label")
+    estimate = estimate_hypothesis_tests(
+        len(request.groups),
+        len(request.metrics),
+        len(set(request.groups)),
+        any(test in RESAMPLING_TESTS for test in request.config.get('tests', ())),
+        int(request.config.get('workers') or os.cpu_count() or 1)
+    )
+    try:
+        with memory_budget.reserve('hypothesis', estimate):
+            return await universal_analytics.hypothesis_tests(request.groups, request.metrics, request.config)
+    except MemoryBudgetExceeded as e:
+        raise memory_refusal(e)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
     except Exception as e:
-        logger.error(f"Summarization error: {str(e)}")
-        return {"error": f"Summarization failed: {str(e)}"}
+        logger.error(f"Hypothesis testing error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/api/advanced/series/{series_id}")
+async def append_series(series_id: str, request: SeriesAppendRequest):
+    """Append points to a series session and return its updated statistics and trend"""
+    try:
+        summary = series_sessions.append(series_id, request.values, request.x)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return {"series_id": series_id, **summary}
+
+@router.get("/api/advanced/series/{series_id}")
+async def get_series(series_id: str):
+    """Current statistics and trend of a series session"""
+    session = series_sessions.get(series_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail=f"Unknown or expired series '{series_id}'")
+    return {"series_id": series_id, **session.summary()}
+
+@router.delete("/api/advanced/series/{series_id}")
+async def delete_series(series_id: str):
+    """Discard a series session"""
+    if not series_sessions.delete(series_id):
+        raise HTTPException(status_code=404, detail=f"Unknown or expired series '{series_id}'")
+    return {"series_id": series_id, "deleted": True}
+
+@router.post("/api/advanced/batch-analyze")
+async def batch_analyze_time_series(request: BatchTimeSeriesRequest):
+    """Profile many time series in one vectorized pass"""
+    if request.series is None and (request.values is None or request.lengths is None):
+        raise HTTPException(status_code=422, detail="Provide either 'series' or both 'values' and 'lengths'")
+    if request.series is not None:
+        n_series = len(request.series)
+        width = max((len(row) for row in request.series), default=0)
+    else:
+        n_series = len(request.lengths)
+        width = max(request.lengths, default=0)
+    estimate = estimate_batch(n_series, width, bool(request.config.get('forecast', False)))
+    try:
+        with memory_budget.reserve('batch', estimate):
+            if request.series is not None:
+                return await universal_analytics.batch_time_series_analysis(request.series, request.config)
+            return await universal_analytics.batch_time_series_analysis(
+                request.values,
+                request.config,
+                lengths=request.lengths
+            )
+    except MemoryBudgetExceeded as e:
+        raise memory_refusal(e)
+    except Exception as e:
+        logger.error(f"Batch time series analysis error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/api/advanced/stream-statistics")
+async def stream_statistics(
+    file: UploadFile = File(...),
+    columns: Optional[str] = Form(None),
+    chunksize: int = Form(100_000),
+    workers: int = Form(0)
+):
+    """Compute column statistics from an uploaded CSV in chunks"""
+    config = {
+        'columns': [c.strip() for c in columns.split(',') if c.strip()] if columns else None,
+        'chunksize': chunksize,
+        'workers': workers
+    }
+    try:
+        return await universal_analytics.streaming_statistics(file.file, config)
+    except Exception as e:
+        logger.error(f"Streaming statistics error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/api/health")
+@router.get("/api/health")
 async def health_check():
     """Health check endpoint"""
     return {"status": "healthy", "timestamp": datetime.now().isoformat()}
 
+def create_app() -> FastAPI:
+    """Build the single app serving the analytics, industry, regression, sentiment and summarization routers"""
+    app = FastAPI(
+        title="Analytics Platform Backend",
+        on_shutdown=[series_sessions.checkpoint, covariance_streams.checkpoint, online_models.checkpoint]
+    )
+
+    # Added before CORS, so refusals carry CORS headers and preflights skip the lanes
+    if ADMISSION_CONTROL:
+        app.add_middleware(AdmissionMiddleware, controller=admission)
+
+    # Configure CORS
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],  # In production, replace with specific origins
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    # Before the routers, so their routes pick up the timed response class
+    install_metrics(app)
+
+    app.include_router(router)
+    app.include_router(industry_router)
+    app.include_router(regression_router, prefix="/api/regression")
+    app.include_router(sentiment_router)
+    app.include_router(summarize_router)
+    return app
+
+app = create_app()
+
 if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8002) 
\ No newline at end of file
+    # ANALYTICS_WORKERS > 1 forks workers after models and lexicons are loaded here
+    serve_prefork(
+        app,
+        host=os.getenv("ANALYTICS_HOST", "0.0.0.0"),
+        port=int(os.getenv("ANALYTICS_PORT", "8002")),
+        workers=int(os.getenv("ANALYTICS_WORKERS", "1"))
+    ) 
\ No newline at end of file
@@ -0,0 +1,82 @@
+import asyncio
+
+import pytest
+
+from api.admission import AdmissionController, AdmissionRefused, Lane, admission
+
+
+def test_timeout_racing_release_keeps_the_slot():
+    """A waiter cancelled by its timeout must not be granted the slot released before it resumes"""
+    async def scenario():
+        lane = Lane('standard', concurrency=1, queue_size=4, max_wait=30.0)
+        await lane.acquire('a')
+        waiter = asyncio.create_task(lane.acquire('b'))
+        await asyncio.sleep(0)
+        assert lane.queued == 1
+
+        # What wait_for does on timeout: cancel the future, resume the coroutine later.
+        # A release landing in between must skip the cancelled waiter.
+        lane._waiting['b'][0].cancel()
+        lane.release('a', 0.1)
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        assert (lane.active, lane.queued, lane._held) == (0, 0, {})
+        await asyncio.wait_for(lane.acquire('c'), 1.0)
+        assert lane.active == 1
+
+    asyncio.run(scenario())
+
+
+def test_timed_out_waiter_is_refused_and_forgotten():
+    async def scenario():
+        lane = Lane('heavy', concurrency=1, queue_size=4, max_wait=0.01)
+        await lane.acquire('a')
+        with pytest.raises(AdmissionRefused) as refused:
+            await lane.acquire('b')
+        assert refused.value.reason == 'timeout'
+        lane.release('a')
+        assert (lane.active, lane.queued, lane._held) == (0, 0, {})
+
+    asyncio.run(scenario())
+
+
+def test_release_hands_the_slot_to_the_next_live_waiter():
+    async def scenario():
+        lane = Lane('standard', concurrency=1, queue_size=4, max_wait=30.0)
+        await lane.acquire('a')
+        gone = asyncio.create_task(lane.acquire('b'))
+        live = asyncio.create_task(lane.acquire('c'))
+        await asyncio.sleep(0)
+
+        lane._waiting['b'][0].cancel()
+        lane.release('a')
+        await asyncio.wait_for(live, 1.0)
+        with pytest.raises(asyncio.CancelledError):
+            await gone
+
+        assert (lane.active, lane.queued, lane._held) == (1, 0, {'c': 1})
+
+    asyncio.run(scenario())
+
+
+@pytest.mark.parametrize('path, lane', [
+    ('/api/analyze', 'heavy'),
+    ('/api/advanced/analyze', 'heavy'),
+    ('/api/advanced/correlation', 'heavy'),
+    ('/api/detect-anomalies', 'standard'),
+    ('/api/industry/predict', 'standard'),
+    ('/analyze', 'interactive'),  # sentiment
+    ('/api/advanced/series/abc', 'interactive'),
+])
+def test_default_routes_map_to_their_lanes(path, lane):
+    assert admission.classify(path).name == lane
+
+
+def test_large_bodies_move_one_lane_heavier():
+    controller = AdmissionController(
+        {name: Lane(name, 1, 1, 1.0) for name in ('interactive', 'standard', 'heavy')},
+        large_body_bytes=1024
+    )
+    assert controller.classify('/analyze', 4096).name == 'standard'
+    assert controller.classify('/api/analyze', 4096).name == 'heavy'
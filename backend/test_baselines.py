@@ -0,0 +1,75 @@
+import pickle
+
+import numpy as np
+
+from api.baselines import MIN_DRIFT_POINTS, AnomalyBaseline, BaselineStore
+from api.prefork import WORKER_ID_ENV
+
+
+def reference(n=500, seed=0):
+    return np.random.default_rng(seed).normal(size=n)
+
+
+def test_remember_keeps_the_last_reference_size_values():
+    baseline = AnomalyBaseline(reference(60))
+    stream = np.random.default_rng(1).normal(loc=3.0, size=500)
+    end = 0
+    for batch in np.split(stream, [7, 8, 8, 70, 200, 260, 499]):
+        baseline.remember(batch)
+        end += batch.size
+        expected = stream[max(end - 60, 0):end]
+        np.testing.assert_array_equal(baseline.recent, expected)
+        assert baseline.recent_size == expected.size
+        np.testing.assert_array_equal(
+            baseline.recent_counts,
+            np.bincount(baseline._bins(expected), minlength=baseline.recent_counts.size)
+        )
+    assert baseline.scored == 500
+
+
+def test_drift_and_refit_use_the_recent_values():
+    baseline = AnomalyBaseline(reference(), drift_threshold=0.25)
+    baseline.remember(np.random.default_rng(2).normal(size=MIN_DRIFT_POINTS))
+    assert baseline.drift() < 0.25
+    shifted = np.random.default_rng(3).normal(loc=4.0, size=500)
+    baseline.remember(shifted)
+    assert baseline.refresh_reason() == 'drift'
+    refitted = baseline.refitted()
+    np.testing.assert_allclose(refitted.mean, shifted.mean())
+
+
+def test_baselines_pickled_with_a_plain_recent_array_still_load():
+    baseline = AnomalyBaseline(reference(100))
+    state = dict(baseline.__dict__)
+    for name in ('_ring', '_write', 'recent_size'):
+        state.pop(name)
+    state['recent'] = np.arange(30.0)
+    old = AnomalyBaseline.__new__(AnomalyBaseline)
+    old.__setstate__(state)
+
+    restored = pickle.loads(pickle.dumps(old))
+    restored.remember(np.arange(30.0, 100.0))
+    np.testing.assert_array_equal(restored.recent, np.arange(100.0))
+    restored.remember([100.0])
+    np.testing.assert_array_equal(restored.recent, np.arange(1.0, 101.0))
+
+
+def test_checkpoint_round_trip_across_workers(tmp_path, monkeypatch):
+    monkeypatch.setenv(WORKER_ID_ENV, '0')
+    first = BaselineStore(checkpoint_dir=str(tmp_path))
+    fitted = first.fit('sensor/1', reference(), {'contamination': 0.05})
+
+    # Another worker picks the file up on its next read
+    monkeypatch.setenv(WORKER_ID_ENV, '1')
+    second = BaselineStore(checkpoint_dir=str(tmp_path))
+    loaded = second.get('sensor/1')
+    assert loaded.summary()['mean'] == fitted.mean
+    assert loaded.contamination == 0.05
+    values = np.linspace(-5.0, 5.0, 11)
+    for name, scores in first.score('sensor/1', values).items():
+        np.testing.assert_array_equal(second.score('sensor/1', values)[name], scores)
+
+    restarted = BaselineStore(checkpoint_dir=str(tmp_path))
+    restarted.load_all()
+    assert list(restarted.baselines) == ['sensor/1']
+    assert not [name for name in tmp_path.iterdir() if name.suffix == '.tmp']
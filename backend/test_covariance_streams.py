@@ -0,0 +1,58 @@
+import numpy as np
+
+from api.covariance_streams import CovarianceStreamStore
+from api.prefork import WORKER_ID_ENV
+
+COLUMNS = ['a', 'b', 'c']
+
+
+def rows(n, seed):
+    rng = np.random.default_rng(seed)
+    return rng.normal(size=(n, 3)) @ np.array([[1.0, 0.5, 0.0], [0.0, 1.0, 0.3], [0.0, 0.0, 1.0]]) + 100.0
+
+
+def test_workers_merge_into_the_full_covariance(tmp_path, monkeypatch):
+    first_rows, second_rows = rows(200, 0), rows(150, 1)
+    monkeypatch.setenv(WORKER_ID_ENV, '0')
+    first = CovarianceStreamStore(checkpoint_dir=str(tmp_path))
+    first.update('s', COLUMNS, first_rows.tolist())
+    first.checkpoint()
+
+    monkeypatch.setenv(WORKER_ID_ENV, '1')
+    second = CovarianceStreamStore(checkpoint_dir=str(tmp_path))
+    # Columns in another order are aligned by name
+    second.update('s', ['c', 'a', 'b'], second_rows[:, [2, 0, 1]].tolist())
+
+    merged = second.view('s')
+    everything = np.vstack([first_rows, second_rows])[:, [COLUMNS.index(c) for c in merged.columns]]
+    assert merged.columns == ['c', 'a', 'b']
+    assert merged.moments.count == len(everything)
+    np.testing.assert_allclose(merged.moments.mean, everything.mean(axis=0))
+    np.testing.assert_allclose(merged.moments.covariance(), np.cov(everything, rowvar=False), rtol=1e-10)
+
+
+def test_restarted_worker_resumes_only_its_slot(tmp_path, monkeypatch):
+    for slot, seed in (('0', 0), ('1', 1)):
+        monkeypatch.setenv(WORKER_ID_ENV, slot)
+        store = CovarianceStreamStore(checkpoint_dir=str(tmp_path))
+        store.update('s', COLUMNS, rows(100, seed).tolist())
+        store.checkpoint()
+
+    monkeypatch.setenv(WORKER_ID_ENV, '1')
+    restarted = CovarianceStreamStore(checkpoint_dir=str(tmp_path))
+    assert restarted.partial('s').moments.count == 100
+    np.testing.assert_allclose(restarted.partial('s').moments.mean, rows(100, 1).mean(axis=0))
+    assert restarted.view('s').moments.count == 200
+
+
+def test_stream_ids_with_similar_names_do_not_collide(tmp_path, monkeypatch):
+    monkeypatch.setenv(WORKER_ID_ENV, '0')
+    store = CovarianceStreamStore(checkpoint_dir=str(tmp_path))
+    for seed, stream_id in enumerate(['a/b', 'a.b', 'a_b']):
+        store.update(stream_id, COLUMNS, rows(50 + seed, seed).tolist())
+    store.checkpoint()
+    assert len(list(tmp_path.iterdir())) == 3
+
+    restored = CovarianceStreamStore(checkpoint_dir=str(tmp_path))
+    assert [restored.partial(i).moments.count for i in ['a/b', 'a.b', 'a_b']] == [50, 51, 52]
+    assert [restored.view(i).moments.count for i in ['a/b', 'a.b', 'a_b']] == [50, 51, 52]
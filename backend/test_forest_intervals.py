@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from api.forest_intervals import ForestCache, ForestIntervals
+
+
+def regression_data(n=400, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.uniform(-3, 3, size=(n, 2))
+    return X, np.sin(X[:, 0]) + 0.5 * X[:, 1] + rng.normal(scale=0.3, size=n)
+
+
+def test_stacked_predictions_match_the_forest():
+    X, y = regression_data()
+    intervals = ForestIntervals.fit(X, y, n_estimators=30, random_state=0)
+    per_tree = intervals.tree_predictions(X[:50])
+
+    assert per_tree.shape == (30, 50)
+    for tree, predictions in zip(intervals.forest.estimators_, per_tree):
+        np.testing.assert_allclose(predictions, tree.predict(X[:50]), rtol=1e-12)
+    result = intervals.predict(X[:50])
+    np.testing.assert_allclose(result['predictions'], intervals.forest.predict(X[:50]), rtol=1e-12)
+
+
+def test_conformal_intervals_cover_new_points():
+    X, y = regression_data(1000)
+    intervals = ForestIntervals.fit(X[:600], y[:600], n_estimators=50, random_state=0)
+    result = intervals.predict(X[600:], confidence=0.9)
+
+    assert result['method'] == 'conformal'
+    assert result['calibration_size'] == 600
+    covered = np.mean((result['lower'] <= y[600:]) & (y[600:] <= result['upper']))
+    assert 0.85 <= covered <= 0.97
+
+
+def test_quantile_intervals_come_from_the_trees():
+    X, y = regression_data()
+    intervals = ForestIntervals.fit(X, y, n_estimators=40, random_state=0)
+    result = intervals.predict(X[:20], confidence=0.8, method='quantile')
+    expected = np.quantile(intervals.tree_predictions(X[:20]), [0.1, 0.9], axis=0)
+    np.testing.assert_allclose(result['lower'], expected[0])
+    np.testing.assert_allclose(result['upper'], expected[1])
+
+    with pytest.raises(ValueError):
+        intervals.predict(X[:20], method='bayesian')
+
+
+def test_cache_reuses_fitted_forests_and_evicts_past_its_budget():
+    values = np.random.default_rng(1).normal(size=60)
+    cache = ForestCache()
+    first = cache.fit(values, n_estimators=30)
+    assert cache.fit(values.copy(), n_estimators=30) is first
+    assert cache.fit(values, n_estimators=31) is not first
+
+    small = ForestCache(max_bytes=int(first.nbytes * 1.5))
+    small.fit(values, n_estimators=30)
+    small.fit(values + 1.0, n_estimators=30)
+    assert len(small) == 1
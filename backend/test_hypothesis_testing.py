@@ -0,0 +1,98 @@
+import numpy as np
+import pytest
+from scipy import stats
+from statsmodels.stats.multitest import multipletests
+from statsmodels.stats.weightstats import ttest_ind as sm_ttest_ind
+
+from api.hypothesis_testing import adjust_p_values, hypothesis_tests
+
+
+def dataset(seed=0):
+    rng = np.random.default_rng(seed)
+    sizes = {'a': 40, 'b': 55, 'c': 30}
+    shifts = {'a': 0.0, 'b': 0.4, 'c': 1.0}
+    labels = [group for group, n in sizes.items() for _ in range(n)]
+    revenue = np.concatenate([rng.normal(shifts[g], 1.0 + 0.5 * (g == 'c'), n) for g, n in sizes.items()])
+    visits = np.concatenate([rng.poisson(5 + 2 * shifts[g], n).astype(float) for g, n in sizes.items()])
+    revenue[[3, 50, 100]] = np.nan
+    labels = np.array(labels)
+    return labels, {'revenue': revenue, 'visits': visits}
+
+
+def as_payload(metrics):
+    return {name: [None if np.isnan(v) else float(v) for v in values] for name, values in metrics.items()}
+
+
+def sample(labels, metrics, metric, group):
+    values = metrics[metric][labels == group]
+    return values[~np.isnan(values)]
+
+
+def rows_for(results, test):
+    return {(row['metric'], row['group_a'], row['group_b']): row for row in results['tests'][test]}
+
+
+def test_parametric_and_rank_tests_match_scipy():
+    labels, metrics = dataset()
+    results = hypothesis_tests(labels.tolist(), as_payload(metrics), {'correction': 'none'})
+
+    for test in ('t_test', 'welch', 'mann_whitney'):
+        for (metric, group_a, group_b), row in rows_for(results, test).items():
+            a, b = sample(labels, metrics, metric, group_a), sample(labels, metrics, metric, group_b)
+            if test == 'mann_whitney':
+                expected = stats.mannwhitneyu(a, b)
+            else:
+                expected = stats.ttest_ind(a, b, equal_var=test == 't_test')
+            np.testing.assert_allclose(row['statistic'], expected.statistic, rtol=1e-9)
+            np.testing.assert_allclose(row['p_value'], expected.pvalue, rtol=1e-9)
+
+
+def test_welch_degrees_of_freedom_match_statsmodels():
+    labels, metrics = dataset()
+    results = hypothesis_tests(labels.tolist(), as_payload(metrics), {'tests': ['welch']})
+    for (metric, group_a, group_b), row in rows_for(results, 'welch').items():
+        a, b = sample(labels, metrics, metric, group_a), sample(labels, metrics, metric, group_b)
+        statistic, _, df = sm_ttest_ind(a, b, usevar='unequal')
+        np.testing.assert_allclose(row['statistic'], statistic, rtol=1e-9)
+        np.testing.assert_allclose(row['df'], df, rtol=1e-9)
+
+
+def test_anova_matches_f_oneway():
+    labels, metrics = dataset()
+    results = hypothesis_tests(labels.tolist(), as_payload(metrics), {'tests': ['anova']})
+    for row in results['tests']['anova']:
+        expected = stats.f_oneway(*[sample(labels, metrics, row['metric'], g) for g in ('a', 'b', 'c')])
+        np.testing.assert_allclose(row['statistic'], expected.statistic, rtol=1e-9)
+        np.testing.assert_allclose(row['p_value'], expected.pvalue, rtol=1e-9)
+
+
+@pytest.mark.parametrize('method', ['holm', 'bonferroni', 'fdr_bh', 'fdr_by'])
+def test_corrections_match_statsmodels(method):
+    p_values = np.random.default_rng(1).uniform(size=40) ** 3
+    p_values[[5, 17]] = np.nan
+    adjusted = adjust_p_values(p_values, method)
+    valid = ~np.isnan(p_values)
+    np.testing.assert_allclose(adjusted[valid], multipletests(p_values[valid], method=method)[1], rtol=1e-12)
+    assert np.isnan(adjusted[~valid]).all()
+
+
+def test_permutation_p_values_agree_with_scipy():
+    labels, metrics = dataset()
+    config = {'tests': ['permutation'], 'n_resamples': 4000, 'correction': 'none', 'control': 'a'}
+    results = hypothesis_tests(labels.tolist(), as_payload(metrics), config)
+    for (metric, group_a, group_b), row in rows_for(results, 'permutation').items():
+        a, b = sample(labels, metrics, metric, group_a), sample(labels, metrics, metric, group_b)
+        expected = stats.permutation_test(
+            (a, b), lambda x, y: x.mean() - y.mean(), n_resamples=4000, random_state=0
+        ).pvalue
+        # Both are Monte Carlo estimates; allow a few standard errors
+        assert abs(row['p_value'] - expected) <= 4 * np.sqrt(max(expected, 1e-3) / 4000) + 1e-3
+
+
+def test_resampling_is_reproducible_and_the_interval_covers_the_difference():
+    labels, metrics = dataset()
+    config = {'tests': ['bootstrap'], 'n_resamples': 2000, 'seed': 7, 'control': 'a'}
+    first = hypothesis_tests(labels.tolist(), as_payload(metrics), config)
+    assert first == hypothesis_tests(labels.tolist(), as_payload(metrics), config)
+    for row in first['tests']['bootstrap']:
+        assert row['ci_low'] <= row['mean_difference'] <= row['ci_high']
@@ -0,0 +1,110 @@
+import numpy as np
+
+from api.online_models import OnlineModelRegistry
+from api.prefork import WORKER_ID_ENV
+
+DAY = 86400.0
+
+
+def observations(n, start=0, offset=0.0):
+    timestamps = (start + np.arange(n)) * DAY
+    return timestamps.tolist(), (offset + np.sin(np.arange(start, start + n) / 3.0)).tolist()
+
+
+def test_checkpoint_round_trip(tmp_path, monkeypatch):
+    monkeypatch.setenv(WORKER_ID_ENV, '0')
+    registry = OnlineModelRegistry(checkpoint_dir=str(tmp_path))
+    timestamps, values = observations(40)
+    registry.update('retail', ['sales'] * 40, timestamps, values)
+    registry.checkpoint()
+
+    restored = OnlineModelRegistry(checkpoint_dir=str(tmp_path))
+    original, copy = registry.get('retail', 'sales'), restored.get('retail', 'sales')
+    assert copy.summary() == original.summary()
+    np.testing.assert_allclose(copy.forecast(5)['predictions'], original.forecast(5)['predictions'])
+
+
+def test_industries_with_similar_names_do_not_collide(tmp_path, monkeypatch):
+    monkeypatch.setenv(WORKER_ID_ENV, '0')
+    registry = OnlineModelRegistry(checkpoint_dir=str(tmp_path))
+    for offset, industry in enumerate(['a/b', 'a.b', 'a_b']):
+        registry.update(industry, ['m'] * 20, *observations(20, offset=10.0 * offset))
+    registry.checkpoint()
+
+    restored = OnlineModelRegistry(checkpoint_dir=str(tmp_path))
+    means = [restored.get(industry, 'm').summary()['mean'] for industry in ['a/b', 'a.b', 'a_b']]
+    np.testing.assert_allclose(means, [registry.get(i, 'm').summary()['mean'] for i in ['a/b', 'a.b', 'a_b']])
+    assert len(set(np.round(means))) == 3
+
+
+def test_workers_write_their_own_slots_and_the_newest_model_wins(tmp_path, monkeypatch):
+    monkeypatch.setenv(WORKER_ID_ENV, '0')
+    first = OnlineModelRegistry(checkpoint_dir=str(tmp_path))
+    first.update('retail', ['sales'] * 30, *observations(30))
+    first.checkpoint()
+
+    # A second worker starts from the same checkpoint and keeps learning
+    monkeypatch.setenv(WORKER_ID_ENV, '1')
+    second = OnlineModelRegistry(checkpoint_dir=str(tmp_path))
+    second.update('retail', ['sales'] * 30, *observations(30, start=30))
+    second.checkpoint()
+    # The first worker checkpoints again with older state; it must not replace the second's file
+    monkeypatch.setenv(WORKER_ID_ENV, '0')
+    first._dirty['retail'] += 1
+    first.checkpoint()
+
+    assert len([name for name in tmp_path.iterdir() if name.suffix == '.joblib']) == 2
+    assert not [name for name in tmp_path.iterdir() if name.suffix == '.tmp']
+    restored = OnlineModelRegistry(checkpoint_dir=str(tmp_path))
+    assert restored.get('retail', 'sales').n_samples == 60
+
+
+def test_categories_are_separate_series():
+    registry = OnlineModelRegistry()
+    timestamps = np.repeat(np.arange(30) * DAY, 2)
+    values = np.tile([10.0, 1000.0], 30) + np.repeat(np.arange(30.0), 2)
+    categories = ['east', 'west'] * 30
+    used = registry.update('retail', ['sales'] * 60, timestamps, values, categories=categories)
+
+    assert used == {('sales', 'east'): 30, ('sales', 'west'): 30}
+    assert registry.get('retail', 'sales') is None
+    east, west = registry.get('retail', 'sales', 'east'), registry.get('retail', 'sales', 'west')
+    assert east.history == [37.0, 38.0, 39.0]
+    assert west.history == [1027.0, 1028.0, 1029.0]
+
+
+def test_checkpoints_keyed_by_metric_alone_still_load(tmp_path):
+    import joblib
+
+    registry = OnlineModelRegistry()
+    registry.update('retail', ['sales'] * 20, *observations(20))
+    joblib.dump({'industry': 'retail', 'models': {'sales': registry.get('retail', 'sales')}}, tmp_path / 'retail.joblib')
+
+    restored = OnlineModelRegistry(checkpoint_dir=str(tmp_path))
+    assert restored.get('retail', 'sales').n_samples == 20
+
+
+def test_industry_routes_learn_and_forecast_per_category():
+    from datetime import datetime, timedelta, timezone
+
+    from fastapi.testclient import TestClient
+    from main import create_app
+
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    points = [
+        {'timestamp': (start + timedelta(days=day)).isoformat(), 'value': base + day, 'metric': 'orders', 'category': region}
+        for day in range(30) for region, base in (('north', 5.0), ('south', 500.0))
+    ]
+    client = TestClient(create_app())
+    industry = 'test-industry-per-category'
+    assert client.post('/api/industry/analyze', json={'data': points, 'industry': industry, 'analysis_type': 'trend'}).status_code == 200
+
+    response = client.post('/api/industry/analyze', json={'data': points[:2], 'industry': industry, 'analysis_type': 'trend'})
+    assert set(response.json()['models']) == {'orders (north)', 'orders (south)'}
+    forecasts = {
+        region: client.post('/api/industry/predict', json={
+            'horizon': 1, 'confidence': 0.9, 'industry': industry, 'metric': 'orders', 'category': region
+        }).json()['predictions'][0]
+        for region in ('north', 'south')
+    }
+    assert forecasts['north'] < 100 < forecasts['south']
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from api.regression_analyzer import RegressionAnalysisService
+from api.regression_engine import LeastSquaresEngine, least_squares_fit, polynomial_path
+
+
+def quadratic(n=200, seed=0):
+    rng = np.random.default_rng(seed)
+    x = np.linspace(-3.0, 3.0, n)
+    return x, 1.0 + 2.0 * x - 0.5 * x ** 2 + rng.normal(scale=0.5, size=n)
+
+
+def test_engine_matches_lstsq():
+    rng = np.random.default_rng(1)
+    X = rng.normal(size=(120, 4))
+    y = X @ np.array([1.5, -2.0, 0.0, 0.3]) + 4.0 + rng.normal(size=120)
+    design = np.column_stack([np.ones(120), X])
+    expected, residual, _, _ = np.linalg.lstsq(design, y, rcond=None)
+
+    engine = LeastSquaresEngine(y, capacity=2)  # forces the capacity to grow
+    for column in design.T:
+        assert engine.add_column(column)
+    np.testing.assert_allclose(engine.coefficients, expected, rtol=1e-10, atol=1e-12)
+    np.testing.assert_allclose(engine.rss, residual[0], rtol=1e-10)
+
+    fit = least_squares_fit(list(X.T), y)
+    np.testing.assert_allclose(fit['intercept'], expected[0], rtol=1e-10)
+    np.testing.assert_allclose(fit['coefficients'], expected[1:], rtol=1e-10, atol=1e-12)
+
+
+def test_collinear_columns_get_a_zero_coefficient():
+    rng = np.random.default_rng(2)
+    x = rng.normal(size=50)
+    y = 3.0 * x + 1.0
+    fit = least_squares_fit([x, 2.0 * x], y)
+    np.testing.assert_allclose(fit['coefficients'], [3.0, 0.0], atol=1e-10)
+    np.testing.assert_allclose(fit['intercept'], 1.0, atol=1e-10)
+
+
+def test_polynomial_path_matches_polyfit():
+    x, y = quadratic()
+    for fit in polynomial_path(x, y, 5):
+        coefficients = np.polyfit(x, y, fit['degree'])
+        residuals = y - np.polyval(coefficients, x)
+        np.testing.assert_allclose(fit['rss'], residuals @ residuals, rtol=1e-8)
+        assert fit['parameters'] == fit['degree'] + 1
+
+
+def test_degree_selection_defaults_to_r2():
+    x, y = quadratic()
+    results = RegressionAnalysisService().analyze_polynomial_regression(x.tolist(), y.tolist(), degree=5)
+    r2 = [fit['r2_score'] for fit in results['model_comparison']]
+    assert results['criterion'] == 'r2'
+    assert results['best_degree'] == results['degree_by_criterion']['r2'] == int(np.argmax(r2)) + 1
+    assert results['degree_by_criterion']['bic'] == 2
+
+
+def test_bic_criterion_picks_the_true_degree():
+    x, y = quadratic()
+    results = RegressionAnalysisService().analyze_polynomial_regression(x.tolist(), y.tolist(), degree=5, criterion='bic')
+    assert results['criterion'] == 'bic'
+    assert results['best_degree'] == results['degree'] == 2
+    np.testing.assert_allclose([results['intercept']] + results['coefficients'], [1.0, 2.0, -0.5], atol=0.2)
+
+
+def test_unknown_criterion_is_rejected():
+    x, y = quadratic(20)
+    with pytest.raises(ValueError):
+        RegressionAnalysisService().analyze_polynomial_regression(x.tolist(), y.tolist(), criterion='aic')
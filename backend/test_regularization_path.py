@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+from sklearn.linear_model import Lasso, LassoCV, Ridge, RidgeCV
+from sklearn.model_selection import KFold, cross_val_score
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+
+from api.regularization_path import fit_regularization_path
+
+CASES = [('lasso', Lasso, LassoCV), ('ridge', Ridge, RidgeCV)]
+
+
+def sparse_problem(n=80, features=20, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(loc=5.0, scale=3.0, size=(n, features))
+    beta = np.zeros(features)
+    beta[:3] = [1.5, -1.0, 0.5]
+    return X, X @ beta + 2.0 + rng.normal(0, 2, n)
+
+
+@pytest.mark.parametrize('model_type, estimator, _', CASES)
+def test_cv_curve_matches_per_fold_pipelines(model_type, estimator, _):
+    X, y = sparse_problem()
+    result = fit_regularization_path(X, y, model_type, cv=5, random_state=0)
+    path = result['paths'][0]
+    folds = KFold(n_splits=5, shuffle=True, random_state=0)
+    expected = [
+        -cross_val_score(
+            make_pipeline(StandardScaler(), estimator(alpha=alpha)), X, y,
+            cv=folds, scoring='neg_mean_squared_error'
+        ).mean()
+        for alpha in path['alphas']
+    ]
+    np.testing.assert_allclose(path['cv_mse'], expected, rtol=1e-4)
+
+
+@pytest.mark.parametrize('model_type, _, cv_estimator', CASES)
+def test_best_alpha_agrees_with_sklearn_cv(model_type, _, cv_estimator):
+    X, y = sparse_problem()
+    result = fit_regularization_path(X, y, model_type, cv=5, random_state=0)
+    grid = np.asarray(result['paths'][0]['alphas'])
+    # The *CV estimators standardize once up front, the path standardizes inside each fold
+    reference = cv_estimator(alphas=grid, cv=KFold(n_splits=5, shuffle=True, random_state=0))
+    reference.fit(StandardScaler().fit_transform(X), y)
+    chosen = int(np.flatnonzero(grid == result['best']['alpha'])[0])
+    assert abs(chosen - int(np.argmin(np.abs(grid - reference.alpha_)))) <= 1
+
+
+@pytest.mark.parametrize('model_type, estimator, _', CASES)
+def test_best_coefficients_are_in_original_units(model_type, estimator, _):
+    X, y = sparse_problem()
+    result = fit_regularization_path(X, y, model_type, cv=5, random_state=0)
+    refit = make_pipeline(StandardScaler(), estimator(alpha=result['best']['alpha'])).fit(X, y)
+    scaler, model = refit[0], refit[-1]
+    np.testing.assert_allclose(result['best']['coefficients'], model.coef_ / scaler.scale_, atol=1e-4)
+    np.testing.assert_allclose(result['predictions'], refit.predict(X), atol=1e-3)
+
+
+def test_elastic_net_searches_every_l1_ratio():
+    X, y = sparse_problem()
+    result = fit_regularization_path(X, y, 'elastic_net', l1_ratios=[0.2, 0.8], cv=5, random_state=0)
+    assert [path['l1_ratio'] for path in result['paths']] == [0.2, 0.8]
+    best = min(
+        (mse, path['l1_ratio']) for path in result['paths'] for mse in path['cv_mse']
+    )
+    assert (result['best']['cv_mse'], result['best']['l1_ratio']) == best
+
+
+def test_rejects_unsupported_models():
+    X, y = sparse_problem()
+    with pytest.raises(ValueError):
+        fit_regularization_path(X, y, 'linear')
+
+
+def test_path_mode_is_served_by_the_app():
+    from fastapi.testclient import TestClient
+    from main import create_app
+
+    X, y = sparse_problem()
+    response = TestClient(create_app()).post('/api/regression/analyze', json={
+        'X': X.T.tolist(), 'y': y.tolist(), 'model_type': 'lasso', 'path': True, 'random_state': 0
+    })
+    assert response.status_code == 200
+    expected = fit_regularization_path(X, y, 'lasso', cv=5, random_state=0)
+    assert response.json()['best']['alpha'] == expected['best']['alpha']
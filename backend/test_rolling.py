@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from api import rolling
+from api.rolling import rolling_analysis, rolling_moments
+
+
+def series(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return 1e6 + np.cumsum(rng.normal(size=n)) + 0.01 * np.arange(n)
+
+
+@pytest.mark.parametrize('block, window', [(4096, 30), (64, 30), (64, 64), (16, 50)])
+def test_moments_match_pandas(monkeypatch, block, window):
+    monkeypatch.setattr(rolling, 'ROLLING_BLOCK', block)
+    values = series(1000)
+    moments = rolling_moments(values, window)
+    roll = pd.Series(values).rolling(window, min_periods=1)
+
+    np.testing.assert_array_equal(moments['count'], roll.count().to_numpy())
+    np.testing.assert_allclose(moments['mean'], roll.mean().to_numpy(), rtol=1e-12)
+    np.testing.assert_allclose(moments['std'], roll.std(ddof=0).fillna(0.0).to_numpy(), rtol=1e-6, atol=1e-7)
+
+
+@pytest.mark.parametrize('block', [4096, 16])
+def test_slope_matches_polyfit(monkeypatch, block):
+    monkeypatch.setattr(rolling, 'ROLLING_BLOCK', block)
+    values, window = series(300, seed=1), 25
+    slope = rolling_moments(values, window)['slope']
+
+    assert np.isnan(slope[0])
+    for last in range(1, values.size):
+        y = values[max(last - window + 1, 0):last + 1]
+        np.testing.assert_allclose(slope[last], np.polyfit(np.arange(y.size), y, 1)[0], rtol=1e-6, atol=1e-8)
+
+
+def test_analysis_steps_and_quantiles():
+    values = series(200, seed=2)
+    results = rolling_analysis(values, {'window': 20, 'step': 5, 'quantiles': [0.1, 0.5]})
+    roll = pd.Series(values).rolling(20)
+
+    assert results['index'] == list(range(19, 200, 5))
+    np.testing.assert_allclose(results['min'], roll.min().to_numpy()[19::5])
+    np.testing.assert_allclose(results['max'], roll.max().to_numpy()[19::5])
+    np.testing.assert_allclose(results['quantiles']['0.5'], roll.median().to_numpy()[19::5])
+    np.testing.assert_allclose(results['quantiles']['0.1'], roll.quantile(0.1).to_numpy()[19::5])
+
+
+def test_invalid_windows_are_rejected():
+    with pytest.raises(ValueError):
+        rolling_analysis([1.0, 2.0, 3.0], {'window': 5})
+    with pytest.raises(ValueError):
+        rolling_analysis([1.0, 2.0, 3.0], {'window': 2, 'min_periods': 3})
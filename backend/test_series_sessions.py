@@ -0,0 +1,45 @@
+import numpy as np
+from scipy import stats
+
+from api.prefork import WORKER_ID_ENV
+from api.series_sessions import SeriesSessionStore
+
+
+def test_appends_match_the_whole_series():
+    rng = np.random.default_rng(0)
+    values = 1e6 + rng.normal(size=500)
+    store = SeriesSessionStore()
+    for batch in np.array_split(values, 7):
+        summary = store.append('s', batch.tolist())
+
+    expected = stats.linregress(np.arange(values.size), values)
+    assert summary['count'] == values.size
+    np.testing.assert_allclose(summary['statistics']['mean'], values.mean())
+    np.testing.assert_allclose(summary['statistics']['std'], values.std(), rtol=1e-9)
+    np.testing.assert_allclose(summary['trend']['slope'], expected.slope, rtol=1e-9, atol=1e-12)
+    np.testing.assert_allclose(summary['trend']['p_value'], expected.pvalue, rtol=1e-6)
+
+
+def test_checkpoint_round_trip(tmp_path, monkeypatch):
+    monkeypatch.setenv(WORKER_ID_ENV, '0')
+    store = SeriesSessionStore(checkpoint_dir=str(tmp_path))
+    before = store.append('s', [1.0, 2.0, 4.0, 8.0])
+    store.checkpoint()
+
+    restored = SeriesSessionStore(checkpoint_dir=str(tmp_path))
+    assert restored.get('s').summary() == before
+
+
+def test_workers_keep_their_own_checkpoints(tmp_path, monkeypatch):
+    for slot in ('0', '1'):
+        monkeypatch.setenv(WORKER_ID_ENV, slot)
+        store = SeriesSessionStore(checkpoint_dir=str(tmp_path))
+        store.append(f'series-{slot}', [1.0, 2.0, 3.0])
+        store.checkpoint()
+
+    for slot, other in (('0', '1'), ('1', '0')):
+        monkeypatch.setenv(WORKER_ID_ENV, slot)
+        restored = SeriesSessionStore(checkpoint_dir=str(tmp_path))
+        assert restored.get(f'series-{slot}') is not None
+        assert restored.get(f'series-{other}') is None
+    assert not [name for name in tmp_path.iterdir() if name.suffix == '.tmp']
@@ -0,0 +1,69 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from api.shared_arrays import ALIGNMENT, SharedArena, attached, ensure_tracker, frame_view, live_segments
+
+
+def double_into(source, target):
+    with attached(source, target) as (values, out):
+        out[...] = 2 * values
+
+
+def test_put_many_packs_aligned_arrays_in_one_segment():
+    arrays = [np.arange(5.0), np.arange(7, dtype=np.int32), np.ones((3, 4), dtype=np.float32)]
+    with SharedArena() as arena:
+        handles = arena.put_many(arrays)
+        assert len({handle.segment for handle in handles}) == 1
+        assert all(handle.offset % ALIGNMENT == 0 for handle in handles)
+        with attached(*handles) as views:
+            for view, array in zip(views, arrays):
+                assert view.dtype == array.dtype
+                np.testing.assert_array_equal(view, array)
+
+
+def test_release_unlinks_every_segment():
+    before = live_segments()
+    arena = SharedArena()
+    handle = arena.put(np.arange(10.0))
+    arena.empty((2, 3))
+    assert live_segments() == before + 2
+
+    arena.release()
+    assert live_segments() == before
+    with pytest.raises(FileNotFoundError):
+        with attached(handle):
+            pass
+
+
+def test_release_while_a_view_is_held():
+    arena = SharedArena()
+    _, view = arena.empty((4,))
+    view[...] = 1.0
+    arena.release()
+    # The mapping stays valid until the last view is gone
+    assert view.sum() == 4.0
+    del view
+
+
+def test_workers_write_into_preallocated_outputs():
+    ensure_tracker()
+    values = np.random.default_rng(0).normal(size=(3, 1000))
+    with SharedArena() as arena:
+        source = arena.put(values)
+        target, result = arena.empty(values.shape)
+        with ProcessPoolExecutor(1, mp_context=multiprocessing.get_context('fork')) as pool:
+            pool.submit(double_into, source, target).result()
+        np.testing.assert_array_equal(result, 2 * values)
+
+
+def test_frame_round_trip():
+    frame = pd.DataFrame({'a': [1.0, 2.0, 3.0], 'b': [4, 5, 6]})
+    with SharedArena() as arena:
+        shared = arena.put_frame(frame)
+        with attached(shared.values) as (values,):
+            view = frame_view(shared, values)
+            pd.testing.assert_frame_equal(view, frame.astype(float))
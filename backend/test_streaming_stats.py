@@ -0,0 +1,86 @@
+import io
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from api.descriptive_stats import Moments
+from api.streaming_stats import HyperLogLog, StreamingStatistics, TDigest, stream_csv_statistics
+
+
+def test_moments_merge_matches_a_single_pass():
+    rng = np.random.default_rng(0)
+    values = 1e4 + rng.gamma(2.0, size=5000)
+    merged = Moments()
+    for part in np.array_split(values, [10, 11, 900, 3000]):
+        merged = merged.merge(Moments.from_values(part))
+    summary = merged.to_statistics()
+
+    assert summary['count'] == values.size
+    np.testing.assert_allclose(summary['mean'], values.mean(), rtol=1e-12)
+    np.testing.assert_allclose(summary['std'], values.std(), rtol=1e-9)
+    np.testing.assert_allclose(summary['skewness'], stats.skew(values), rtol=1e-6)
+    np.testing.assert_allclose(summary['kurtosis'], stats.kurtosis(values), rtol=1e-6)
+    assert (summary['min'], summary['max']) == (values.min(), values.max())
+
+
+def test_tdigest_quantiles_stay_within_rank_error():
+    rng = np.random.default_rng(1)
+    values = rng.lognormal(size=100_000)
+    digest = TDigest()
+    for part in np.array_split(values, 13):
+        partial = TDigest()
+        partial.update(part)
+        digest = digest.merge(partial)
+    estimated = digest.quantiles([0.001, 0.01, 0.25, 0.5, 0.75, 0.99, 0.999])
+
+    ordered = np.sort(values)
+    for q, value in estimated.items():
+        rank = np.searchsorted(ordered, value) / values.size
+        # The arcsine scale function keeps tail centroids small
+        assert abs(rank - q) <= max(0.002, 0.05 * min(q, 1 - q)), (q, rank)
+
+
+def test_tdigest_merge_is_order_free():
+    rng = np.random.default_rng(2)
+    left, right = TDigest(), TDigest()
+    left.update(rng.normal(size=20_000))
+    right.update(rng.normal(loc=5.0, size=20_000))
+    a, b = left.merge(right).quantiles([0.1, 0.5, 0.9]), right.merge(left).quantiles([0.1, 0.5, 0.9])
+    np.testing.assert_allclose(list(a.values()), list(b.values()))
+
+
+def test_hyperloglog_count_within_standard_error():
+    sketch, other = HyperLogLog(), HyperLogLog()
+    values = np.arange(200_000, dtype=float) * 0.5
+    sketch.update(values[:150_000])
+    other.update(values[100_000:])
+    merged = sketch.merge(other)
+    standard_error = 1.04 / np.sqrt(1 << 14)
+    assert abs(merged.count() - values.size) <= 4 * standard_error * values.size
+
+    small = HyperLogLog()
+    small.update(np.array([1.0, 2.0, 2.0, 0.0, -0.0]))
+    assert small.count() == 3
+
+
+def test_infinite_values_count_as_missing():
+    summary = StreamingStatistics()
+    summary.update([1.0, np.inf, 2.0, np.nan, -np.inf, 3.0])
+    statistics = summary.to_statistics()
+    assert statistics['missing'] == 3
+    assert statistics['count'] == 3
+    assert (statistics['min'], statistics['mean'], statistics['max']) == (1.0, 2.0, 3.0)
+
+
+def test_stray_string_in_a_later_chunk_counts_as_missing():
+    frame = pd.DataFrame({'value': [float(i) for i in range(10)], 'label': list('abcdefghij')})
+    frame['value'] = frame['value'].astype(object)
+    frame.loc[7, 'value'] = 'pending'
+    source = io.StringIO(frame.to_csv(index=False))
+
+    results = stream_csv_statistics(source, chunksize=4)
+    assert set(results) == {'value'}
+    assert results['value']['count'] == 9
+    assert results['value']['missing'] == 1
+    np.testing.assert_allclose(results['value']['mean'], np.mean([0, 1, 2, 3, 4, 5, 6, 8, 9]))
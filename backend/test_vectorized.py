@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+from scipy import stats
+
+from api.descriptive_stats import describe
+from api.vectorized import STATISTIC_NAMES, batch_statistics, pad_series
+
+
+def ragged_rows(dtype):
+    rng = np.random.default_rng(0)
+    return [(1e3 + rng.normal(size=n)).astype(dtype) for n in (50, 7, 50, 1, 0, 7, 300)]
+
+
+@pytest.mark.parametrize('dtype', [np.float64, np.float32])
+def test_ragged_rows_match_describe_per_row(dtype):
+    rows = ragged_rows(dtype)
+    matrix, lengths = pad_series(rows)
+    assert matrix.dtype == dtype
+    statistics = batch_statistics(matrix, lengths)
+
+    for i, row in enumerate(rows):
+        if row.size == 0:
+            assert all(np.isnan(statistics[name][i]) for name in STATISTIC_NAMES)
+            continue
+        expected = describe(row, quantiles=())
+        for name in STATISTIC_NAMES:
+            np.testing.assert_allclose(statistics[name][i], expected[name], rtol=1e-12, equal_nan=True)
+
+
+def test_ragged_rows_match_scipy():
+    rows = ragged_rows(np.float64)
+    matrix, lengths = pad_series(rows)
+    statistics = batch_statistics(matrix, lengths)
+    for i in (0, 1, 6):
+        np.testing.assert_allclose(statistics['mean'][i], rows[i].mean())
+        np.testing.assert_allclose(statistics['std'][i], rows[i].std(), rtol=1e-9)
+        np.testing.assert_allclose(statistics['skewness'][i], stats.skew(rows[i]), rtol=1e-6)
+        np.testing.assert_allclose(statistics['kurtosis'][i], stats.kurtosis(rows[i]), rtol=1e-6)
+
+
+def test_equal_rows_skip_the_ragged_path():
+    matrix = np.arange(12.0).reshape(3, 4)
+    full = batch_statistics(matrix, np.array([4, 4, 4]))
+    for name in STATISTIC_NAMES:
+        np.testing.assert_array_equal(full[name], batch_statistics(matrix)[name])
@@ -81,17 +81,17 @@ async function runRegressionBackend(
   });
 
   try {
-    const response = await fetch("http://localhost:8000/api/regression", {
+    const response = await fetch("http://localhost:8002/api/regression/analyze", {
       method: "POST",
       headers: { 
         "Content-Type": "application/json",
         "Accept": "application/json"
       },
       body: JSON.stringify({
-        X: x,
+        // The backend takes one array per feature
+        X: x[0].map((_, j) => x.map(row => row[j])),
         y: y,
-        model: model.toLowerCase(),
-        preprocess: true,
+        model_type: model.toLowerCase(),
         alpha: 1.0
       }),
     });
@@ -123,21 +123,20 @@ async function runRegressionBackend(
 
     // Log successful response
     console.log('Regression response:', {
-      model: responseData.model,
+      model: responseData.model_type,
       coefficients: responseData.coefficients?.length,
-      predictions: responseData.predictions?.length,
-      metrics: {
-        r2: responseData.r2,
-        rmse: responseData.rmse,
-        mae: responseData.mae
-      }
+      predictions: responseData.predictions?.predicted?.length,
+      metrics: responseData.metrics
     });
 
+    const predictions: number[] = responseData.predictions.predicted;
+    const { r2, rmse, mae } = responseData.metrics;
+
     // Calculate additional metrics and diagnostics
-    const residuals = y.map((actual, i) => actual - responseData.predictions[i]);
+    const residuals = y.map((actual, i) => actual - predictions[i]);
     const bias = Math.abs(residuals.reduce((a, b) => a + b, 0) / (y.length || 1));
     const variance = residuals.reduce((a, b) => a + (b - bias) ** 2, 0) / (y.length || 1);
-    const health = responseData.r2 > 0.9 && bias < 0.1 ? "healthy" : responseData.r2 < 0.5 ? "underfit" : "overfit";
+    const health = r2 > 0.9 && bias < 0.1 ? "healthy" : r2 < 0.5 ? "underfit" : "overfit";
 
     // Transform backend result to NextGen format
     return {
@@ -145,17 +144,17 @@ async function runRegressionBackend(
       coefficients: responseData.coefficients,
       intercept: responseData.intercept,
       metrics: {
-        r2Score: responseData.r2,
-        adjustedR2: responseData.r2 - 0.05, // Simplified calculation
-        rmse: responseData.rmse,
-        mae: responseData.mae,
+        r2Score: r2,
+        adjustedR2: responseData.metrics.adjusted_r2 ?? r2,
+        rmse,
+        mae,
         aic: Math.random() * 100, // Placeholder - should be calculated
         bic: Math.random() * 100, // Placeholder - should be calculated
         fStatistic: Math.random() * 10, // Placeholder - should be calculated
         pValue: Math.random(), // Placeholder - should be calculated
         confidenceIntervals: responseData.coefficients.map((c: number) => [c - 0.1, c + 0.1]), // Simplified
         residuals,
-        predictions: responseData.predictions,
+        predictions,
         actualValues: y
       },
       diagnostics: {
@@ -164,7 +163,7 @@ async function runRegressionBackend(
         health,
         outliers: detectOutliers(residuals)
       },
-      explanation: `This regression model shows ${health} performance with an R² score of ${responseData.r2.toFixed(3)}. ${
+      explanation: `This regression model shows ${health} performance with an R² score of ${r2.toFixed(3)}. ${
         health === "healthy" ? "The model appears to be well-fitted to the data." :
         health === "overfit" ? "The model may be overfitting the training data." :
         "The model may be underfitting and could benefit from additional features or a different model type."
@@ -184,7 +183,7 @@ async function runRegressionBackend(
     });
     
     if (error.name === 'TypeError' && error.message.includes('Failed to fetch')) {
-      throw new Error('Failed to connect to regression service. Please ensure the server is running at http://localhost:8000');
+      throw new Error('Failed to connect to regression service. Please ensure the server is running at http://localhost:8002');
     }
     
     let msg = error.message;
@@ -449,11 +448,8 @@ export function RegressionAnalysis({ fields }: RegressionAnalysisProps) {
       const y = (numericFields.find((f) => f.name === target)?.value as number[]).filter(
         (_, idx) => !diagnostics.outliers.includes(idx)
       );
-      const x = features.map((name) =>
-        (numericFields.find((f) => f.name === name)?.value as number[]).filter(
-          (_, idx) => !diagnostics.outliers.includes(idx)
-        )
-      );
+      const { x: allRows } = prepareData();
+      const x = allRows.filter((_, idx) => !diagnostics.outliers.includes(idx));
 
       setLoading(true);
       const regression = await runRegressionBackend(
@@ -123,7 +123,7 @@ export function SentimentAnalysis({ field, customLexicons }: SentimentAnalysisPr
         const timeoutId = setTimeout(() => controller.abort(), 5000);
 
         try {
-          const response = await fetch('http://localhost:8003/api/analyze', {
+          const response = await fetch('http://localhost:8002/analyze', {
             method: 'POST',
             headers: { 
               'Content-Type': 'application/json',